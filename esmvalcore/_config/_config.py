@@ -105,21 +105,32 @@ def read_config_user_file(config_file, folder_name, options=None):
     # set defaults
     defaults = {
         'auxiliary_data_dir': '~/auxiliary_data',
+        'cmor_table_cache_dir': None,
         'compress_netcdf': False,
         'config_developer_file': None,
+        'dask_scheduler_address': None,
         'drs': {},
         'download_dir': '~/climate_data',
         'exit_on_warning': False,
         'extra_facets_dir': tuple(),
+        'input_file_index': None,
+        'max_memory': None,
         'max_parallel_tasks': None,
+        'max_save_memory': None,
         'offline': True,
         'output_file_type': 'png',
         'output_dir': '~/esmvaltool_output',
+        'preprocessor_cache_dir': None,
+        'preprocessor_cache_max_size': 100,
+        'profile_preprocessor': False,
         'profile_diagnostic': False,
+        'regridder_cache_dir': None,
+        'regridder_cache_max_size': 10,
         'remove_preproc_dir': True,
         'resume_from': [],
         'run_diagnostic': True,
         'save_intermediary_cubes': False,
+        'task_executor': 'multiprocessing',
     }
 
     for key in defaults:
@@ -132,6 +143,12 @@ def read_config_user_file(config_file, folder_name, options=None):
     cfg['output_dir'] = _normalize_path(cfg['output_dir'])
     cfg['download_dir'] = _normalize_path(cfg['download_dir'])
     cfg['auxiliary_data_dir'] = _normalize_path(cfg['auxiliary_data_dir'])
+    cfg['preprocessor_cache_dir'] = _normalize_path(
+        cfg['preprocessor_cache_dir'])
+    cfg['input_file_index'] = _normalize_path(cfg['input_file_index'])
+    cfg['regridder_cache_dir'] = _normalize_path(cfg['regridder_cache_dir'])
+    cfg['cmor_table_cache_dir'] = _normalize_path(
+        cfg['cmor_table_cache_dir'])
 
     if isinstance(cfg['extra_facets_dir'], str):
         cfg['extra_facets_dir'] = (_normalize_path(cfg['extra_facets_dir']), )
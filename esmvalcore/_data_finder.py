@@ -1,28 +1,216 @@
 """Data finder module for the ESMValTool."""
-import glob
+import fnmatch
 import logging
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import iris
 import isodate
 
 from ._config import get_project_config
+from ._file_index import FileIndex, list_directory
 from .exceptions import RecipeError
 
 logger = logging.getLogger(__name__)
 
+MAX_SCAN_WORKERS = 16
+"""Maximum number of threads used to list directories."""
+
+_SCANDIR_CACHE = {}
+_ISDIR_CACHE = {}
+_SCAN_EXECUTOR = None
+_MAGIC_CHECK = re.compile('[*?[]')
+_FILE_INDEX = None
+
+
+def set_file_index(filename):
+    """Use a persistent index to find input files.
+
+    Parameters
+    ----------
+    filename: str or None
+        Path to the database file of the
+        :class:`esmvalcore._file_index.FileIndex`, or `None` to read all
+        directories from disk.
+    """
+    global _FILE_INDEX  # pylint: disable=global-statement
+    if _FILE_INDEX is not None:
+        _FILE_INDEX.close()
+    _FILE_INDEX = None if filename is None else FileIndex(filename)
+
+
+def get_file_metadata(filename, key, function):
+    """Get metadata of a file, from the persistent file index if it is used.
+
+    Parameters
+    ----------
+    filename: str
+        The file.
+    key: str
+        Name of the metadata. This should include any arguments besides the
+        file that `function` depends on.
+    function: callable
+        Function that reads the metadata from the file.
+
+    Returns
+    -------
+    object
+        The metadata.
+    """
+    if _FILE_INDEX is None:
+        return function(filename)
+    return _FILE_INDEX.get_metadata(filename, key, function)
+
+
+def clear_scandir_cache():
+    """Forget the directory listings found so far.
+
+    Directory listings are cached so every directory is only read once.
+    This function should be called when the files on disk may have changed,
+    e.g. before finding the input files for a new recipe.
+    """
+    _SCANDIR_CACHE.clear()
+    _ISDIR_CACHE.clear()
+
+
+def _scandir(dirname):
+    """List a directory.
+
+    Returns
+    -------
+    dict or None
+        Map from the names of the entries in the directory to a
+        :obj:`bool` indicating if the entry is a directory, or `None` if
+        `dirname` cannot be listed.
+    """
+    if dirname not in _SCANDIR_CACHE:
+        if _FILE_INDEX is None:
+            _SCANDIR_CACHE[dirname] = list_directory(dirname)
+        else:
+            _SCANDIR_CACHE.update(_FILE_INDEX.list_directories([dirname]))
+    return _SCANDIR_CACHE[dirname]
+
+
+def _isdir(path):
+    """Check if `path` is a directory."""
+    if path not in _ISDIR_CACHE:
+        _ISDIR_CACHE[path] = os.path.isdir(path)
+    return _ISDIR_CACHE[path]
+
+
+def _scandir_parallel(dirnames):
+    """List multiple directories using a pool of threads."""
+    global _SCAN_EXECUTOR  # pylint: disable=global-statement
+    dirnames = [d for d in dirnames if d not in _SCANDIR_CACHE]
+    if len(dirnames) > 1:
+        if _SCAN_EXECUTOR is None:
+            _SCAN_EXECUTOR = ThreadPoolExecutor(
+                max_workers=MAX_SCAN_WORKERS,
+                thread_name_prefix='scandir',
+            )
+        if _FILE_INDEX is None:
+            list(_SCAN_EXECUTOR.map(_scandir, dirnames))
+        else:
+            # The database is only accessed from this thread
+            _SCANDIR_CACHE.update(
+                _FILE_INDEX.list_directories(dirnames, _SCAN_EXECUTOR.map))
+
+
+def _split_pattern(pattern):
+    """Split a path pattern into literal and wildcard segments.
+
+    Returns
+    -------
+    list of tuple
+        Segments ``(is_literal, text)``, starting and ending with a literal
+        segment, which may be empty. A literal segment can consist of
+        multiple path components, a wildcard segment is a single component.
+    """
+    segments = []
+    literal = []
+    for part in pattern.split(os.sep):
+        if _MAGIC_CHECK.search(part):
+            segments.append((True, os.sep.join(literal) or
+                             (os.sep if literal else '')))
+            literal = []
+            segments.append((False, part))
+        else:
+            literal.append(part)
+    segments.append((True, os.sep.join(literal)))
+    return segments
+
+
+def _join(dirname, name):
+    """Join path components, like :func:`os.path.join`."""
+    if not dirname:
+        return name
+    return dirname.rstrip(os.sep) + os.sep + name
+
+
+def _glob(pattern, dirs_only=False):
+    """Find paths matching `pattern`, like :func:`glob.glob`.
+
+    The directory tree is walked one level at a time. Directory listings are
+    cached and directories on the same level are listed in parallel, so
+    patterns that share directories are cheap to resolve.
+
+    Parameters
+    ----------
+    pattern: str
+        Path pattern, with the wildcards supported by :mod:`fnmatch`.
+    dirs_only: bool
+        Only return directories.
+
+    Returns
+    -------
+    list of str
+        The paths matching `pattern`, sorted per directory.
+    """
+    segments = _split_pattern(pattern)
+    last = len(segments) - 1
+    candidates = ['']
+    for i, (is_literal, text) in enumerate(segments):
+        if is_literal:
+            if text:
+                candidates = [_join(c, text) for c in candidates]
+            if i == last and text:
+                # Directories are checked when they are listed, so only the
+                # final path component needs to be checked here.
+                check = _isdir if dirs_only else os.path.lexists
+                candidates = [c for c in candidates if check(c)]
+            continue
+
+        final = i == last - 1 and not segments[last][1]
+        _scandir_parallel(candidates)
+        matches = []
+        for dirname in candidates:
+            listing = _scandir(dirname)
+            if not listing:
+                continue
+            names = fnmatch.filter(listing, text)
+            if not text.startswith('.'):
+                names = [n for n in names if not n.startswith('.')]
+            for name in sorted(names):
+                if listing[name] or (final and not dirs_only):
+                    matches.append(_join(dirname, name))
+        candidates = matches
+        if not candidates:
+            break
+    return candidates
+
 
 def find_files(dirnames, filenames):
     """Find files matching filenames in dirnames."""
     logger.debug("Looking for files matching %s in %s", filenames, dirnames)
 
+    _scandir_parallel(dirnames)
     result = []
     for dirname in dirnames:
         for filename_pattern in filenames:
             pat = os.path.join(dirname, filename_pattern)
-            files = glob.glob(pat)
+            files = _glob(pat)
             files.sort()  # sorting makes it easier to see what was found
             result.extend(files)
 
@@ -308,7 +496,8 @@ def select_files(filenames, timerange):
 
     for filename in filenames:
         start_date, end_date = _parse_period(timerange)
-        start, end = get_start_end_date(filename)
+        start, end = get_file_metadata(filename, 'start_end_date',
+                                       get_start_end_date)
 
         start_date, start = _truncate_dates(start_date, start)
         end_date, end = _truncate_dates(end_date, end)
@@ -397,12 +586,12 @@ def _resolve_latestversion(dirname_template):
     # Find latest version
     part1, part2 = dirname_template.split('{latestversion}')
     part2 = part2.lstrip(os.sep)
-    if os.path.exists(part1):
-        versions = os.listdir(part1)
-        versions.sort(reverse=True)
+    listing = _scandir(part1)
+    if listing is not None:
+        versions = sorted(listing, reverse=True)
         for version in ['latest'] + versions:
             dirname = os.path.join(part1, version, part2)
-            if os.path.isdir(dirname):
+            if _isdir(dirname):
                 return dirname
 
     return None
@@ -456,8 +645,7 @@ def _find_input_dirs(variable, rootpath, drs):
             dirname = _resolve_latestversion(dirname)
             if dirname is None:
                 continue
-            matches = glob.glob(dirname)
-            matches = [match for match in matches if os.path.isdir(match)]
+            matches = _glob(dirname, dirs_only=True)
             if matches:
                 for match in matches:
                     dirnames.append(match)
@@ -504,7 +692,7 @@ def get_input_filelist(variable, rootpath, drs):
     return (files, dirnames, filenames)
 
 
-def get_output_file(variable, preproc_dir):
+def get_output_file(variable, preproc_dir, extension='.nc'):
     """Return the full path to the output (preprocessed) file."""
     cfg = get_project_config(variable['project'])
 
@@ -523,11 +711,11 @@ def get_output_file(variable, preproc_dir):
         timerange = variable['timerange'].replace('/', '-')
         outfile += f'_{timerange}'
 
-    outfile += '.nc'
+    outfile += extension
     return outfile
 
 
-def get_multiproduct_filename(attributes, preproc_dir):
+def get_multiproduct_filename(attributes, preproc_dir, extension='.nc'):
     """Get ensemble/multi-model filename depending on settings."""
     relevant_keys = [
         'project', 'dataset', 'exp', 'ensemble_statistics',
@@ -547,7 +735,7 @@ def get_multiproduct_filename(attributes, preproc_dir):
 
     # Add period and extension
     filename_segments.append(
-        f"{attributes['timerange'].replace('/', '-')}.nc")
+        f"{attributes['timerange'].replace('/', '-')}{extension}")
 
     outfile = os.path.join(
         preproc_dir,
@@ -0,0 +1,247 @@
+"""Persistent index of directory listings and metadata of input files."""
+import logging
+import os
+import pickle
+import sqlite3
+import stat
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    listed_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    dirname TEXT NOT NULL,
+    name TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    PRIMARY KEY (dirname, name)
+);
+CREATE TABLE IF NOT EXISTS metadata (
+    path TEXT NOT NULL,
+    key TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    value BLOB NOT NULL,
+    PRIMARY KEY (path, key)
+);
+"""
+
+MTIME_RESOLUTION = 2 * 10**9
+"""Resolution (ns) of directory modification times that is relied upon.
+
+Listings made within this time after the last modification of a directory
+are not re-used, because a file added in the same interval would not
+change the modification time on file systems with a coarse resolution.
+"""
+
+
+def list_directory(dirname):
+    """List a directory.
+
+    Returns
+    -------
+    dict or None
+        Map from the names of the entries in the directory to a
+        :obj:`bool` indicating if the entry is a directory, or `None` if
+        `dirname` cannot be listed.
+    """
+    listing = {}
+    try:
+        with os.scandir(dirname or os.curdir) as entries:
+            for entry in entries:
+                try:
+                    listing[entry.name] = entry.is_dir()
+                except OSError:
+                    listing[entry.name] = False
+    except OSError:
+        return None
+    return listing
+
+
+def _get_directory_mtime(dirname):
+    """Return the modification time (ns) of a directory, or `None`."""
+    try:
+        info = os.stat(dirname or os.curdir)
+    except OSError:
+        return None
+    if not stat.S_ISDIR(info.st_mode):
+        return None
+    return info.st_mtime_ns
+
+
+class FileIndex:
+    """Persistent index of directory listings and metadata of files.
+
+    The index is stored in an SQLite database, so it can be shared between
+    runs. A stored directory listing is re-used as long as the modification
+    time of the directory has not changed, so finding files only needs one
+    ``stat`` call per directory instead of reading the directory. Metadata
+    read from files, e.g. their start and end dates or global attributes, is
+    re-used as long as the size and modification time of the file have not
+    changed.
+
+    Parameters
+    ----------
+    filename: str
+        Path to the database file. It is created if it does not exist.
+    """
+
+    def __init__(self, filename):
+        self.filename = Path(filename).expanduser()
+        self.filename.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self._open()
+        except sqlite3.DatabaseError as exc:
+            logger.warning("Re-creating file index %s because it cannot be "
+                           "read: %s", self.filename, exc)
+            self.filename.unlink()
+            self._open()
+
+    def _open(self):
+        """Open the database from the current process."""
+        self._pid = os.getpid()
+        self._db = self._connect()
+
+    @property
+    def _connection(self):
+        """Connection to the database."""
+        # Connections must not be used in processes forked from the process
+        # that opened them, so tasks running in parallel each open their own
+        if self._pid != os.getpid():
+            self._open()
+        return self._db
+
+    def _connect(self):
+        """Connect to the database and create the tables if needed."""
+        connection = sqlite3.connect(str(self.filename), timeout=60)
+        # The index can always be rebuilt, so prefer speed over durability
+        connection.execute('PRAGMA synchronous = OFF')
+        version = connection.execute('PRAGMA user_version').fetchone()[0]
+        if version != SCHEMA_VERSION:
+            with connection:
+                for table in ('directories', 'entries', 'dates',
+                              'metadata'):
+                    connection.execute(f'DROP TABLE IF EXISTS {table}')
+                connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        with connection:
+            connection.executescript(SCHEMA)
+        return connection
+
+    def close(self):
+        """Close the connection to the database."""
+        if self._pid == os.getpid():
+            self._db.close()
+
+    def _get_stored_listing(self, dirname, mtime_ns):
+        """Get a stored listing if it is up to date, else `None`."""
+        row = self._connection.execute(
+            'SELECT mtime_ns, listed_ns FROM directories WHERE path = ?',
+            (dirname, )).fetchone()
+        if (row is None or row[0] != mtime_ns
+                or row[1] - row[0] < MTIME_RESOLUTION):
+            return None
+        rows = self._connection.execute(
+            'SELECT name, is_dir FROM entries WHERE dirname = ?', (dirname, ))
+        return {name: bool(is_dir) for name, is_dir in rows}
+
+    def list_directories(self, dirnames, map_function=map):
+        """List directories, re-using stored listings where possible.
+
+        Parameters
+        ----------
+        dirnames: list of str
+            The directories to list.
+        map_function: callable
+            Function with the signature of :func:`map` used to access the
+            file system, e.g. the ``map`` method of a thread pool.
+
+        Returns
+        -------
+        dict
+            Map from the directory names to their listings, see
+            :func:`list_directory`.
+        """
+        dirnames = list(dirnames)
+        mtimes = dict(zip(dirnames, map_function(_get_directory_mtime,
+                                                 dirnames)))
+        result = {}
+        outdated = []
+        for dirname in dirnames:
+            if mtimes[dirname] is None:
+                result[dirname] = None
+                continue
+            listing = self._get_stored_listing(dirname, mtimes[dirname])
+            if listing is None:
+                outdated.append(dirname)
+            else:
+                result[dirname] = listing
+
+        if outdated:
+            listed_ns = time.time_ns()
+            listings = list(map_function(list_directory, outdated))
+            with self._connection:
+                for dirname, listing in zip(outdated, listings):
+                    result[dirname] = listing
+                    self._store_listing(dirname, mtimes[dirname], listed_ns,
+                                        listing)
+        return result
+
+    def _store_listing(self, dirname, mtime_ns, listed_ns, listing):
+        """Store the listing of a directory."""
+        self._connection.execute('DELETE FROM entries WHERE dirname = ?',
+                                 (dirname, ))
+        if listing is None:
+            self._connection.execute(
+                'DELETE FROM directories WHERE path = ?', (dirname, ))
+            return
+        self._connection.execute(
+            'INSERT OR REPLACE INTO directories VALUES (?, ?, ?)',
+            (dirname, mtime_ns, listed_ns))
+        self._connection.executemany(
+            'INSERT INTO entries VALUES (?, ?, ?)',
+            ((dirname, name, int(is_dir))
+             for name, is_dir in listing.items()))
+
+    def get_metadata(self, filename, key, function):
+        """Get metadata of a file.
+
+        Parameters
+        ----------
+        filename: str
+            The file.
+        key: str
+            Name of the metadata. This should include any arguments besides
+            the file that `function` depends on.
+        function: callable
+            Function that reads the metadata from the file if it is not in
+            the index. The value it returns must be picklable.
+
+        Returns
+        -------
+        object
+            The metadata.
+        """
+        filename = os.path.abspath(filename)
+        try:
+            info = os.stat(filename)
+        except OSError:
+            return function(filename)
+        row = self._connection.execute(
+            'SELECT size, mtime_ns, value FROM metadata '
+            'WHERE path = ? AND key = ?', (filename, key)).fetchone()
+        if row is not None and row[:2] == (info.st_size, info.st_mtime_ns):
+            return pickle.loads(row[2])
+        value = function(filename)
+        with self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?, ?)',
+                (filename, key, info.st_size, info.st_mtime_ns,
+                 pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)))
+        return value
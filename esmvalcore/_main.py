@@ -63,8 +63,10 @@ def parse_resume(resume, recipe):
     for resume_dir in resume:
         resume_recipe = resume_dir / 'run' / recipe.name
         if current_recipe != resume_recipe.read_text():
-            raise ValueError(f'Only identical recipes can be resumed, but '
-                             f'{resume_recipe} is different from {recipe}')
+            logger.info(
+                "Recipe %s is different from %s, only preprocessed files "
+                "from unchanged preprocessor tasks will be re-used",
+                recipe, resume_recipe)
     return resume
 
 
@@ -103,7 +105,8 @@ def process_recipe(recipe_file, config_user):
         "If your system hangs during execution, it may not have enough "
         "memory for keeping this number of tasks in memory.")
     logger.info("If you experience memory problems, try reducing "
-                "'max_parallel_tasks' in your user configuration file.")
+                "'max_parallel_tasks' or setting 'max_memory' in your user "
+                "configuration file.")
 
     if config_user['compress_netcdf']:
         logger.warning(
@@ -236,6 +236,13 @@ class TrackedFile:
             for key, value in attributes.items():
                 setattr(dataset, key, value)
 
+    @staticmethod
+    def _include_provenance_zarr(filename, attributes):
+        # local import because `ESMValCore` does not depend on `zarr`
+        import zarr
+        zarr.open_group(filename, mode='r+').attrs.update(attributes)
+        zarr.consolidate_metadata(filename)
+
     @staticmethod
     def _include_provenance_png(filename, attributes):
         pnginfo = PngInfo()
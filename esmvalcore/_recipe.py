@@ -6,6 +6,7 @@ import re
 import warnings
 from collections import defaultdict
 from copy import deepcopy
+from functools import partial
 from pathlib import Path
 from pprint import pformat
 
@@ -28,34 +29,51 @@ from ._data_finder import (
     _get_timerange_from_years,
     _parse_period,
     _truncate_dates,
+    clear_scandir_cache,
     dates_to_timerange,
     get_input_filelist,
     get_multiproduct_filename,
     get_output_file,
+    get_file_metadata,
     get_start_end_date,
+    set_file_index,
 )
 from ._provenance import TrackedFile, get_recipe_provenance
-from ._task import DiagnosticTask, ResumeTask, TaskSet
+from ._task import (
+    DaskExecutor,
+    DiagnosticTask,
+    MultiprocessingExecutor,
+    ResumeTask,
+    TaskSet,
+)
 from .cmor.check import CheckLevels
-from .cmor.table import CMOR_TABLES
+from .cmor.table import CMOR_TABLES, set_cmor_table_cache
 from .exceptions import InputFilesNotFound, RecipeError
 from .preprocessor import (
     DEFAULT_ORDER,
     FINAL_STEPS,
+    FINGERPRINT_FILE,
     INITIAL_STEPS,
     MULTI_MODEL_FUNCTIONS,
     PreprocessingTask,
     PreprocessorFile,
 )
+from .preprocessor._cache import PreprocessorCache, _canonicalize, get_hash
 from .preprocessor._derive import get_required
-from .preprocessor._io import DATASET_KEYS, concatenate_callback
+from .preprocessor._io import (
+    DATASET_KEYS,
+    OUTPUT_FORMATS,
+    concatenate_callback,
+)
 from .preprocessor._other import _group_products
+from .preprocessor._profiler import PROFILE_DIR, write_profile_report
 from .preprocessor._regrid import (
     _spec_to_latlonvals,
     get_cmor_levels,
     get_reference_levels,
     parse_cell_spec,
 )
+from .preprocessor._regrid_cache import set_regridder_cache
 
 logger = logging.getLogger(__name__)
 
@@ -285,6 +303,7 @@ def _get_default_settings(variable, config_user, derive=False):
     fix_dir = os.path.splitext(variable['filename'])[0] + '_fixed'
     settings['fix_file'] = dict(fix)
     settings['fix_file']['output_dir'] = fix_dir
+    settings['fix_dataset_metadata'] = dict(fix)
     # Cube fixes
     fix['frequency'] = variable['frequency']
     fix['check_level'] = config_user.get('check_level', CheckLevels.DEFAULT)
@@ -322,6 +341,8 @@ def _get_default_settings(variable, config_user, derive=False):
 
     # Configure saving cubes to file
     settings['save'] = {'compress': config_user['compress_netcdf']}
+    if config_user.get('max_save_memory') is not None:
+        settings['save']['max_memory'] = config_user['max_save_memory']
     if variable['short_name'] != variable['original_short_name']:
         settings['save']['alias'] = variable['short_name']
 
@@ -561,17 +582,19 @@ def _update_fx_settings(settings, variable, config_user):
             settings[step_name].pop('fx_variables', None)
 
 
+def _read_netcdf_attributes(filename):
+    """Read the global attributes from a netcdf file."""
+    with Dataset(filename, 'r') as dataset:
+        return {attr: dataset.getncattr(attr) for attr in dataset.ncattrs()}
+
+
 def _read_attributes(filename):
     """Read the attributes from a netcdf file."""
-    attributes = {}
     if not (os.path.exists(filename)
             and os.path.splitext(filename)[1].lower() == '.nc'):
-        return attributes
-
-    with Dataset(filename, 'r') as dataset:
-        for attr in dataset.ncattrs():
-            attributes[attr] = dataset.getncattr(attr)
-    return attributes
+        return {}
+    return get_file_metadata(filename, 'global_attributes',
+                             _read_netcdf_attributes)
 
 
 def _get_input_files(variable, config_user):
@@ -738,6 +761,16 @@ def _get_tag(step, identifier, statistic):
     return tag
 
 
+def _get_output_extension(settings):
+    """Get the extension of preprocessed files from the `save` settings."""
+    output_format = (settings.get('save') or {}).get('format', 'netcdf')
+    if output_format not in OUTPUT_FORMATS:
+        raise RecipeError(
+            f"Unknown output format '{output_format}' for preprocessor "
+            f"function save, choose from: {', '.join(OUTPUT_FORMATS)}")
+    return OUTPUT_FORMATS[output_format]
+
+
 def _update_multiproduct(input_products, order, preproc_dir, step):
     """Return new products that are aggregated over multiple datasets.
 
@@ -763,6 +796,13 @@ def _update_multiproduct(input_products, order, preproc_dir, step):
         grouping = settings.get('groupby', None)
 
     downstream_settings = _get_downstream_settings(step, order, products)
+    # The save settings differ between products because of the filename, but
+    # the output format is the same for all of them
+    save_settings = next(iter(products)).settings.get('save', {})
+    if 'format' in save_settings:
+        downstream_settings.setdefault('save', {})
+        downstream_settings['save']['format'] = save_settings['format']
+    extension = _get_output_extension(downstream_settings)
 
     relevant_settings = {
         'output_products': defaultdict(dict)
@@ -780,7 +820,7 @@ def _update_multiproduct(input_products, order, preproc_dir, step):
             statistic_attributes.setdefault('dataset',
                                             statistic_attributes[step])
             filename = get_multiproduct_filename(statistic_attributes,
-                                                 preproc_dir)
+                                                 preproc_dir, extension)
             statistic_attributes['filename'] = filename
             statistic_product = PreprocessorFile(statistic_attributes,
                                                  downstream_settings)
@@ -920,11 +960,13 @@ def _get_preprocessor_products(variables, profile, order, ancestor_products,
     """
     products = set()
     preproc_dir = config_user['preproc_dir']
+    extension = _get_output_extension(profile)
 
     for variable in variables:
         _update_timerange(variable, config_user)
         variable['filename'] = get_output_file(variable,
-                                               config_user['preproc_dir'])
+                                               config_user['preproc_dir'],
+                                               extension)
 
     if ancestor_products:
         grouped_ancestors = _match_products(ancestor_products, variables)
@@ -1048,6 +1090,111 @@ def _update_preproc_functions(settings, config_user, variable, variables,
     _update_regrid_time(variable, settings)
 
 
+def _get_preprocessor_cache(config_user):
+    """Get the cache of preprocessor output files, if configured."""
+    if config_user.get('preprocessor_cache_dir') is None:
+        return None
+    return PreprocessorCache(
+        directory=config_user['preprocessor_cache_dir'],
+        max_size=config_user['preprocessor_cache_max_size'],
+        preproc_dir=config_user['preproc_dir'],
+    )
+
+
+def _get_profile_dir(config_user):
+    """Get the directory for preprocessor profiles, if profiling."""
+    if not config_user.get('profile_preprocessor'):
+        return None
+    return os.path.join(config_user['run_dir'], PROFILE_DIR)
+
+
+def _recipe_is_unchanged(recipe_file, resume_dir):
+    """Check if a recipe is identical to the recipe of a previous run."""
+    if recipe_file is None:
+        return False
+    recipe_file = Path(recipe_file)
+    try:
+        return (recipe_file.read_text() == Path(
+            resume_dir, 'run', recipe_file.name).read_text())
+    except OSError:
+        return False
+
+
+def _get_recipe_fingerprint(variables, profiles):
+    """Compute a fingerprint of the recipe entries of a preprocessing task.
+
+    The fingerprint is computed from the datasets and the preprocessor
+    settings in the recipe, but not from the input files, so it can also be
+    computed when the input data is not available.
+    """
+    profile = profiles.get(variables[0].get('preprocessor'))
+    return get_hash([__version__, _canonicalize([variables, profile], str)])
+
+
+def _read_fingerprints(preproc_dir):
+    """Read the fingerprints stored by a preprocessing task.
+
+    Returns
+    -------
+    tuple[str, str] or None
+        The fingerprint of the recipe entries of the task and the
+        fingerprint of the task itself, or `None` if they were not stored.
+    """
+    fingerprint_file = Path(preproc_dir, FINGERPRINT_FILE)
+    if not fingerprint_file.exists():
+        return None
+    fingerprints = fingerprint_file.read_text().splitlines()
+    if len(fingerprints) != 2:
+        return None
+    return tuple(fingerprints)
+
+
+def _get_resume_task(task_name,
+                     config_user,
+                     recipe_file,
+                     recipe_fingerprint,
+                     fingerprint=None):
+    """Get a task that re-uses the output of a previous run.
+
+    The output of a previous run is only re-used if the fingerprint of the
+    preprocessing task in that run was `fingerprint`, i.e. if its products
+    had the same input files, preprocessor settings and attributes. If
+    `fingerprint` is not given, because the input data is not available,
+    the output is re-used if the recipe entries of the task had the
+    fingerprint `recipe_fingerprint`. Output of runs that did not store the
+    fingerprints is only re-used if `recipe_file` is identical to the recipe
+    of that run.
+
+    Returns
+    -------
+    ResumeTask or None
+        A task that re-uses previous output, or `None` if no matching output
+        is found.
+    """
+    for resume_dir in config_user.get('resume_from', []):
+        prev_preproc_dir = Path(resume_dir, 'preproc', task_name)
+        if not (prev_preproc_dir / 'metadata.yml').exists():
+            continue
+        prev_fingerprints = _read_fingerprints(prev_preproc_dir)
+        if prev_fingerprints is None:
+            unchanged = _recipe_is_unchanged(recipe_file, resume_dir)
+        elif fingerprint is None:
+            unchanged = prev_fingerprints[0] == recipe_fingerprint
+        else:
+            unchanged = prev_fingerprints[1] == fingerprint
+        if not unchanged:
+            logger.info(
+                "Not re-using preprocessed files from %s for %s because "
+                "the preprocessor settings or input data have changed",
+                prev_preproc_dir, task_name)
+            continue
+        logger.info("Re-using preprocessed files from %s for %s",
+                    prev_preproc_dir, task_name)
+        preproc_dir = Path(config_user['preproc_dir'], 'preproc', task_name)
+        return ResumeTask(prev_preproc_dir, preproc_dir, task_name)
+    return None
+
+
 def _get_single_preprocessor_task(variables,
                                   profile,
                                   config_user,
@@ -1083,6 +1230,8 @@ def _get_single_preprocessor_task(variables,
         order=order,
         debug=config_user['save_intermediary_cubes'],
         write_ncl_interface=config_user['write_ncl_interface'],
+        cache=_get_preprocessor_cache(config_user),
+        profile_dir=_get_profile_dir(config_user),
     )
 
     logger.info("PreprocessingTask %s created.", task.name)
@@ -1123,6 +1272,7 @@ def _split_derive_profile(profile):
     after['derive'] = True
     after['fix_file'] = False
     after['fix_metadata'] = False
+    after['fix_dataset_metadata'] = False
     after['fix_data'] = False
     if order != DEFAULT_ORDER:
         before['custom_order'] = True
@@ -1235,11 +1385,18 @@ class Recipe:
         # Clear the global variable containing the set of files to download
         DOWNLOAD_FILES.clear()
         self._download_files = set()
+        # Files may have been added or removed since the previous recipe
+        clear_scandir_cache()
+        set_file_index(config_user.get('input_file_index'))
+        set_regridder_cache(config_user.get('regridder_cache_dir'),
+                            config_user.get('regridder_cache_max_size', 10))
+        set_cmor_table_cache(config_user.get('cmor_table_cache_dir'))
         self._cfg = deepcopy(config_user)
         self._cfg['write_ncl_interface'] = self._need_ncl(
             raw_recipe['diagnostics'])
         self._raw_recipe = raw_recipe
         self._updated_recipe = {}
+        self._recipe_file = recipe_file
         self._filename = os.path.basename(recipe_file)
         self._preprocessors = raw_recipe.get('preprocessors', {})
         if 'default' not in self._preprocessors:
@@ -1770,42 +1927,50 @@ class Recipe:
                                     task_name)
                         continue
 
-            # Resume previous runs if requested, else create a new task
-            for resume_dir in self._cfg['resume_from']:
-                prev_preproc_dir = Path(
-                    resume_dir,
-                    'preproc',
-                    diagnostic_name,
-                    variable_group,
+            logger.info("Creating preprocessor task %s", task_name)
+            download_files = set(DOWNLOAD_FILES)
+            variables = diagnostic['preprocessor_output'][variable_group]
+            recipe_fingerprint = _get_recipe_fingerprint(
+                variables, self._preprocessors)
+            try:
+                task = _get_preprocessor_task(
+                    variables=variables,
+                    profiles=self._preprocessors,
+                    config_user=self._cfg,
+                    task_name=task_name,
                 )
-                if prev_preproc_dir.exists():
-                    logger.info("Re-using preprocessed files from %s for %s",
-                                prev_preproc_dir, task_name)
-                    preproc_dir = Path(
-                        self._cfg['preproc_dir'],
-                        'preproc',
-                        diagnostic_name,
-                        variable_group,
-                    )
-                    task = ResumeTask(prev_preproc_dir, preproc_dir, task_name)
-                    tasks.append(task)
-                    break
-            else:
-                logger.info("Creating preprocessor task %s", task_name)
-                try:
-                    task = _get_preprocessor_task(
-                        variables=diagnostic['preprocessor_output']
-                        [variable_group],
-                        profiles=self._preprocessors,
-                        config_user=self._cfg,
-                        task_name=task_name,
-                    )
-                except RecipeError as ex:
+            except InputFilesNotFound as ex:
+                # Re-use previous output of the same recipe entries if the
+                # input data is not available
+                task = _get_resume_task(task_name, self._cfg,
+                                        self._recipe_file, recipe_fingerprint)
+                if task is None:
                     failed_tasks.append(ex)
                 else:
-                    self._fill_wildcards(variable_group,
-                                         diagnostic['preprocessor_output'])
+                    logger.warning(
+                        "Unable to check if the input data of task %s has "
+                        "changed since the previous run: %s", task_name,
+                        ex.message)
                     tasks.append(task)
+                continue
+            except RecipeError as ex:
+                failed_tasks.append(ex)
+                continue
+            task.recipe_fingerprint = recipe_fingerprint
+            self._fill_wildcards(variable_group,
+                                 diagnostic['preprocessor_output'])
+
+            # Resume previous runs if requested and the task is unchanged
+            if self._cfg.get('resume_from'):
+                resume_task = _get_resume_task(task_name, self._cfg,
+                                               self._recipe_file,
+                                               recipe_fingerprint,
+                                               task.get_fingerprint())
+                if resume_task is not None:
+                    # The input files of a resumed task are not needed
+                    DOWNLOAD_FILES.intersection_update(download_files)
+                    task = resume_task
+            tasks.append(task)
 
         return tasks, failed_tasks
 
@@ -1882,14 +2047,35 @@ class Recipe:
         self.write_filled_recipe()
         if not self.tasks:
             raise RecipeError('No tasks to run!')
+        executor = self._get_task_executor()
 
         # Download required data
         if not self._cfg['offline']:
             esgf.download(self._download_files, self._cfg['download_dir'])
 
-        self.tasks.run(max_parallel_tasks=self._cfg['max_parallel_tasks'])
+        try:
+            self.tasks.run(max_parallel_tasks=self._cfg['max_parallel_tasks'],
+                           max_memory=self._cfg['max_memory'],
+                           executor=executor)
+        finally:
+            if self._cfg['profile_preprocessor']:
+                write_profile_report(self._cfg['run_dir'])
         self.write_html_summary()
 
+    def _get_task_executor(self):
+        """Return the executor for running tasks in parallel."""
+        executor = self._cfg['task_executor']
+        if executor == 'multiprocessing':
+            return MultiprocessingExecutor
+        if executor == 'dask':
+            return partial(
+                DaskExecutor,
+                scheduler_address=self._cfg['dask_scheduler_address'],
+            )
+        raise RecipeError(
+            f"Unknown task executor '{executor}' in the configuration, "
+            "choose from multiprocessing, dask")
+
     def get_output(self) -> dict:
         """Return the paths to the output plots and data.
 
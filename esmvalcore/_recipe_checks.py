@@ -13,7 +13,7 @@ import yamale
 from ._data_finder import get_start_end_year
 from .exceptions import InputFilesNotFound, RecipeError
 from .preprocessor import TIME_PREPROCESSORS, PreprocessingTask
-from .preprocessor._multimodel import STATISTIC_MAPPING
+from .preprocessor._multimodel import ONLINE_STATISTICS, STATISTIC_MAPPING
 
 logger = logging.getLogger(__name__)
 
@@ -261,6 +261,23 @@ def _verify_keep_input_datasets(keep_input_datasets):
         )
 
 
+def _verify_online(online, statistics, step):
+    """Raise error if the statistics cannot be computed online."""
+    if not isinstance(online, bool):
+        raise RecipeError(
+            "Invalid value encountered for `online`."
+            f"Must be defined as a boolean. Got {online}.")
+    if online:
+        unsupported = [
+            s for s in statistics if s.lower() not in ONLINE_STATISTICS
+        ]
+        if unsupported:
+            raise RecipeError(
+                f"Statistics {unsupported} in preprocessor {step} cannot be "
+                f"computed online. Valid values are {list(ONLINE_STATISTICS)}."
+            )
+
+
 def _verify_arguments(given, expected):
     """Raise error if arguments cannot be verified."""
     for key in given:
@@ -272,7 +289,9 @@ def _verify_arguments(given, expected):
 
 def multimodel_statistics_preproc(settings):
     """Check that the multi-model settings are valid."""
-    valid_keys = ['span', 'groupby', 'statistics', 'keep_input_datasets']
+    valid_keys = [
+        'span', 'groupby', 'statistics', 'keep_input_datasets', 'online'
+    ]
     _verify_arguments(settings.keys(), valid_keys)
 
     span = settings.get('span', None)  # optional, default: overlap
@@ -290,10 +309,13 @@ def multimodel_statistics_preproc(settings):
     keep_input_datasets = settings.get('keep_input_datasets', True)
     _verify_keep_input_datasets(keep_input_datasets)
 
+    online = settings.get('online', False)
+    _verify_online(online, statistics or [], 'multi_model_statistics')
+
 
 def ensemble_statistics_preproc(settings):
     """Check that the ensemble settings are valid."""
-    valid_keys = ['statistics', 'span']
+    valid_keys = ['statistics', 'span', 'online']
     _verify_arguments(settings.keys(), valid_keys)
 
     span = settings.get('span', 'overlap')  # optional, default: overlap
@@ -304,6 +326,9 @@ def ensemble_statistics_preproc(settings):
     if statistics:
         _verify_statistics(statistics, 'ensemble_statistics')
 
+    online = settings.get('online', False)
+    _verify_online(online, statistics or [], 'ensemble_statistics')
+
 
 def _check_delimiter(timerange):
     if len(timerange) != 2:
@@ -2,21 +2,25 @@
 import abc
 import contextlib
 import datetime
+import heapq
+import itertools
 import logging
 import numbers
 import os
 import pprint
+import queue
 import subprocess
 import sys
 import textwrap
 import threading
 import time
+import uuid
 from copy import deepcopy
+from functools import partial
 from multiprocessing import Pool
-from multiprocessing.pool import ApplyResult
 from pathlib import Path, PosixPath
 from shutil import which
-from typing import Dict, Type
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 import psutil
 import yaml
@@ -235,6 +239,14 @@ class BaseTask:
         self.activity = None
         self.priority = 0
 
+    def estimate_memory(self) -> int:
+        """Estimate the peak memory (bytes) needed to run the task.
+
+        Tasks that return 0 (the default) are not subject to the memory
+        budget of :meth:`TaskSet.run`.
+        """
+        return 0
+
     def initialize_provenance(self, recipe_entity):
         """Initialize task provenance activity."""
         if self.activity is not None:
@@ -711,18 +723,32 @@ class TaskSet(set):
                 independent_tasks.add(task)
         return independent_tasks
 
-    def run(self, max_parallel_tasks: int = None) -> None:
+    def run(self,
+            max_parallel_tasks: int = None,
+            max_memory: float = None,
+            executor: Callable[..., 'TaskExecutor'] = None) -> None:
         """Run tasks.
 
         Parameters
         ----------
         max_parallel_tasks : int
             Number of processes to run. If `1`, run the tasks sequentially.
+        max_memory : float
+            Memory budget (GB) for running tasks in parallel. A task is only
+            started if the sum of its estimated peak memory and that of the
+            tasks that are already running fits within this budget. If
+            `None`, the number of tasks is only limited by
+            `max_parallel_tasks`.
+        executor : callable
+            Called with the number of workers as keyword argument
+            `max_workers` to create the :class:`TaskExecutor` that runs
+            tasks in parallel. If `None`, :class:`MultiprocessingExecutor`
+            is used.
         """
         if max_parallel_tasks == 1:
             self._run_sequential()
         else:
-            self._run_parallel(max_parallel_tasks)
+            self._run_parallel(max_parallel_tasks, max_memory, executor)
 
     def _run_sequential(self) -> None:
         """Run tasks sequentially."""
@@ -733,65 +759,413 @@ class TaskSet(set):
         for task in sorted(tasks, key=lambda t: t.priority):
             task.run()
 
-    def _run_parallel(self, max_parallel_tasks=None):
+    def _run_parallel(self,
+                      max_parallel_tasks=None,
+                      max_memory=None,
+                      executor=None):
         """Run tasks in parallel."""
-        scheduled = self.flatten()
-        running: Dict[Type[BaseTask], Type[ApplyResult]] = {}
-
-        n_tasks = n_scheduled = len(scheduled)
-        n_running = 0
-
+        if executor is None:
+            executor = MultiprocessingExecutor
+        if max_memory is not None:
+            max_memory = int(max_memory * 2**30)
+        scheduler = TaskScheduler(self.flatten(), max_memory=max_memory)
+        running: Dict[BaseTask, Any] = {}
+        finished: queue.SimpleQueue = queue.SimpleQueue()
+
+        n_tasks = scheduler.n_tasks
         if max_parallel_tasks is None:
             max_parallel_tasks = os.cpu_count()
         max_parallel_tasks = min(max_parallel_tasks, n_tasks)
         logger.info("Running %s tasks using %s processes", n_tasks,
                     max_parallel_tasks)
+        if max_memory is not None:
+            logger.info("Running tasks with an estimated total memory use "
+                        "of at most %.1f GB", max_memory / 2**30)
 
-        def done(task):
-            """Assume a task is done if it not scheduled or running."""
-            return not (task in scheduled or task in running)
-
-        with Pool(processes=max_parallel_tasks) as pool:
-            while scheduled or running:
+        with executor(max_workers=max_parallel_tasks) as pool:
+            while scheduler.n_remaining:
                 # Submit new tasks to pool
-                for task in sorted(scheduled, key=lambda t: t.priority):
-                    if len(running) >= max_parallel_tasks:
-                        break
-                    if all(done(t) for t in task.ancestors):
-                        future = pool.apply_async(_run_task, [task])
-                        running[task] = future
-                        scheduled.remove(task)
-
-                # Handle completed tasks
-                ready = {t for t in running if running[t].ready()}
-                for task in ready:
-                    _copy_results(task, running[task])
-                    running.pop(task)
-
-                # Wait if there are still tasks running
-                if running:
-                    time.sleep(0.1)
-
-                # Log progress message
-                if len(scheduled) != n_scheduled or len(running) != n_running:
-                    n_scheduled, n_running = len(scheduled), len(running)
-                    n_done = n_tasks - n_scheduled - n_running
-                    logger.info(
-                        "Progress: %s tasks running, %s tasks waiting for "
-                        "ancestors, %s/%s done", n_running, n_scheduled,
-                        n_done, n_tasks)
-
+                while (scheduler.n_ready and len(running) < max_parallel_tasks
+                       and scheduler.next_fits()):
+                    task = scheduler.pop_ready()
+                    callback = partial(finished.put, task)
+                    running[task] = pool.submit(task, callback)
+
+                if not running:
+                    raise ValueError(
+                        f"Unable to run {scheduler.n_remaining} tasks, their "
+                        "ancestors contain a cycle")
+
+                # Wait until a task is finished
+                scheduler.statistics.stop_clock()
+                task = finished.get()
+                scheduler.statistics.start_clock()
+
+                # Handle completed task
+                _copy_results(task, running.pop(task))
+                scheduler.mark_done(task)
+
+                n_running = len(running)
+                n_scheduled = scheduler.n_remaining - n_running
+                logger.info(
+                    "Progress: %s tasks running, %s tasks waiting for "
+                    "ancestors, %s/%s done", n_running, n_scheduled,
+                    scheduler.n_done, n_tasks)
+
+            scheduler.statistics.stop_clock()
             logger.info("Successfully completed all tasks.")
-            pool.close()
-            pool.join()
+            logger.info("%s", scheduler.statistics)
+            self.statistics = scheduler.statistics
+
+
+class TaskExecutor(abc.ABC):
+    """Base class for executors that run tasks in parallel.
+
+    Executors are used as context managers by :meth:`TaskSet.run`, the
+    workers should be started on entering the context and stopped on
+    leaving it.
+
+    Parameters
+    ----------
+    max_workers:
+        Number of tasks that will be run in parallel.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+
+    def __enter__(self):
+        """Start the workers."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop the workers."""
+
+    @abc.abstractmethod
+    def submit(self, task: BaseTask, callback: Callable[[], Any]):
+        """Submit a task for running.
+
+        Parameters
+        ----------
+        task:
+            The task to run. Its ancestors have already been run.
+        callback:
+            Function that will be called without arguments, from any thread,
+            when the task is done or has failed.
+
+        Returns
+        -------
+        object
+            A future with a method ``get`` that returns the result of
+            :func:`_run_task` or raises the exception raised by the task.
+        """
+
+
+class MultiprocessingExecutor(TaskExecutor):
+    """Run tasks in a :class:`multiprocessing.pool.Pool` on this machine."""
+
+    def __enter__(self):
+        """Start the pool of worker processes."""
+        self._pool = Pool(processes=self.max_workers)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop the pool of worker processes."""
+        if exc_type is None:
+            self._pool.close()
+            self._pool.join()
+        self._pool.terminate()
+
+    def submit(self, task, callback):
+        """Submit a task for running."""
+        def _callback(_):
+            callback()
+
+        return self._pool.apply_async(_run_task, [task],
+                                      callback=_callback,
+                                      error_callback=_callback)
+
+
+class _DaskFuture:
+    """Wrap a :class:`distributed.Future` so it behaves as an AsyncResult."""
+
+    def __init__(self, future):
+        self._future = future
+
+    def get(self):
+        """Return the result of the task."""
+        return self._future.result()
+
+
+class DaskExecutor(TaskExecutor):
+    """Run tasks on a :mod:`dask.distributed` cluster.
+
+    Each task is run on a worker of the cluster. While a task is running, it
+    does not occupy a worker thread, so the computation of the lazy data in
+    the task is also distributed over the workers of the cluster.
+
+    Parameters
+    ----------
+    max_workers:
+        Number of tasks that will be run in parallel. If no scheduler address
+        is given, this is also the number of single-threaded worker processes
+        of the :class:`distributed.LocalCluster` that is started.
+    scheduler_address:
+        Address of the scheduler of an existing cluster, e.g.
+        ``tcp://10.0.0.1:8786``. If `None`, a local cluster is started.
+    """
+
+    def __init__(self,
+                 max_workers: Optional[int] = None,
+                 scheduler_address: Optional[str] = None):
+        super().__init__(max_workers=max_workers)
+        self.scheduler_address = scheduler_address
+        self._cluster = None
+        self._client = None
+
+    def __enter__(self):
+        """Connect to the cluster."""
+        try:
+            from distributed import Client, LocalCluster
+        except ImportError as exc:
+            raise ImportError(
+                "Running tasks with Dask requires the package 'distributed' "
+                "to be installed") from exc
+        if self.scheduler_address is None:
+            self._cluster = LocalCluster(n_workers=self.max_workers,
+                                         threads_per_worker=1,
+                                         dashboard_address=None)
+            address = self._cluster
+        else:
+            address = self.scheduler_address
+        self._client = Client(address)
+        logger.info("Running tasks on Dask cluster %s", self._client)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Disconnect from the cluster."""
+        self._client.close()
+        if self._cluster is not None:
+            self._cluster.close()
+
+    def submit(self, task, callback):
+        """Submit a task for running."""
+        future = self._client.submit(_run_task_on_dask_worker,
+                                     task,
+                                     key=f"{task.name}-{uuid.uuid4()}",
+                                     pure=False)
+        future.add_done_callback(lambda _: callback())
+        return _DaskFuture(future)
+
+
+class SchedulerStatistics:
+    """Throughput and latency counters of a :class:`TaskScheduler`.
+
+    Attributes
+    ----------
+    n_tasks: int
+        Number of tasks that have been completed.
+    wall_time: float
+        Time (s) from the start until the end of the run.
+    scheduling_time: float
+        Time (s) spent on scheduling, i.e. the wall time minus the time
+        spent waiting for running tasks to finish.
+    queue_times: list[float]
+        For each task, the time (s) between the completion of its last
+        ancestor and its submission for running.
+    """
+
+    def __init__(self):
+        self.n_tasks = 0
+        self.wall_time = 0.
+        self.scheduling_time = 0.
+        self.queue_times: List[float] = []
+        self._start = time.perf_counter()
+        self._clock = self._start
+
+    def start_clock(self):
+        """Start measuring scheduling time."""
+        self._clock = time.perf_counter()
+
+    def stop_clock(self):
+        """Stop measuring scheduling time."""
+        now = time.perf_counter()
+        self.scheduling_time += now - self._clock
+        self.wall_time = now - self._start
+        self._clock = now
+
+    @property
+    def throughput(self) -> float:
+        """Number of tasks completed per second."""
+        if not self.wall_time:
+            return float('nan')
+        return self.n_tasks / self.wall_time
+
+    @property
+    def overhead_per_task(self) -> float:
+        """Mean scheduling time (s) per completed task."""
+        if not self.n_tasks:
+            return float('nan')
+        return self.scheduling_time / self.n_tasks
+
+    @property
+    def mean_queue_time(self) -> float:
+        """Mean time (s) that a task waited for a free process."""
+        if not self.queue_times:
+            return float('nan')
+        return sum(self.queue_times) / len(self.queue_times)
+
+    def __str__(self):
+        """Return a summary of the counters."""
+        return (f"Completed {self.n_tasks} tasks in {self.wall_time:.1f} s "
+                f"({self.throughput:.2f} tasks/s), scheduling overhead "
+                f"{1e3 * self.overhead_per_task:.3f} ms per task, mean "
+                f"waiting time for a free process "
+                f"{self.mean_queue_time:.3f} s")
+
+
+class TaskScheduler:
+    """Keep track of which tasks are ready to run.
+
+    A reverse-dependency index maps each task to the tasks that have it as an
+    ancestor, so a task is added to the queue of ready tasks as soon as its
+    last ancestor is done, without scanning all remaining tasks. Ready tasks
+    are returned in order of priority.
+
+    If a memory budget is given, the estimated peak memory of the tasks that
+    have been started but are not yet done is tracked, so tasks are only
+    started while their estimates fit within the budget.
+
+    Parameters
+    ----------
+    tasks:
+        All tasks that need to be run, including their ancestors.
+    max_memory:
+        Memory budget (bytes). If `None`, memory use is not limited.
+    """
+
+    def __init__(self,
+                 tasks: Iterable[BaseTask],
+                 max_memory: Optional[int] = None):
+        self.statistics = SchedulerStatistics()
+        self.max_memory = max_memory
+        self.memory_in_use = 0
+        self.n_running = 0
+        self._memory: Dict[BaseTask, int] = {}
+        self._dependents: Dict[BaseTask, List[BaseTask]] = {}
+        self._n_waiting_for: Dict[BaseTask, int] = {}
+        self._ready: list = []
+        self._ready_time: Dict[BaseTask, float] = {}
+        self._counter = itertools.count()
+
+        tasks = set(tasks)
+        for task in tasks:
+            self._dependents.setdefault(task, [])
+            ancestors = {t for t in task.ancestors if t in tasks}
+            for ancestor in ancestors:
+                self._dependents.setdefault(ancestor, []).append(task)
+            self._n_waiting_for[task] = len(ancestors)
+        self.n_tasks = len(self._dependents)
+        self.n_remaining = self.n_tasks
+
+        for task, n_ancestors in self._n_waiting_for.items():
+            if n_ancestors == 0:
+                self._push_ready(task)
+
+    @property
+    def n_ready(self) -> int:
+        """Number of tasks that are ready to run."""
+        return len(self._ready)
+
+    @property
+    def n_done(self) -> int:
+        """Number of tasks that are done."""
+        return self.n_tasks - self.n_remaining
+
+    def _push_ready(self, task):
+        """Add a task to the queue of ready tasks."""
+        if self.max_memory is not None:
+            # Estimate only now, because the input files of a task may be
+            # created by its ancestors.
+            memory = task.estimate_memory()
+            if memory > self.max_memory:
+                logger.warning(
+                    "Task %s needs an estimated %.1f GB of memory, which is "
+                    "more than the configured 'max_memory' of %.1f GB, it "
+                    "will be run without other tasks running in parallel",
+                    task.name, memory / 2**30, self.max_memory / 2**30)
+            self._memory[task] = memory
+        self._ready_time[task] = time.perf_counter()
+        heapq.heappush(self._ready,
+                       (task.priority, next(self._counter), task))
+
+    def next_fits(self) -> bool:
+        """Check if the next ready task fits within the memory budget.
+
+        A task is always allowed to start when no other tasks are running,
+        so tasks that are larger than the budget are run on their own.
+        """
+        if self.max_memory is None or not self._ready or not self.n_running:
+            return True
+        task = self._ready[0][2]
+        fits = self.memory_in_use + self._memory[task] <= self.max_memory
+        if not fits:
+            logger.debug(
+                "Waiting with starting task %s, it needs an estimated %.1f GB "
+                "of memory and %.1f GB is in use", task.name,
+                self._memory[task] / 2**30, self.memory_in_use / 2**30)
+        return fits
+
+    def pop_ready(self) -> BaseTask:
+        """Return the ready task with the highest priority."""
+        _, _, task = heapq.heappop(self._ready)
+        self.statistics.queue_times.append(time.perf_counter() -
+                                           self._ready_time.pop(task))
+        self.n_running += 1
+        self.memory_in_use += self._memory.get(task, 0)
+        return task
+
+    def mark_done(self, task: BaseTask) -> None:
+        """Mark a task as done and release the tasks waiting for it."""
+        self.n_running -= 1
+        self.memory_in_use -= self._memory.pop(task, 0)
+        self.n_remaining -= 1
+        self.statistics.n_tasks += 1
+        for dependent in self._dependents[task]:
+            self._n_waiting_for[dependent] -= 1
+            if self._n_waiting_for[dependent] == 0:
+                self._push_ready(dependent)
 
 
 def _copy_results(task, future):
     """Update task with the results from the remote process."""
-    task.output_files, task.products = future.get()
+    task.output_files, records = future.get()
+    task.products = {
+        TrackedFile(filename, attributes, prov_filename=prov_filename)
+        for filename, attributes, prov_filename in records
+    }
 
 
 def _run_task(task):
-    """Run task and return the result."""
+    """Run task and return the result.
+
+    To limit the amount of data that is sent back to the main process, only
+    the output files and a small record of the filename and attributes of
+    each product are returned. The provenance of the products is read from
+    their provenance files when it is needed, e.g. when they are used as
+    ancestors by another task.
+    """
     output_files = task.run()
-    return output_files, task.products
+    records = [(product.filename, product.attributes, product.prov_filename)
+               for product in task.products]
+    return output_files, records
+
+
+def _run_task_on_dask_worker(task):
+    """Run task on a Dask worker and return the result."""
+    from distributed import worker_client
+
+    # Leave the worker thread, so the lazy data in the task can be computed
+    # by the workers of the cluster without a deadlock.
+    with worker_client():
+        return _run_task(task)
@@ -0,0 +1,185 @@
+"""Patches of NetCDF attributes that are applied while loading a file.
+
+Fixes can declare patches for the attributes of the variables in a file
+with :meth:`esmvalcore.cmor._fixes.fix.Fix.get_attribute_patches`. Instead
+of writing a fixed copy of the file, the patches are applied to the cubes
+loaded from the original file.
+"""
+import dask.array as da
+import numpy as np
+from cf_units import Unit
+from netCDF4 import Dataset, default_fillvals
+
+MASKING_ATTRIBUTES = (
+    '_FillValue',
+    'missing_value',
+    'valid_min',
+    'valid_max',
+    'valid_range',
+)
+SCALING_ATTRIBUTES = (
+    'scale_factor',
+    'add_offset',
+)
+
+
+class PatchedFile(str):
+    """Path to a file with patches for the attributes of its variables.
+
+    Parameters
+    ----------
+    path: str
+        Path to the file.
+    patches: dict
+        Map from the names of variables in the file to a :obj:`dict` with
+        the patched values of their attributes. A value of `None` removes
+        the attribute.
+    """
+
+    def __new__(cls, path, patches):
+        """Create a new path with patches."""
+        patched_file = super().__new__(cls, path)
+        patched_file.patches = patches
+        return patched_file
+
+    def __reduce__(self):
+        """Support pickling and copying."""
+        return (PatchedFile, (str(self), self.patches))
+
+
+def _get_attributes(variable, patches):
+    """Get the attributes of a NetCDF variable with patches applied."""
+    attributes = {
+        name: variable.getncattr(name)
+        for name in variable.ncattrs()
+    }
+    attributes.update(patches)
+    return {k: v for k, v in attributes.items() if v is not None}
+
+
+def _get_mask(data, attributes):
+    """Get the mask of raw NetCDF data according to its attributes."""
+    mask = np.zeros(data.shape, dtype=bool)
+    fill_values = []
+    for name in ('_FillValue', 'missing_value'):
+        if name in attributes:
+            fill_values.extend(np.atleast_1d(attributes[name]))
+    if ('_FillValue' not in attributes
+            and data.dtype.str[1:] not in ('i1', 'u1')):
+        # Like netCDF4, mask the default fill value of the data type
+        fill_values.extend(
+            np.atleast_1d(default_fillvals.get(data.dtype.str[1:], [])))
+    for value in fill_values:
+        if np.issubdtype(data.dtype, np.floating) and np.isnan(value):
+            mask |= np.isnan(data)
+        else:
+            mask |= data == value
+
+    valid_min, valid_max = attributes.get(
+        'valid_range',
+        (attributes.get('valid_min'), attributes.get('valid_max')),
+    )
+    if valid_min is not None:
+        mask |= data < valid_min
+    if valid_max is not None:
+        mask |= data > valid_max
+    return mask
+
+
+class PatchedDataProxy:
+    """Lazily read the data of a NetCDF variable with patched attributes.
+
+    The raw data is read from the file and masked and scaled according to
+    the attributes of the variable in the file, overridden by `patches`.
+    """
+
+    def __init__(self, filename, var_name, shape, dtype, patches):
+        self.filename = str(filename)
+        self.var_name = var_name
+        self.shape = shape
+        self.dtype = np.dtype(dtype)
+        self.ndim = len(shape)
+        self.patches = patches
+
+    def __getitem__(self, keys):
+        with Dataset(self.filename) as dataset:
+            variable = dataset.variables[self.var_name]
+            variable.set_auto_maskandscale(False)
+            data = np.asarray(variable[keys])
+            attributes = _get_attributes(variable, self.patches)
+        mask = _get_mask(data, attributes)
+        data = data.astype(self.dtype)
+        if 'scale_factor' in attributes:
+            data *= attributes['scale_factor']
+        if 'add_offset' in attributes:
+            data += attributes['add_offset']
+        return np.ma.masked_array(data, mask=mask)
+
+
+def _patch_metadata(item, patches):
+    """Patch the metadata of a cube or coordinate."""
+    for name, value in patches.items():
+        if name in MASKING_ATTRIBUTES + SCALING_ATTRIBUTES:
+            continue
+        if name in ('standard_name', 'long_name'):
+            setattr(item, name, value)
+        elif name == 'units':
+            item.units = Unit(value, calendar=item.units.calendar)
+        elif name == 'calendar':
+            item.units = Unit(item.units.origin, calendar=value)
+        elif value is None:
+            item.attributes.pop(name, None)
+        else:
+            item.attributes[name] = value
+
+
+def _get_patched_dtype(cube, patches):
+    """Get the data type of a cube after patching the scaling."""
+    dtypes = [
+        np.asarray(patches[name]).dtype for name in SCALING_ATTRIBUTES
+        if patches.get(name) is not None
+    ]
+    return np.result_type(cube.dtype, *dtypes)
+
+
+def apply_attribute_patches(cubes, filename, patches):
+    """Apply patches of NetCDF attributes to the cubes loaded from a file.
+
+    Patches of the attributes listed in :const:`MASKING_ATTRIBUTES` and
+    :const:`SCALING_ATTRIBUTES` of the data variable of a cube change how the
+    data is read from the file. Patches of ``standard_name``, ``long_name``,
+    ``units`` and ``calendar`` change the corresponding properties of the
+    cube or coordinate, and patches of other attributes change its
+    attributes.
+
+    Parameters
+    ----------
+    cubes: iris.cube.CubeList
+        Cubes loaded from `filename`, they are modified in place.
+    filename: str
+        The file.
+    patches: dict
+        The patches, see :class:`PatchedFile`.
+    """
+    for cube in cubes:
+        for item in [cube] + cube.coords():
+            if item.var_name in patches:
+                _patch_metadata(item, patches[item.var_name])
+
+        data_patches = {
+            k: v
+            for k, v in patches.get(cube.var_name, {}).items()
+            if k in MASKING_ATTRIBUTES + SCALING_ATTRIBUTES
+        }
+        if not data_patches:
+            continue
+        dtype = _get_patched_dtype(cube, data_patches)
+        proxy = PatchedDataProxy(filename, cube.var_name, cube.shape, dtype,
+                                 data_patches)
+        chunks = cube.lazy_data().chunks
+        cube.data = da.from_array(
+            proxy,
+            chunks=chunks,
+            asarray=False,
+            meta=np.ma.array(np.empty((0, ) * cube.ndim, dtype=dtype)),
+        )
@@ -8,6 +8,18 @@ from ..table import CMOR_TABLES
 
 class Fix:
     """Base class for dataset fixes."""
+
+    per_dataset = False
+    """Apply :meth:`fix_metadata` once per dataset instead of once per file.
+
+    By default, :meth:`fix_metadata` is applied to the cubes loaded from
+    each input file, before they are concatenated. Fixes that are not
+    needed to check and concatenate the cubes of the individual files, e.g.
+    fixes of the time points or bounds, can set this to `True`. They are
+    then applied once to the concatenated cube of the dataset, see
+    :func:`esmvalcore.preprocessor.fix_dataset_metadata`.
+    """
+
     def __init__(self, vardef, extra_facets=None):
         """Initialize fix object.
 
@@ -47,6 +59,28 @@ class Fix:
         """
         return filepath
 
+    def get_attribute_patches(self, filepath):
+        """Get patches for the attributes of the variables in a file.
+
+        Use this instead of :meth:`fix_file` if only the attributes of the
+        variables in the file are wrong, e.g. ``_FillValue``,
+        ``missing_value`` or ``scale_factor``. The patches are applied when
+        the file is loaded, so no fixed copy of the file is needed.
+
+        Parameters
+        ----------
+        filepath: str
+            file to fix
+
+        Returns
+        -------
+        dict
+            Map from the names of the variables in the file to a
+            :obj:`dict` with the patched values of their attributes. A value
+            of `None` removes the attribute.
+        """
+        return {}
+
     def fix_metadata(self, cubes):
         """Apply fixes to the metadata of the cube.
 
@@ -10,8 +10,6 @@ import iris.exceptions
 import iris.util
 import numpy as np
 
-from esmvalcore.iris_helpers import date2num
-
 from .table import CMOR_TABLES
 
 CheckLevels = IntEnum('CheckLevels', 'DEBUG STRICT DEFAULT RELAXED IGNORE')
@@ -33,39 +31,65 @@ def _get_next_month(month, year):
     return 1, year + 1
 
 
-def _get_time_bounds(time, freq):
-    bounds = []
-    for step, point in enumerate(time.points):
-        month = time.cell(step).point.month
-        year = time.cell(step).point.year
-        if freq in ['mon', 'mo']:
-            next_month, next_year = _get_next_month(month, year)
-            min_bound = date2num(datetime(year, month, 1, 0, 0),
-                                 time.units, time.dtype)
-            max_bound = date2num(datetime(next_year, next_month, 1, 0, 0),
-                                 time.units, time.dtype)
-        elif freq == 'yr':
-            min_bound = date2num(datetime(year, 1, 1, 0, 0),
-                                 time.units, time.dtype)
-            max_bound = date2num(datetime(year + 1, 1, 1, 0, 0),
-                                 time.units, time.dtype)
-        elif freq == 'dec':
-            min_bound = date2num(datetime(year, 1, 1, 0, 0),
-                                 time.units, time.dtype)
-            max_bound = date2num(datetime(year + 10, 1, 1, 0, 0),
-                                 time.units, time.dtype)
-        else:
-            delta = {
-                'day': 12 / 24,
-                '6hr': 3 / 24,
-                '3hr': 1.5 / 24,
-                '1hr': 0.5 / 24,
-            }
-            min_bound = point - delta[freq]
-            max_bound = point + delta[freq]
-        bounds.append([min_bound, max_bound])
+def _get_period_indices(points, units, months, extra_periods=1):
+    """Find the calendar periods that contain the time points.
+
+    The periods are `months` months long and start on the first day of a
+    month, e.g. ``months=1`` for calendar months and ``months=12`` for
+    calendar years. The periods are computed once for the whole range of
+    the time points, so no datetime objects need to be created for the
+    individual points.
+
+    Parameters
+    ----------
+    points: np.ndarray
+        Numeric time points.
+    units: cf_units.Unit
+        Time reference units of the points.
+    months: int
+        Length of the periods in months.
+    extra_periods: int
+        Number of periods after the last one containing a point for which
+        the start is returned.
+
+    Returns
+    -------
+    indices: np.ndarray
+        Index of the period that contains each point.
+    starts: np.ndarray
+        Numeric start of the periods, the period with index ``i`` starts at
+        ``starts[i]``.
+    """
+    first, last = units.num2date(np.array([np.min(points), np.max(points)]))
+    first_period = (first.year * 12 + first.month - 1) // months
+    last_period = (last.year * 12 + last.month - 1) // months
+    starts = []
+    for period in range(first_period, last_period + extra_periods + 1):
+        year, month = divmod(period * months, 12)
+        starts.append(datetime(year, month + 1, 1))
+    starts = np.asarray(units.date2num(starts))
+    indices = np.searchsorted(starts, points, side='right') - 1
+    return indices, starts
+
 
-    return np.array(bounds)
+def _get_time_bounds(time, freq):
+    if freq in ['mon', 'mo', 'yr', 'dec']:
+        months = 1 if freq in ['mon', 'mo'] else 12
+        length = 10 if freq == 'dec' else 1
+        indices, starts = _get_period_indices(time.points,
+                                              time.units,
+                                              months,
+                                              extra_periods=length)
+        bounds = np.stack([starts[indices], starts[indices + length]], -1)
+        return bounds.astype(time.dtype)
+    delta = {
+        'day': 12 / 24,
+        '6hr': 3 / 24,
+        '3hr': 1.5 / 24,
+        '1hr': 0.5 / 24,
+    }
+    points = time.points[:, np.newaxis]
+    return np.hstack([points - delta[freq], points + delta[freq]])
 
 
 class CMORCheckError(Exception):
@@ -94,6 +118,11 @@ class CMORCheck():
         detected error, if possible.
     check_level: CheckLevels
         Level of strictness of the checks.
+    check_frequency: bool
+        If False, the time points are not checked against the frequency.
+        This is used to skip the check for the cubes loaded from the
+        individual files of a dataset, because the concatenated time axis is
+        checked later on.
 
     Attributes
     ----------
@@ -113,7 +142,8 @@ class CMORCheck():
                  frequency=None,
                  fail_on_error=False,
                  check_level=CheckLevels.DEFAULT,
-                 automatic_fixes=False):
+                 automatic_fixes=False,
+                 check_frequency=True):
 
         self._cube = cube
         self._failerr = fail_on_error
@@ -129,6 +159,7 @@ class CMORCheck():
             frequency = self._cmor_var.frequency
         self.frequency = frequency
         self.automatic_fixes = automatic_fixes
+        self.check_frequency = check_frequency
 
     def _is_unstructured_grid(self):
         if self._unstructured is None:
@@ -867,41 +898,49 @@ class CMORCheck():
                             attrs[branch_child] = old_units.convert(
                                 attrs[branch_child], coord.units)
 
-        tol = 0.001
-        intervals = {'dec': (3600, 3660), 'day': (1, 1)}
         freq = self.frequency
         if freq.lower().endswith('pt'):
             freq = freq[:-2]
-        if freq in ['mon', 'mo']:
-            for i in range(len(coord.points) - 1):
-                first = coord.cell(i).point
-                second = coord.cell(i + 1).point
-                second_month = first.month + 1
-                second_year = first.year
-                if second_month == 13:
-                    second_month = 1
-                    second_year += 1
-                if second_month != second.month or \
-                   second_year != second.year:
-                    msg = '{}: Frequency {} does not match input data'
-                    self.report_error(msg, var_name, freq)
-                    break
-        elif freq == 'yr':
-            for i in range(len(coord.points) - 1):
-                first = coord.cell(i).point
-                second = coord.cell(i + 1).point
-                second_month = first.month + 1
-                if first.year + 1 != second.year:
-                    msg = '{}: Frequency {} does not match input data'
-                    self.report_error(msg, var_name, freq)
-                    break
+        if freq == 'hr':
+            freq = '1hr'
+        if freq not in ('mon', 'mo', 'yr', 'dec', 'day') and \
+                not freq.endswith('hr'):
+            msg = '{}: Frequency {} not supported by checker'
+            self.report_error(msg, var_name, freq)
+            return
+        if self.check_frequency:
+            self._check_time_frequency(freq, coord)
+        self._check_time_bounds(freq, coord)
+        # remove time_origin from attributes
+        coord.attributes.pop('time_origin', None)
+
+    def _check_time_frequency(self, freq, coord):
+        """Check that the time points match the frequency."""
+        points = coord.points
+        if len(points) < 2:
+            return
+        if freq in ['mon', 'mo', 'yr']:
+            if not coord.units.is_time_reference():
+                return
+            months = 1 if freq in ['mon', 'mo'] else 12
+            first, last = coord.units.num2date(
+                np.array([np.min(points), np.max(points)]))
+            span = ((last.year * 12 + last.month - 1) // months -
+                    (first.year * 12 + first.month - 1) // months)
+            # Consecutive periods are only possible if the points span
+            # exactly one period each, this also limits the number of
+            # periods that need to be computed below
+            matches = span == len(points) - 1
+            if matches:
+                indices = _get_period_indices(points, coord.units, months)[0]
+                matches = np.all(np.diff(indices) == 1)
         else:
+            tol = 0.001
+            intervals = {'dec': (3600, 3660), 'day': (1, 1)}
             if freq in intervals:
                 interval = intervals[freq]
                 target_interval = (interval[0] - tol, interval[1] + tol)
-            elif freq.endswith('hr'):
-                if freq == 'hr':
-                    freq = '1hr'
+            else:
                 frequency = freq[:-2]
                 if frequency == 'sub':
                     frequency = 1.0 / 24
@@ -909,20 +948,12 @@ class CMORCheck():
                 else:
                     frequency = float(frequency) / 24
                     target_interval = (frequency - tol, frequency + tol)
-            else:
-                msg = '{}: Frequency {} not supported by checker'
-                self.report_error(msg, var_name, freq)
-                return
-            for i in range(len(coord.points) - 1):
-                interval = coord.points[i + 1] - coord.points[i]
-                if (interval < target_interval[0]
-                        or interval > target_interval[1]):
-                    msg = '{}: Frequency {} does not match input data'
-                    self.report_error(msg, var_name, freq)
-                    break
-        self._check_time_bounds(freq, coord)
-        # remove time_origin from attributes
-        coord.attributes.pop('time_origin', None)
+            interval = np.diff(points)
+            matches = not np.any((interval < target_interval[0])
+                                 | (interval > target_interval[1]))
+        if not matches:
+            msg = '{}: Frequency {} does not match input data'
+            self.report_error(msg, coord.var_name, freq)
 
     @staticmethod
     def _simplify_calendar(calendar):
@@ -1056,7 +1087,8 @@ def _get_cmor_checker(table,
                       frequency,
                       fail_on_error=False,
                       check_level=CheckLevels.DEFAULT,
-                      automatic_fixes=False):
+                      automatic_fixes=False,
+                      check_frequency=True):
     """Get a CMOR checker/fixer."""
     if table not in CMOR_TABLES:
         raise NotImplementedError(
@@ -1075,7 +1107,8 @@ def _get_cmor_checker(table,
                          frequency=frequency,
                          fail_on_error=fail_on_error,
                          check_level=check_level,
-                         automatic_fixes=automatic_fixes)
+                         automatic_fixes=automatic_fixes,
+                         check_frequency=check_frequency)
 
     return _checker
 
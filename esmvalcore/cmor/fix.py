@@ -9,6 +9,7 @@ from collections import defaultdict
 
 from iris.cube import CubeList
 
+from ._fixes.attribute_patches import PatchedFile
 from ._fixes.fix import Fix
 from .check import CheckLevels, _get_cmor_checker
 
@@ -22,7 +23,9 @@ def fix_file(file, short_name, project, dataset, mip, output_dir,
     This fixes are only for issues that prevent iris from loading the cube or
     that cannot be fixed after the cube is loaded.
 
-    Original files are not overwritten.
+    Original files are not overwritten. Fixes that only patch the attributes
+    of the variables in a file do not copy it, the patches are applied when
+    the file is loaded with :func:`esmvalcore.preprocessor.load`.
 
     Parameters
     ----------
@@ -41,14 +44,20 @@ def fix_file(file, short_name, project, dataset, mip, output_dir,
     Returns
     -------
     str:
-        Path to the fixed file
+        Path to the fixed file, with the patches of its attributes if there
+        are any.
     """
+    patches = {}
     for fix in Fix.get_fixes(project=project,
                              dataset=dataset,
                              mip=mip,
                              short_name=short_name,
                              extra_facets=extra_facets):
         file = fix.fix_file(file, output_dir)
+        for var_name, attributes in fix.get_attribute_patches(file).items():
+            patches.setdefault(var_name, {}).update(attributes)
+    if patches:
+        file = PatchedFile(file, patches)
     return file
 
 
@@ -67,6 +76,14 @@ def fix_metadata(cubes,
     needed) metadata to ensure that it complies with the standards of its
     project CMOR tables.
 
+    Fixes and checks are applied to the cubes loaded from each file
+    separately, so they are limited to what is needed to concatenate them.
+    Fixes that are declared with :attr:`Fix.per_dataset
+    <esmvalcore.cmor._fixes.fix.Fix.per_dataset>` are applied later by
+    :func:`fix_dataset_metadata` and the time points are only checked
+    against the frequency on the concatenated cube by
+    :func:`esmvalcore.cmor.check.cmor_check_metadata`.
+
     Parameters
     ----------
     cubes: iris.cube.CubeList
@@ -98,11 +115,14 @@ def fix_metadata(cubes,
     CMORCheckError
         If the checker detects errors in the metadata that it can not fix.
     """
-    fixes = Fix.get_fixes(project=project,
-                          dataset=dataset,
-                          mip=mip,
-                          short_name=short_name,
-                          extra_facets=extra_facets)
+    fixes = [
+        fix for fix in Fix.get_fixes(project=project,
+                                     dataset=dataset,
+                                     mip=mip,
+                                     short_name=short_name,
+                                     extra_facets=extra_facets)
+        if not fix.per_dataset
+    ]
     fixed_cubes = []
     by_file = defaultdict(list)
     for cube in cubes:
@@ -120,13 +140,58 @@ def fix_metadata(cubes,
                                     short_name=short_name,
                                     check_level=check_level,
                                     fail_on_error=False,
-                                    automatic_fixes=True)
+                                    automatic_fixes=True,
+                                    check_frequency=False)
         cube = checker(cube).check_metadata()
         cube.attributes.pop('source_file', None)
         fixed_cubes.append(cube)
     return fixed_cubes
 
 
+def fix_dataset_metadata(cube, short_name, project, dataset, mip,
+                         **extra_facets):
+    """Fix the metadata of the concatenated cube of a dataset.
+
+    Applies the metadata fixes that are declared with
+    :attr:`Fix.per_dataset <esmvalcore.cmor._fixes.fix.Fix.per_dataset>`,
+    so they are applied once to the whole time axis instead of once per
+    input file.
+
+    Parameters
+    ----------
+    cube: iris.cube.Cube
+        Cube to fix
+    short_name: str
+        Variable's short name
+    project: str
+    dataset: str
+    mip: str
+        Variable's MIP
+    **extra_facets: dict, optional
+        Extra facets are mainly used for data outside of the big projects like
+        CMIP, CORDEX, obs4MIPs. For details, see :ref:`extra_facets`.
+
+    Returns
+    -------
+    iris.cube.Cube:
+        Fixed cube
+    """
+    fixes = [
+        fix for fix in Fix.get_fixes(project=project,
+                                     dataset=dataset,
+                                     mip=mip,
+                                     short_name=short_name,
+                                     extra_facets=extra_facets)
+        if fix.per_dataset
+    ]
+    if not fixes:
+        return cube
+    cube_list = CubeList([cube])
+    for fix in fixes:
+        cube_list = fix.fix_metadata(cube_list)
+    return _get_single_cube(cube_list, short_name, project, dataset)
+
+
 def _get_single_cube(cube_list, short_name, project, dataset):
     if len(cube_list) == 1:
         return cube_list[0]
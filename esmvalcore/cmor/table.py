@@ -3,12 +3,16 @@
 Read variable information from CMOR 2 and CMOR 3 tables and make it
 easily available for the other components of ESMValTool
 """
+import abc
 import copy
 import errno
 import glob
+import hashlib
 import json
 import logging
 import os
+import pickle
+import tempfile
 from collections import Counter
 from functools import total_ordering
 from pathlib import Path
@@ -16,11 +20,32 @@ from typing import Dict, Type
 
 import yaml
 
+from .._version import __version__
+
 logger = logging.getLogger(__name__)
 
 CMOR_TABLES: Dict[str, Type['InfoBase']] = {}
 """dict of str, obj: CMOR info objects."""
 
+_CACHE_DIR = None
+_CACHE_VERSION = 1
+
+
+def set_cmor_table_cache(directory=None):
+    """Configure the directory where parsed CMOR tables are stored.
+
+    The tables are stored under a hash of the contents of the table files, so
+    a stored copy is only re-used as long as the tables have not changed.
+
+    Parameters
+    ----------
+    directory: str or None
+        Directory where the parsed tables are stored between runs, or `None`
+        to parse the table files in every run.
+    """
+    global _CACHE_DIR  # pylint: disable=global-statement
+    _CACHE_DIR = None if directory is None else Path(directory)
+
 
 def get_var_info(project, mip, short_name):
     """Get variable information.
@@ -98,11 +123,53 @@ def _read_table(cfg_developer, table, install_dir, custom, alt_names):
     raise ValueError(f'Unsupported CMOR type {cmor_type}')
 
 
-class InfoBase():
+def _get_cache_file(info):
+    """Get the file where the parsed tables of `info` are stored."""
+    digest = hashlib.sha256(
+        f'{_CACHE_VERSION} {__version__} {type(info).__name__}'.encode())
+    for filename in sorted(glob.glob(os.path.join(info._cmor_folder, '*'))):
+        if not os.path.isfile(filename):
+            continue
+        digest.update(os.path.basename(filename).encode())
+        with open(filename, 'rb') as file:
+            digest.update(file.read())
+    return _CACHE_DIR / f'{digest.hexdigest()}.pickle'
+
+
+def _read_cache(cache_file):
+    """Read parsed tables from the cache, returns `None` if not possible."""
+    try:
+        with open(cache_file, 'rb') as file:
+            return pickle.load(file)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.debug("Not using cached CMOR tables %s: %s", cache_file, exc)
+        return None
+
+
+def _write_cache(cache_file, state):
+    """Store parsed tables in the cache, if possible."""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=cache_file.parent,
+                                         suffix='.tmp',
+                                         delete=False) as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(file.name, cache_file)
+    except OSError as exc:
+        logger.debug("Not caching CMOR tables in %s: %s", cache_file, exc)
+
+
+class InfoBase(abc.ABC):
     """Base class for all table info classes.
 
     This uses CMOR 3 json format
 
+    The table files are only read when the tables are first needed, and the
+    parsed tables can be stored to be re-used, see
+    :func:`set_cmor_table_cache`.
+
     Parameters
     ----------
     default: object
@@ -121,7 +188,50 @@ class InfoBase():
         self.default = default
         self.alt_names = alt_names
         self.strict = strict
-        self.tables = {}
+        self._loaded = False
+
+    _lazy_attributes = ('tables', 'coords', 'var_to_freq')
+    """Attributes that are only available after reading the tables."""
+
+    def __getattr__(self, name):
+        """Read the tables when they are first needed."""
+        if name not in self._lazy_attributes or self.__dict__.get(
+                '_loaded', True):
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'")
+        self._loaded = True
+        try:
+            self.__dict__.update(self._load())
+        except Exception:
+            self._loaded = False
+            raise
+        return getattr(self, name)
+
+    def _load(self):
+        """Read the tables, re-using the stored parsed tables if possible.
+
+        Returns
+        -------
+        dict
+            Map from the names in :attr:`_lazy_attributes` to their values.
+        """
+        cache_file = None if _CACHE_DIR is None else _get_cache_file(self)
+        if cache_file is not None:
+            state = _read_cache(cache_file)
+            if state is not None:
+                return state
+        self._read_tables()
+        state = {
+            name: self.__dict__[name]
+            for name in self._lazy_attributes if name in self.__dict__
+        }
+        if cache_file is not None:
+            _write_cache(cache_file, state)
+        return state
+
+    @abc.abstractmethod
+    def _read_tables(self):
+        """Read the table files."""
 
     def get_table(self, table):
         """Search and return the table info.
@@ -237,6 +347,9 @@ class CMIP6Info(InfoBase):
         If False, will look for a variable in other tables if it can not be
         found in the requested one
     """
+    _lazy_attributes = InfoBase._lazy_attributes + ('activities',
+                                                    'institutes')
+
     def __init__(self,
                  cmor_tables_path,
                  default=None,
@@ -248,11 +361,14 @@ class CMIP6Info(InfoBase):
         cmor_tables_path = self._get_cmor_path(cmor_tables_path)
 
         self._cmor_folder = os.path.join(cmor_tables_path, 'Tables')
+        self.default_table_prefix = default_table_prefix
+
+    def _read_tables(self):
+        """Read the table files."""
         if glob.glob(os.path.join(self._cmor_folder, '*_CV.json')):
             self._load_controlled_vocabulary()
 
-        self.default_table_prefix = default_table_prefix
-
+        self.tables = {}
         self.var_to_freq = {}
 
         self._load_coordinates()
@@ -421,6 +537,12 @@ class JsonInfo(object):
     def __init__(self):
         self._json_data = {}
 
+    def __getstate__(self):
+        """Leave out the json data when pickling, it is no longer needed."""
+        state = self.__dict__.copy()
+        state['_json_data'] = None
+        return state
+
     def _read_json_variable(self, parameter, default=''):
         """Read a json parameter in json_data.
 
@@ -639,12 +761,13 @@ class CMIP5Info(InfoBase):
             raise OSError(errno.ENOTDIR, "CMOR tables path is not a directory",
                           self._cmor_folder)
 
-        self.strict = strict
-        self.tables = {}
-        self.coords = {}
         self._current_table = None
         self._last_line_read = None
 
+    def _read_tables(self):
+        """Read the table files."""
+        self.tables = {}
+        self.coords = {}
         for table_file in glob.glob(os.path.join(self._cmor_folder, '*')):
             if '_grids' in table_file:
                 continue
@@ -818,15 +941,19 @@ class CustomInfo(CMIP5Info):
     def __init__(self, cmor_tables_path=None):
         cwd = os.path.dirname(os.path.realpath(__file__))
         self._cmor_folder = os.path.join(cwd, 'tables', 'custom')
+        self._coordinates_file = os.path.join(
+            self._cmor_folder,
+            'CMOR_coordinates.dat',
+        )
+        self._loaded = False
+
+    def _read_tables(self):
+        """Read the table files."""
         self.tables = {}
         self.var_to_freq = {}
         table = TableInfo()
         table.name = 'custom'
         self.tables[table.name] = table
-        self._coordinates_file = os.path.join(
-            self._cmor_folder,
-            'CMOR_coordinates.dat',
-        )
         self.coords = {}
         self._read_table_file(self._coordinates_file, self.tables['custom'])
         for dat_file in glob.glob(os.path.join(self._cmor_folder, '*.dat')):
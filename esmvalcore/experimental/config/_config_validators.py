@@ -154,6 +154,7 @@ validate_stringlist = _listify_validator(validate_string,
 validate_int = _make_type_validator(int)
 validate_int_or_none = _make_type_validator(int, allow_none=True)
 validate_float = _make_type_validator(float)
+validate_float_or_none = _make_type_validator(float, allow_none=True)
 validate_floatlist = _listify_validator(validate_float,
                                         docstring='Return a list of floats.')
 
@@ -171,6 +172,9 @@ validate_pathtuple = _listify_validator(validate_path,
 validate_int_positive = _chain_validator(validate_int, validate_positive)
 validate_int_positive_or_none = _make_type_validator(validate_int_positive,
                                                      allow_none=True)
+validate_float_positive = _chain_validator(validate_float, validate_positive)
+validate_float_positive_or_none = _make_type_validator(
+    validate_float_positive, allow_none=True)
 
 
 def validate_oldstyle_rootpath(value):
@@ -212,6 +216,17 @@ def validate_check_level(value):
     return value
 
 
+def validate_task_executor(value):
+    """Validate the executor for running tasks in parallel."""
+    value = validate_string(value)
+    executors = ('multiprocessing', 'dask')
+    if value not in executors:
+        raise ValidationError(
+            f'`{value}` is not a valid task executor, choose from '
+            f'{", ".join(executors)}')
+    return value
+
+
 def validate_diagnostics(diagnostics):
     """Validate diagnostic location."""
     if isinstance(diagnostics, str):
@@ -263,6 +278,17 @@ _validators = {
     'save_intermediary_cubes': validate_bool,
     'remove_preproc_dir': validate_bool,
     'max_parallel_tasks': validate_int_or_none,
+    'max_memory': validate_float_positive_or_none,
+    'max_save_memory': validate_float_positive_or_none,
+    'task_executor': validate_task_executor,
+    'dask_scheduler_address': validate_string_or_none,
+    'preprocessor_cache_dir': validate_path_or_none,
+    'input_file_index': validate_path_or_none,
+    'preprocessor_cache_max_size': validate_float_positive,
+    'regridder_cache_dir': validate_path_or_none,
+    'regridder_cache_max_size': validate_float_positive,
+    'cmor_table_cache_dir': validate_path_or_none,
+    'profile_preprocessor': validate_bool,
     'config_developer_file': validate_config_developer,
     'profile_diagnostic': validate_bool,
     'run_diagnostic': validate_bool,
@@ -2,6 +2,7 @@
 import base64
 import logging
 import os
+import tempfile
 from collections.abc import Mapping
 from pathlib import Path
 from typing import Optional, Tuple, Type
@@ -333,7 +334,7 @@ class OutputFile():
         ext = Path(path).suffix
         if ext in ('.png', ):
             item_class = ImageFile
-        elif ext in ('.nc', ):
+        elif ext in ('.nc', '.zarr'):
             item_class = DataFile
         else:
             item_class = cls
@@ -367,8 +368,40 @@ class DataFile(OutputFile):
         """Load data using xarray."""
         # local import because `ESMValCore` does not depend on `xarray`
         import xarray as xr
+        if self.path.suffix == '.zarr':
+            return xr.open_zarr(self.path).load()
         return xr.load_dataset(self.path)
 
     def load_iris(self):
-        """Load data using iris."""
+        """Load data using iris.
+
+        :mod:`iris` cannot read Zarr stores, so these are first converted
+        to a temporary NetCDF file with :mod:`xarray` and loaded into
+        memory.
+        """
+        if self.path.suffix == '.zarr':
+            return self._load_zarr_iris()
         return iris.load(str(self.path))
+
+    def _load_zarr_iris(self):
+        """Load a Zarr store using iris."""
+        # local import because `ESMValCore` does not depend on `xarray`
+        import xarray as xr
+
+        # The variables and attributes in the store follow the CF
+        # conventions like a NetCDF file written by iris, so they are
+        # copied without decoding.
+        dataset = xr.open_zarr(self.path, decode_cf=False)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, self.path.stem + '.nc')
+            dataset.to_netcdf(filename)
+            cubes = iris.load(filename)
+            # Realise the data before the temporary file is removed
+            for cube in cubes:
+                cube.data = cube.data
+                for coord in cube.coords():
+                    coord.points = coord.points
+                    coord.bounds = coord.bounds
+                for item in cube.cell_measures() + cube.ancillary_variables():
+                    item.data = item.data
+        return cubes
@@ -1,15 +1,25 @@
 """Preprocessor module."""
+import contextlib
 import copy
 import inspect
+import json
 import logging
+import os
+from pathlib import Path
 from pprint import pformat
 
 from iris.cube import Cube
 
 from .._provenance import TrackedFile
 from .._task import BaseTask
+from .._version import __version__
 from ..cmor.check import cmor_check_data, cmor_check_metadata
-from ..cmor.fix import fix_data, fix_file, fix_metadata
+from ..cmor.fix import (
+    fix_data,
+    fix_dataset_metadata,
+    fix_file,
+    fix_metadata,
+)
 from ._ancillary_vars import add_fx_variables, remove_fx_variables
 from ._area import (
     area_statistics,
@@ -20,11 +30,19 @@ from ._area import (
     zonal_statistics,
 )
 from ._bias import bias
+from ._cache import (
+    _canonicalize,
+    describe_product,
+    get_file_fingerprint,
+    get_hash,
+)
 from ._cycles import amplitude
 from ._derive import derive
 from ._detrend import detrend
 from ._io import (
+    _get_data_size,
     _get_debug_filename,
+    _save_together,
     cleanup,
     concatenate,
     load,
@@ -44,6 +62,7 @@ from ._mask import (
 )
 from ._multimodel import ensemble_statistics, multi_model_statistics
 from ._other import clip
+from ._profiler import PreprocessorProfiler
 from ._regrid import extract_levels, extract_location, extract_point, regrid
 from ._time import (
     annual_statistics,
@@ -87,6 +106,7 @@ __all__ = [
     'fix_metadata',
     # Concatenate all cubes in one
     'concatenate',
+    'fix_dataset_metadata',
     'cmor_check_metadata',
     # Extract years given by dataset keys (start_year and end_year)
     'clip_timerange',
@@ -204,6 +224,61 @@ MULTI_MODEL_FUNCTIONS = {
     'mask_fillvalues',
 }
 
+# Single-model functions that can keep lazy data lazy, so the data is only
+# computed when the result is saved and is streamed from the input files to
+# the output file chunk by chunk instead of being loaded into memory
+# completely. Some of these only work on lazy data for particular settings,
+# see :func:`keeps_data_lazy`.
+LAZY_FUNCTIONS = {
+    'fix_metadata',
+    'concatenate',
+    'fix_dataset_metadata',
+    'cmor_check_metadata',
+    'clip_timerange',
+    'fix_data',
+    'cmor_check_data',
+    'add_fx_variables',
+    'extract_time',
+    'extract_season',
+    'extract_month',
+    'regrid_time',
+    'regrid',
+    'extract_region',
+    'mask_landsea',
+    'mask_landseaice',
+    'mask_above_threshold',
+    'mask_below_threshold',
+    'mask_inside_range',
+    'mask_outside_range',
+    'area_statistics',
+    'zonal_statistics',
+    'meridional_statistics',
+    'decadal_statistics',
+    'annual_statistics',
+    'seasonal_statistics',
+    'monthly_statistics',
+    'climate_statistics',
+    'anomalies',
+    'amplitude',
+    'detrend',
+    'linear_trend',
+    'convert_units',
+    'remove_fx_variables',
+}
+
+# Operators for which statistics preprocessor functions realize the data
+# because iris has no lazy implementation of the aggregator.
+NON_LAZY_OPERATORS = {
+    'area_statistics': {'median', 'rms'},
+    'zonal_statistics': {'median'},
+    'meridional_statistics': {'median'},
+    'decadal_statistics': {'median'},
+    'annual_statistics': {'median'},
+    'seasonal_statistics': {'median'},
+    'monthly_statistics': {'median'},
+    'climate_statistics': {'median'},
+}
+
 
 def _get_itype(step):
     """Get the input type of a preprocessor function."""
@@ -285,6 +360,29 @@ def _get_multi_model_settings(products, step):
     return settings, exclude
 
 
+# Estimated peak memory use of a preprocessor step, as a multiple of the size
+# of the data it is applied to. Most steps need memory for their input and
+# their output.
+DEFAULT_STEP_MEMORY_FACTOR = 2
+STEP_MEMORY_FACTOR = {
+    'extract_levels': 3,
+    'regrid': 3,
+}
+
+# Estimated memory used by a process running a preprocessing task
+# before any data is loaded.
+PROCESS_MEMORY = 2**29
+
+# Estimated memory used to stream data chunk by chunk through preprocessor
+# steps that all keep the data lazy.
+STREAMING_MEMORY = 2**30
+
+# Name of the file where the fingerprints of the recipe entries of a
+# preprocessing task and of the task itself are stored, one per line, used to
+# decide if its output can be re-used when resuming a run.
+FINGERPRINT_FILE = 'fingerprint.txt'
+
+
 def _run_preproc_function(function, items, kwargs, input_files=None):
     """Run preprocessor function."""
     kwargs_str = ",\n".join(
@@ -356,6 +454,47 @@ def preprocess(items, step, input_files=None, **settings):
     return items
 
 
+def keeps_data_lazy(step, settings):
+    """Check if a single-model preprocessor step keeps lazy data lazy.
+
+    Parameters
+    ----------
+    step: str
+        Name of the preprocessor step.
+    settings: dict
+        Settings of all preprocessor steps of the product, the settings of
+        `step` and of the step adding fx variables determine if the step can
+        work on lazy data.
+
+    Returns
+    -------
+    bool
+        `True` if the step does not load the data into memory.
+    """
+    if step not in LAZY_FUNCTIONS:
+        return False
+    step_settings = settings.get(step, {})
+    if step in NON_LAZY_OPERATORS:
+        operator = step_settings.get('operator', 'mean')
+        return operator.lower() not in NON_LAZY_OPERATORS[step]
+    if step == 'regrid':
+        # The 'linear', 'nearest' and 'area_weighted' schemes use ESMPy on
+        # irregular grids, which loads the data. As this cannot be known
+        # from the settings, only schemes that are always lazy are accepted.
+        scheme = step_settings.get('scheme')
+        if isinstance(scheme, dict):
+            return scheme.get('reference', '').startswith('iris.analysis:')
+        return scheme == 'linear_extrapolate'
+    if step == 'mask_landsea':
+        # Without land or sea area fractions, a Natural Earth shapefile
+        # mask is applied to the realized data.
+        fx_variables = settings.get('add_fx_variables',
+                                    {}).get('fx_variables', {})
+        return (not step_settings.get('always_use_ne_mask', False)
+                and bool({'sftlf', 'sftof'} & set(fx_variables)))
+    return True
+
+
 def get_step_blocks(steps, order):
     """Group steps into execution blocks."""
     blocks = []
@@ -390,6 +529,13 @@ class PreprocessorFile(TrackedFile):
 
         self._cubes = None
         self._prepared = False
+        self.profiler = None
+
+    def _profile(self, step):
+        """Profile a preprocessor step, if a profiler is set."""
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.profile(os.path.basename(self.filename), step)
 
     def _input_files_for_log(self):
         """Do not log input files twice in output log."""
@@ -401,29 +547,46 @@ class PreprocessorFile(TrackedFile):
         """Check preprocessor settings."""
         check_preprocessor_settings(self.settings)
 
+    def estimate_data_size(self):
+        """Estimate the size (bytes) of the input data once loaded."""
+        short_name = self.attributes.get('short_name')
+        return sum(
+            _get_data_size(filename, short_name)
+            for filename in self._input_files)
+
     def apply(self, step, debug=False):
         """Apply preprocessor step to product."""
         if step not in self.settings:
             raise ValueError(
                 "PreprocessorFile {} has no settings for step {}".format(
                     self, step))
-        self.cubes = preprocess(self.cubes, step,
-                                input_files=self._input_files,
-                                **self.settings[step])
+        cubes = self.cubes
+        with self._profile(step):
+            self.cubes = preprocess(cubes, step,
+                                    input_files=self._input_files,
+                                    **self.settings[step])
         if debug:
             logger.debug("Result %s", self.cubes)
             filename = _get_debug_filename(self.filename, step)
             save(self.cubes, filename)
 
+    def keeps_data_lazy(self):
+        """Check if all single-model steps of the product keep data lazy."""
+        return all(
+            keeps_data_lazy(step, self.settings) for step in self.settings
+            if DEFAULT_ORDER.index('load') < DEFAULT_ORDER.index(step) <
+            DEFAULT_ORDER.index('save'))
+
     def prepare(self):
         """Apply preliminary file operations on product."""
         if not self._prepared:
             for step in DEFAULT_ORDER[:DEFAULT_ORDER.index('load')]:
                 if step in self.settings:
-                    self.files = preprocess(
-                        self.files, step,
-                        input_files=self._input_files_for_log(),
-                        **self.settings[step])
+                    with self._profile(step):
+                        self.files = preprocess(
+                            self.files, step,
+                            input_files=self._input_files_for_log(),
+                            **self.settings[step])
             self._prepared = True
 
     @property
@@ -431,23 +594,35 @@ class PreprocessorFile(TrackedFile):
         """Cubes."""
         if self.is_closed:
             self.prepare()
-            self._cubes = preprocess(self.files, 'load',
-                                     input_files=self._input_files_for_log(),
-                                     **self.settings.get('load', {}))
+            with self._profile('load'):
+                self._cubes = preprocess(
+                    self.files, 'load',
+                    input_files=self._input_files_for_log(),
+                    **self.settings.get('load', {}))
         return self._cubes
 
     @cubes.setter
     def cubes(self, value):
         self._cubes = value
 
-    def save(self):
-        """Save cubes to disk."""
-        self.files = preprocess(self._cubes, 'save',
-                                input_files=self._input_files,
-                                **self.settings['save'])
-        self.files = preprocess(self.files, 'cleanup',
-                                input_files=self._input_files,
-                                **self.settings.get('cleanup', {}))
+    def save(self, cleanup=True):
+        """Save cubes to disk.
+
+        Temporary files are removed afterwards, unless `cleanup` is `False`.
+        """
+        with self._profile('save'):
+            self.files = preprocess(self._cubes, 'save',
+                                    input_files=self._input_files,
+                                    **self.settings['save'])
+        if cleanup:
+            self.cleanup()
+
+    def cleanup(self):
+        """Remove temporary files."""
+        with self._profile('cleanup'):
+            self.files = preprocess(self.files, 'cleanup',
+                                    input_files=self._input_files,
+                                    **self.settings.get('cleanup', {}))
 
     def close(self):
         """Close the file."""
@@ -516,6 +691,55 @@ def _apply_multimodel(products, step, debug):
     return products
 
 
+def _close_together(products):
+    """Close products, writing the data of their files together.
+
+    The products of a task with multi-model steps are computed from the
+    same input data, so writing their data together reads the input data
+    only once instead of once for every product.
+    """
+    products = [product for product in products if not product.is_closed]
+    if not products:
+        return
+    logger.debug("Saving %s together",
+                 ', '.join(str(p) for p in products))
+    with _save_together():
+        for product in products:
+            product.save(cleanup=False)
+    for product in products:
+        product.cleanup()
+        product.cubes = None
+        product.save_provenance()
+
+
+def _describe_product(product, order):
+    """Describe a product for the fingerprint of a preprocessing task.
+
+    Products of upstream tasks, e.g. the input of derived variables, are
+    described by their own input files and settings, because their path
+    changes with every run.
+    """
+    upstream = {
+        ancestor.filename: ancestor
+        for ancestor in product._ancestors
+        if isinstance(ancestor, PreprocessorFile)
+    }
+
+    def get_fingerprint(filename):
+        if filename in upstream:
+            return _describe_product(upstream[filename], order)
+        return get_file_fingerprint(filename)
+
+    attributes = {
+        k: v
+        for k, v in product.attributes.items() if k != 'filename'
+    }
+    return [
+        describe_product(product, order, get_fingerprint),
+        _canonicalize(attributes, get_fingerprint),
+    ]
+
+
 class PreprocessingTask(BaseTask):
     """Task for running the preprocessor."""
 
@@ -527,6 +751,8 @@ class PreprocessingTask(BaseTask):
         order=DEFAULT_ORDER,
         debug=None,
         write_ncl_interface=False,
+        cache=None,
+        profile_dir=None,
     ):
         """Initialize."""
         _check_multi_model_settings(products)
@@ -534,6 +760,59 @@ class PreprocessingTask(BaseTask):
         self.order = list(order)
         self.debug = debug
         self.write_ncl_interface = write_ncl_interface
+        self.cache = cache
+        self.profile_dir = profile_dir
+        # Fingerprint of the recipe entries the task was created from
+        self.recipe_fingerprint = None
+
+    def estimate_memory(self):
+        """Estimate the peak memory (bytes) needed to run the task.
+
+        The estimate is based on the size of the input data and the planned
+        preprocessor steps. Products are processed one after another, unless
+        a multi-model step is applied, in which case the data of all products
+        is kept in memory at the same time. The data of products where all
+        steps keep the data lazy is never loaded into memory completely.
+        """
+        steps = {
+            step
+            for product in self.products for step in product.settings
+        }
+        factor = max(
+            (STEP_MEMORY_FACTOR.get(step, DEFAULT_STEP_MEMORY_FACTOR)
+             for step in steps),
+            default=DEFAULT_STEP_MEMORY_FACTOR,
+        )
+        sizes = [product.estimate_data_size() for product in self.products]
+        if steps & set(MULTI_MODEL_FUNCTIONS):
+            data_size = sum(sizes)
+        else:
+            sizes = [
+                min(size, STREAMING_MEMORY)
+                if product.keeps_data_lazy() else size
+                for size, product in zip(sizes, self.products)
+            ]
+            data_size = max(sizes, default=0)
+        return PROCESS_MEMORY + factor * data_size
+
+    def get_fingerprint(self):
+        """Compute a fingerprint of the task.
+
+        The fingerprint is computed from the input files (path, size and
+        modification time), the preprocessor settings and the attributes of
+        all products, but not from the location of the output files. Tasks
+        with the same fingerprint produce the same output.
+
+        Returns
+        -------
+        str
+            The fingerprint.
+        """
+        products = [
+            _describe_product(product, self.order) for product in self.products
+        ]
+        products.sort(key=json.dumps)
+        return get_hash([__version__, products])
 
     def _initialize_product_provenance(self):
         """Initialize product provenance."""
@@ -576,34 +855,86 @@ class PreprocessingTask(BaseTask):
         for product in products:
             product.initialize_provenance(self.activity)
 
+    def _restore_from_cache(self, steps):
+        """Restore products from the cache.
+
+        Only tasks without multi-model steps are cached, because the
+        products of those depend on each other.
+
+        Returns
+        -------
+        tuple[dict, set]
+            The cache keys of the products and the restored products.
+        """
+        if (self.cache is None or self.debug
+                or steps & set(MULTI_MODEL_FUNCTIONS)):
+            return {}, set()
+        keys = {
+            product: self.cache.get_key(product, self.order)
+            for product in self.products
+        }
+        restored = set()
+        for product, key in keys.items():
+            if self.cache.restore(product, key):
+                # Replace the provenance of the run that stored the file
+                product.save_provenance()
+                restored.add(product)
+        return keys, restored
+
     def _run(self, _):
         """Run the preprocessor."""
+        fingerprint = self.get_fingerprint()
         self._initialize_product_provenance()
 
         steps = {
             step
             for product in self.products for step in product.settings
         }
+        cache_keys, restored = self._restore_from_cache(steps)
+        profiler = None
+        if self.profile_dir is not None:
+            profiler = PreprocessorProfiler(self.name)
+            for product in self.products:
+                product.profiler = profiler
         blocks = get_step_blocks(steps, self.order)
+        multimodel = False
         for block in blocks:
             logger.debug("Running block %s", block)
             if block[0] in MULTI_MODEL_FUNCTIONS:
+                multimodel = True
                 for step in block:
-                    self.products = _apply_multimodel(self.products, step,
-                                                      self.debug)
-            else:
+                    if profiler is None:
+                        context = contextlib.nullcontext()
+                    else:
+                        context = profiler.profile('all products', step)
+                    with context:
+                        self.products = _apply_multimodel(
+                            self.products, step, self.debug)
                 for product in self.products:
+                    product.profiler = profiler
+            else:
+                for product in self.products - restored:
                     logger.debug("Applying single-model steps to %s", product)
                     for step in block:
                         if step in product.settings:
                             product.apply(step, self.debug)
-                    if block == blocks[-1]:
+                    if block == blocks[-1] and not multimodel:
                         product.close()
 
-        for product in self.products:
-            product.close()
+        _close_together(self.products)
+        for product, key in cache_keys.items():
+            if product not in restored:
+                self.cache.store(product, key)
+        if profiler is not None:
+            profiler.save(Path(self.profile_dir) / f"{self.name}.json")
         metadata_files = write_metadata(self.products,
                                         self.write_ncl_interface)
+        # The fingerprints are stored in every run, so that any run can be
+        # resumed from later.
+        for output_dir in {os.path.dirname(f) for f in metadata_files}:
+            fingerprint_file = os.path.join(output_dir, FINGERPRINT_FILE)
+            with open(fingerprint_file, 'w') as file:
+                file.write(f"{self.recipe_fingerprint or ''}\n{fingerprint}\n")
         return metadata_files
 
     def __str__(self):
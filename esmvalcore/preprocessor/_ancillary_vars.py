@@ -6,7 +6,7 @@ import dask.array as da
 import iris
 
 from esmvalcore.cmor.check import cmor_check_data, cmor_check_metadata
-from esmvalcore.cmor.fix import fix_data, fix_metadata
+from esmvalcore.cmor.fix import fix_data, fix_dataset_metadata, fix_metadata
 from esmvalcore.preprocessor._io import concatenate, concatenate_callback, load
 
 logger = logging.getLogger(__name__)
@@ -29,6 +29,7 @@ def _load_fx(var_cube, fx_info, check_level):
         fx_cubes.append(loaded_cube[0])
 
     fx_cube = concatenate(fx_cubes)
+    fx_cube = fix_dataset_metadata(fx_cube, **fx_info)
 
     if not _is_fx_broadcastable(fx_cube, var_cube):
         return None
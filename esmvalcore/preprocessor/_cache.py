@@ -0,0 +1,251 @@
+"""Cache of preprocessor output files that is shared between runs."""
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+
+from .._provenance import TrackedFile
+from .._version import __version__
+
+logger = logging.getLogger(__name__)
+
+# Settings that only determine where files are written, not their content
+IGNORED_SETTINGS = {
+    'cleanup': ('remove', ),
+    'fix_file': ('output_dir', ),
+    'save': ('filename', 'max_memory'),
+}
+
+
+def _copy(source, target):
+    """Copy a file or a directory, e.g. a Zarr store, to `target`.
+
+    Files are copied instead of linked, so writing to the files at `target`
+    does not change the files at `source`.
+    """
+    Path(target).parent.mkdir(parents=True, exist_ok=True)
+    if os.path.isdir(source):
+        shutil.copytree(source, target, dirs_exist_ok=True)
+    else:
+        shutil.copy2(source, target)
+
+
+def _get_size(path):
+    """Get the size of a file or of all files in a directory."""
+    if not path.is_dir():
+        return path.stat().st_size
+    return sum(p.stat().st_size for p in path.rglob('*') if p.is_file())
+
+
+def _remove(path):
+    """Remove a file or a directory."""
+    if path.is_dir():
+        shutil.rmtree(path)
+    else:
+        path.unlink()
+
+
+def _get_checksum(filename):
+    """Compute the checksum of the content of a file."""
+    checksum = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        for block in iter(lambda: file.read(2**20), b''):
+            checksum.update(block)
+    return checksum.hexdigest()
+
+
+def get_file_fingerprint(filename):
+    """Identify a file by its path, size and modification time."""
+    filename = os.path.abspath(filename)
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        # The file will be downloaded later
+        return [filename]
+    return [filename, stat.st_size, stat.st_mtime_ns]
+
+
+def _canonicalize(value, get_fingerprint):
+    """Convert settings to a JSON-serializable value for hashing."""
+    if isinstance(value, dict):
+        return [[str(k), _canonicalize(v, get_fingerprint)]
+                for k, v in sorted(value.items(), key=lambda i: str(i[0]))]
+    if isinstance(value, (list, tuple)):
+        return [_canonicalize(v, get_fingerprint) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonicalize(v, get_fingerprint) for v in value),
+                      key=repr)
+    if isinstance(value, TrackedFile):
+        # Output products of multi-model steps are described by their
+        # attributes, because their filename depends on the output directory
+        attributes = {
+            k: v
+            for k, v in value.attributes.items() if k != 'filename'
+        }
+        return _canonicalize(attributes, get_fingerprint)
+    if (isinstance(value, (str, Path)) and os.path.isabs(value)
+            and os.path.isfile(value)):
+        return get_fingerprint(value)
+    if isinstance(value, (bool, int, float, str)) or value is None:
+        return value
+    return repr(value)
+
+
+def describe_product(product, order, get_fingerprint=get_file_fingerprint):
+    """Describe the input files and preprocessor settings of a product.
+
+    Settings that only determine where output files are written are left
+    out, so the description does not depend on the output directory of the
+    run.
+
+    Parameters
+    ----------
+    product: esmvalcore.preprocessor.PreprocessorFile
+        The product.
+    order: list
+        The order in which the preprocessor steps are applied.
+    get_fingerprint: callable
+        Function that identifies an input file, given its path.
+
+    Returns
+    -------
+    list
+        A JSON-serializable description of the product.
+    """
+    steps = []
+    for step in order:
+        if step not in product.settings:
+            continue
+        settings = {
+            k: v
+            for k, v in product.settings[step].items()
+            if k not in IGNORED_SETTINGS.get(step, ())
+        }
+        steps.append([step, _canonicalize(settings, get_fingerprint)])
+    input_files = [get_fingerprint(f) for f in product._input_files]
+    return [input_files, steps]
+
+
+def get_hash(description):
+    """Compute the hash of a JSON-serializable description."""
+    text = json.dumps(description, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class PreprocessorCache:
+    """Cache of preprocessor output files, shared between recipe runs.
+
+    Output files are stored under a key computed from the input files (path,
+    size and modification time), the preprocessor settings in the order in
+    which they are applied, and the ESMValCore version. When the total size
+    of the cache exceeds `max_size`, the least recently used files are
+    removed.
+
+    Parameters
+    ----------
+    directory: str
+        Directory where the cached files are stored.
+    max_size: float
+        Maximum total size (GB) of the cached files.
+    preproc_dir: str
+        Preprocessor output directory of the current run. Input files in this
+        directory were created by other tasks of the run, so they are
+        identified by their checksum instead of their modification time.
+    """
+
+    def __init__(self, directory, max_size, preproc_dir):
+        self.directory = Path(directory)
+        self.max_size = int(max_size * 2**30)
+        self.preproc_dir = str(preproc_dir)
+
+    def _get_fingerprint(self, filename):
+        """Identify the content of a file."""
+        filename = os.path.abspath(filename)
+        if filename.startswith(self.preproc_dir + os.sep):
+            return ['sha256', _get_checksum(filename)]
+        return get_file_fingerprint(filename)
+
+    def get_key(self, product, order):
+        """Compute the key of a product.
+
+        Parameters
+        ----------
+        product: esmvalcore.preprocessor.PreprocessorFile
+            The product.
+        order: list
+            The order in which the preprocessor steps are applied.
+
+        Returns
+        -------
+        str
+            The key.
+        """
+        description = [
+            __version__,
+            describe_product(product, order, self._get_fingerprint),
+        ]
+        return get_hash(description)
+
+    def _get_path(self, key, filename):
+        """Return the path where a file with `key` is stored."""
+        extension = os.path.splitext(filename)[1]
+        return self.directory / key[:2] / f"{key}{extension}"
+
+    def restore(self, product, key):
+        """Restore the output file of a product from the cache.
+
+        Returns
+        -------
+        bool
+            `True` if the file was found in the cache, `False` otherwise.
+        """
+        path = self._get_path(key, product.filename)
+        try:
+            # Mark the file as recently used
+            os.utime(path)
+            _copy(path, product.filename)
+        except FileNotFoundError:
+            return False
+        logger.info("Using cached file %s for %s", path, product.filename)
+        return True
+
+    def store(self, product, key):
+        """Store the output file of a product in the cache."""
+        path = self._get_path(key, product.filename)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        _copy(product.filename, tmp_path)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            # A directory with the same content was stored by another process
+            _remove(tmp_path)
+        os.utime(path)
+        logger.debug("Stored %s in cache as %s", product.filename, path)
+        self._evict()
+
+    def _evict(self):
+        """Remove the least recently used files if the cache is too large."""
+        entries = []
+        for path in self.directory.glob('*/*'):
+            if path.name.endswith('.tmp'):
+                continue
+            try:
+                entries.append((path.stat().st_mtime, _get_size(path), path))
+            except FileNotFoundError:
+                # Removed by another process
+                continue
+
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in sorted(entries, key=lambda e: e[0]):
+            if size <= self.max_size:
+                break
+            logger.debug("Removing least recently used file %s from cache",
+                         path)
+            try:
+                _remove(path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
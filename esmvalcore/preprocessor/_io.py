@@ -1,24 +1,49 @@
 """Functions for loading and saving cubes."""
+import contextlib
 import copy
+import functools
+import inspect
 import logging
 import os
 import shutil
+import threading
 from itertools import groupby
-from warnings import catch_warnings, filterwarnings
+from warnings import catch_warnings, filterwarnings, warn
 
+import dask
+import dask.array as da
 import iris
 import iris.aux_factory
 import iris.exceptions
+import iris.fileformats.netcdf
 import numpy as np
 import yaml
+from dask.base import collections_to_dsk, get_scheduler
+from dask.core import flatten, get_deps, quote, toposort
+from dask.optimization import cull
+from netCDF4 import Dataset, default_fillvals
 
+from .._data_finder import get_file_metadata
 from .._task import write_ncl_settings
-from ._time import extract_time
+from ..cmor._fixes.attribute_patches import apply_attribute_patches
 
 logger = logging.getLogger(__name__)
 
 GLOBAL_FILL_VALUE = 1e+20
 
+# Files that are saved together, see :func:`_save_together`
+_SAVE_GROUP = threading.local()
+
+# Supported output formats and the extension of the corresponding files
+OUTPUT_FORMATS = {
+    'netcdf': '.nc',
+    'zarr': '.zarr',
+}
+
+# Estimated peak memory used to compute a region of lazy data while saving,
+# relative to the size of the region
+SAVE_MEMORY_FACTOR = 4
+
 DATASET_KEYS = {
     'mip',
 }
@@ -110,8 +135,57 @@ def _delete_attributes(iris_object, atts):
             del iris_object.attributes[att]
 
 
+def _get_data_size(filename, short_name=None):
+    """Estimate the size (bytes) of the data in a file once it is loaded.
+
+    See :func:`_read_data_size`, the result is stored in the file index if
+    one is used.
+    """
+    return get_file_metadata(
+        filename,
+        f'data_size {short_name}',
+        functools.partial(_read_data_size, short_name=short_name),
+    )
+
+
+def _read_data_size(filename, short_name=None):
+    """Estimate the size (bytes) of the data in a file once it is loaded.
+
+    The size is computed from the shape and data type of variable
+    `short_name` in the file header, or from the largest variable if there
+    is no variable with that name. Packed data is unpacked to float64 when
+    it is loaded. If the file cannot be read as NetCDF, its size on disk is
+    used.
+    """
+    try:
+        with Dataset(filename, 'r') as dataset:
+            variables = [
+                var for var in dataset.variables.values()
+                if isinstance(var.dtype, np.dtype)
+            ]
+            if short_name in dataset.variables:
+                variables = [dataset.variables[short_name]]
+            if not variables:
+                return 0
+            var = max(variables, key=lambda v: v.size)
+            itemsize = var.dtype.itemsize
+            if {'scale_factor', 'add_offset'} & set(var.ncattrs()):
+                itemsize = np.dtype(np.float64).itemsize
+            return var.size * itemsize
+    except OSError:
+        try:
+            return os.path.getsize(filename)
+        except OSError:
+            return 0
+
+
 def load(file, callback=None):
-    """Load iris cubes from files."""
+    """Load iris cubes from files.
+
+    If `file` carries patches of its attributes, see
+    :func:`esmvalcore.cmor.fix.fix_file`, they are applied to the loaded
+    cubes.
+    """
     logger.debug("Loading:\n%s", file)
     with catch_warnings():
         filterwarnings(
@@ -130,8 +204,11 @@ def load(file, callback=None):
     logger.debug("Done with loading %s", file)
     if not raw_cubes:
         raise Exception('Can not load cubes from {0}'.format(file))
+    patches = getattr(file, 'patches', None)
+    if patches:
+        apply_attribute_patches(raw_cubes, file, patches)
     for cube in raw_cubes:
-        cube.attributes['source_file'] = file
+        cube.attributes['source_file'] = str(file)
     return raw_cubes
 
 
@@ -150,19 +227,6 @@ def _fix_cube_attributes(cubes):
         cube.attributes = attributes
 
 
-def _by_two_concatenation(cubes):
-    """Perform a by-2 concatenation to avoid gaps."""
-    concatenated = iris.cube.CubeList(cubes).concatenate()
-    if len(concatenated) == 1:
-        return concatenated[0]
-
-    concatenated = _concatenate_overlapping_cubes(concatenated)
-    if len(concatenated) == 2:
-        _get_concatenation_error(concatenated)
-    else:
-        return concatenated[0]
-
-
 def _get_concatenation_error(cubes):
     """Raise an error for concatenation."""
     # Concatenation not successful -> retrieve exact error message
@@ -180,8 +244,111 @@ def _get_concatenation_error(cubes):
     raise ValueError(f'Can not concatenate cubes: {msg}')
 
 
+def _get_time_slice(cube, stop):
+    """Select the time points before index `stop` from a cube."""
+    index = [slice(None)] * cube.ndim
+    index[cube.coord_dims('time')[0]] = slice(None, stop)
+    return cube[tuple(index)]
+
+
+def _check_time_units(cube1, cube2):
+    """Check that the time coordinates of two cubes have the same units."""
+    time_1 = cube1.coord('time')
+    time_2 = cube2.coord('time')
+    if time_1.units != time_2.units:
+        raise ValueError(
+            f"Cubes\n{cube1}\nand\n{cube2}\ncan not be concatenated: "
+            f"time units {time_1.units}, calendar {time_1.units.calendar} "
+            f"and {time_2.units}, calendar {time_2.units.calendar} differ")
+
+
+def _get_first_overlap(pieces, points):
+    """Find the first time point of `pieces` that is also in `points`.
+
+    Parameters
+    ----------
+    pieces: list of tuple
+        Non-overlapping pieces ``(cube, time_points)``, sorted by time.
+    points: np.ndarray
+        Time points, sorted in ascending order.
+
+    Returns
+    -------
+    tuple of int or None
+        The index of the piece and the index of the time point in that
+        piece, or `None` if there is no common time point.
+    """
+    # Only the last few pieces can end after the start of `points`
+    first = len(pieces)
+    while first > 0 and pieces[first - 1][1][-1] >= points[0]:
+        first -= 1
+    for i in range(first, len(pieces)):
+        piece_points = pieces[i][1]
+        start = np.searchsorted(piece_points, points[0])
+        common = np.isin(piece_points[start:], points)
+        if common.any():
+            return i, start + int(np.argmax(common))
+    return None
+
+
+def _resolve_overlaps(cubes):
+    """Select the parts of cubes sorted by start time that do not overlap.
+
+    Where cubes overlap in time, the data from the cube that starts later is
+    used, unless it lies within the preceding cubes entirely. If a cube
+    starts at the same time as the first cube, only the cube that ends last
+    is used. Overlaps are found from the time coordinates alone, so the data
+    is not realized.
+    """
+    pieces = []
+    for cube in cubes:
+        points = cube.coord('time').points
+        if not pieces:
+            pieces.append((cube, points))
+            continue
+        _check_time_units(pieces[-1][0], cube)
+        end = pieces[-1][1][-1]
+        if points[0] > end:
+            pieces.append((cube, points))
+        elif points[0] == pieces[0][1][0]:
+            if end <= points[-1]:
+                logger.debug("Cube %s contains all needed data so using it "
+                             "fully", cube)
+                pieces = [(cube, points)]
+            else:
+                logger.debug("Using only data from preceding cubes instead "
+                             "of %s", cube)
+        else:
+            overlap = _get_first_overlap(pieces, points)
+            if overlap is None:
+                logger.debug(
+                    "Unable to concatenate cube %s overlapping preceding "
+                    "cubes without common time points", cube)
+                pieces.append((cube, points))
+            elif end > points[-1]:
+                logger.debug("Using only data from preceding cubes instead "
+                             "of %s", cube)
+            else:
+                i, stop = overlap
+                logger.debug(
+                    "Using data from %s from time point %s onwards", cube,
+                    pieces[i][0].coord('time').cell(stop).point)
+                head = pieces[i]
+                pieces = pieces[:i]
+                if stop > 0:
+                    pieces.append((_get_time_slice(head[0], stop),
+                                   head[1][:stop]))
+                pieces.append((cube, points))
+    return [cube for cube, _ in pieces]
+
+
 def concatenate(cubes):
-    """Concatenate all cubes after fixing metadata."""
+    """Concatenate all cubes after fixing metadata.
+
+    Cubes that overlap in time are cut so they no longer overlap, see
+    :func:`_resolve_overlaps`, and all resulting cubes are concatenated at
+    once.
+    """
     if not cubes:
         return cubes
     if len(cubes) == 1:
@@ -189,31 +356,501 @@ def concatenate(cubes):
 
     _fix_cube_attributes(cubes)
 
-    if len(cubes) > 1:
-        # order cubes by first time point
-        try:
-            cubes = sorted(cubes, key=lambda c: c.coord("time").cell(0).point)
-        except iris.exceptions.CoordinateNotFoundError as exc:
-            msg = "One or more cubes {} are missing".format(cubes) + \
-                  " time coordinate: {}".format(str(exc))
-            raise ValueError(msg)
+    # order cubes by first time point
+    try:
+        cubes = sorted(cubes, key=lambda c: c.coord("time").cell(0).point)
+    except iris.exceptions.CoordinateNotFoundError as exc:
+        msg = "One or more cubes {} are missing".format(cubes) + \
+              " time coordinate: {}".format(str(exc))
+        raise ValueError(msg)
 
-        # iteratively concatenate starting with first cube
-        result = cubes[0]
-        for cube in cubes[1:]:
-            result = _by_two_concatenation([result, cube])
+    cubes = _resolve_overlaps(cubes)
+    concatenated = iris.cube.CubeList(cubes).concatenate()
+    if len(concatenated) > 1:
+        _get_concatenation_error(concatenated)
+    result = concatenated[0]
 
     _fix_aux_factories(result)
 
     return result
 
 
+def _deferred_save_supported():
+    """Check if :class:`_DeferredSaver` works with the installed iris.
+
+    It overrides a private method of :class:`iris.fileformats.netcdf.Saver`
+    whose signature has changed in later iris versions.
+    """
+    method = getattr(iris.fileformats.netcdf.Saver, '_lazy_stream_data',
+                     None)
+    if method is None:
+        return False
+    parameters = list(inspect.signature(method).parameters)
+    return parameters == ['data', 'fill_value', 'fill_warn', 'cf_var']
+
+
+class _DeferredSaver(iris.fileformats.netcdf.Saver):
+    """NetCDF saver that collects lazy data instead of writing it.
+
+    The collected data is computed and written by :func:`_store_lazy_data`,
+    so results shared between the variables are only computed once.
+    """
+
+    def __init__(self, filename, netcdf_format):
+        super().__init__(filename, netcdf_format)
+        self.sources = []
+        self.targets = []
+
+    def _lazy_stream_data(self, data, fill_value, fill_warn, cf_var):
+        if not isinstance(data, da.Array):
+            super()._lazy_stream_data(data=data,
+                                      fill_value=fill_value,
+                                      fill_warn=fill_warn,
+                                      cf_var=cf_var)
+            return
+        if data.shape == (1, ) + cf_var.shape:
+            # Like iris, drop the extra dimension of the bounds of scalar
+            # coordinates, which are stored in a 1D variable
+            data = data.squeeze(axis=0)
+        self.sources.append(data)
+        self.targets.append(_CheckedTarget(cf_var, fill_value, fill_warn))
+
+
+class _CheckedTarget:
+    """Variable that lazy data is written to in regions.
+
+    Like :mod:`iris`, it warns when the data cannot be read back as it was
+    written, because it contains the fill value or masked byte data.
+    """
+
+    def __init__(self, cf_var, fill_value, fill_warn):
+        self.cf_var = cf_var
+        self.fill_value = fill_value
+        self.check_value = None
+        if fill_warn:
+            self.check_value = fill_value
+            if fill_value is None:
+                self.check_value = default_fillvals[cf_var.dtype.str[1:]]
+        self.contains_value = False
+        self.is_masked = False
+
+    def __setitem__(self, keys, value):
+        if self.check_value is not None:
+            self.contains_value = (self.contains_value
+                                   or self.check_value in value)
+        self.is_masked = self.is_masked or np.ma.is_masked(value)
+        self.cf_var[keys] = value
+
+    def warn(self):
+        """Warn if the data will not be read back as it was written."""
+        name = self.cf_var.name
+        if self.cf_var.dtype.itemsize == 1 and self.fill_value is None:
+            if self.is_masked:
+                warn(
+                    f"CF var '{name}' contains byte data with masked points, "
+                    "but no fill_value keyword was given. As saved, these "
+                    "points will read back as valid values.")
+        elif self.contains_value:
+            warn(
+                f"CF var '{name}' contains unmasked data points equal to "
+                f"the fill-value, {self.check_value}. As saved, these points "
+                "will read back as missing data.")
+
+
+_DEFERRED_SAVE = _deferred_save_supported()
+
+
+def _save_netcdf(cubes, filename, netcdf_format='NETCDF4', local_keys=None,
+                 **kwargs):
+    """Write cubes to a NetCDF file, except for their lazy data.
+
+    Like :func:`iris.fileformats.netcdf.save`, attributes that differ
+    between the cubes are stored as attributes of the variables. The file is
+    kept open until the lazy data has been written by
+    :func:`_store_lazy_data`.
+    """
+    local_keys = set(local_keys or ())
+    attributes = cubes[0].attributes
+    for cube in cubes[1:]:
+        local_keys.update(
+            key for key in set(attributes) | set(cube.attributes)
+            if key not in attributes or key not in cube.attributes
+            or np.any(attributes[key] != cube.attributes[key]))
+    saver = _DeferredSaver(filename, netcdf_format)
+    try:
+        for cube in cubes:
+            saver.write(cube, local_keys=local_keys, **kwargs)
+        saver.update_global_attributes(
+            Conventions=iris.fileformats.netcdf.CF_CONVENTIONS_VERSION)
+    except Exception:
+        saver.__exit__(None, None, None)
+        raise
+    return saver
+
+
+def _get_save_regions(data, max_bytes):
+    """Get the chunks along the first dimension of regions to save at once.
+
+    The regions span all other dimensions and are as large as possible while
+    staying below `max_bytes`. Where possible, the region boundaries match
+    the chunk boundaries of `data`, so no chunk is computed twice.
+    """
+    length = data.shape[0]
+    slab_bytes = max(data.dtype.itemsize * np.prod(data.shape[1:]), 1)
+    max_length = max(int(max_bytes // slab_bytes), 1)
+    regions = []
+    size = 0
+    for chunk in data.chunks[0]:
+        if size and size + chunk > max_length:
+            regions.append(size)
+            size = 0
+        while chunk > max_length:
+            regions.append(max_length)
+            chunk -= max_length
+        size += chunk
+    if size or not length:
+        regions.append(size)
+    return tuple(regions)
+
+
+def _get_array_bytes(graph, key):
+    """Get the size of the array that a task computes a chunk of."""
+    name = key[0] if isinstance(key, tuple) else key
+    layer = graph.layers.get(name)
+    info = layer.collection_annotations if layer is not None else None
+    if not info or 'shape' not in info:
+        return None
+    return int(np.prod(info['shape'])) * np.dtype(info['dtype']).itemsize
+
+
+def _persist_shared_results(sources, max_bytes):
+    """Compute small results that are used by several chunks of `sources`.
+
+    Such results, e.g. the climatology that is subtracted from each time
+    step to compute anomalies, are computed first and put into the graph of
+    the returned arrays. Afterwards, the chunks of the returned arrays can
+    be computed one after another without holding on to the input data that
+    is needed to compute the shared results. Only results that are part of
+    an array of at most `max_bytes` are computed in advance.
+    """
+    hlg = collections_to_dsk(sources, optimize_graph=False)
+    outputs = {
+        key
+        for source in sources for key in flatten(source.__dask_keys__())
+    }
+    graph = cull(dict(hlg), list(outputs))[0]
+    dependencies, dependents = get_deps(graph)
+
+    # Find the output chunk that each task is used for, or None if it is
+    # used for several of them.
+    owner = {}
+    for key in reversed(toposort(graph, dependencies=dependencies)):
+        if key in outputs:
+            owner[key] = key
+        else:
+            owners = {owner[dependent] for dependent in dependents[key]}
+            owner[key] = owners.pop() if len(owners) == 1 else None
+    shared = []
+    for key in graph:
+        if owner[key] is None and dependencies[key]:
+            array_bytes = _get_array_bytes(hlg, key)
+            if array_bytes is not None and array_bytes <= max_bytes:
+                shared.append(key)
+    if not shared:
+        return sources
+
+    logger.debug("Computing %s results shared between regions", len(shared))
+    scheduler = get_scheduler(collections=sources)
+    values = scheduler(cull(graph, shared)[0], shared)
+    for key, value in zip(shared, values):
+        graph[key] = quote(value)
+    return [
+        da.Array(graph, source.name, source.chunks, meta=source._meta)
+        for source in sources
+    ]
+
+
+def _split_regions(data):
+    """Split data into its chunks along the first dimension."""
+    if not data.ndim:
+        return [(Ellipsis, data)]
+    regions = []
+    start = 0
+    for index, size in enumerate(data.chunks[0]):
+        regions.append((slice(start, start + size), data.blocks[index]))
+        start += size
+    return regions
+
+
+def _store_lazy_data(savers, max_memory):
+    """Compute and write the lazy data collected by savers and close them.
+
+    The data is computed in regions along the first dimension, such that
+    the regions of all variables together fit within `max_memory` (GB). The
+    regions are computed one after another, while each region is computed
+    in parallel. The regions consist of whole Dask chunks where possible,
+    and results that are needed for several regions, like a climatology, are
+    computed once beforehand.
+    """
+    sources = [source for saver in savers for source in saver.sources]
+    targets = [target for saver in savers for target in saver.targets]
+    try:
+        if not sources:
+            return
+        max_bytes = max_memory * 2**30 / SAVE_MEMORY_FACTOR / len(sources)
+        sources = [
+            source.rechunk((_get_save_regions(source, max_bytes), ) +
+                           source.shape[1:]) if source.ndim else source
+            for source in sources
+        ]
+        sources = _persist_shared_results(sources, max_bytes)
+
+        # Compute the n-th region of all variables together, so results
+        # shared between the variables are computed only once.
+        regions = [_split_regions(source) for source in sources]
+        for index in range(max(len(r) for r in regions)):
+            batch = [(target, source_regions[index])
+                     for target, source_regions in zip(targets, regions)
+                     if index < len(source_regions)]
+            values = dask.compute(*[block for _, (_, block) in batch])
+            for (target, (region, _)), value in zip(batch, values):
+                target[region] = value
+            del values, value
+        for target in targets:
+            target.warn()
+    finally:
+        for saver in savers:
+            saver.__exit__(None, None, None)
+
+
+@contextlib.contextmanager
+def _save_together():
+    """Write the lazy data of all files saved in this context together.
+
+    The NetCDF files that are saved with a `max_memory` are written when
+    the context is left, with the smallest `max_memory` given to
+    :func:`save`. This reads input data that is shared between the files,
+    e.g. the input of multi-model statistics, only once.
+    """
+    group = {'savers': [], 'stores': [], 'max_memory': None}
+    _SAVE_GROUP.group = group
+    try:
+        yield
+    except BaseException:
+        for saver in group['savers']:
+            saver.__exit__(None, None, None)
+        raise
+    finally:
+        _SAVE_GROUP.group = None
+    dask.compute(*group['stores'])
+    if group['savers']:
+        _store_lazy_data(group['savers'], group['max_memory'])
+
+
+def _get_chunksizes(cube, optimize_access):
+    """Get the NetCDF chunk sizes favouring a reading scheme."""
+    if optimize_access == 'map':
+        dims = set(cube.coord_dims('latitude') + cube.coord_dims('longitude'))
+    elif optimize_access == 'timeseries':
+        dims = set(cube.coord_dims('time'))
+    else:
+        dims = tuple()
+        for coord_dims in (cube.coord_dims(dimension)
+                           for dimension in optimize_access.split(' ')):
+            dims += coord_dims
+        dims = set(dims)
+
+    return tuple(length if index in dims else 1
+                 for index, length in enumerate(cube.shape))
+
+
+def _get_zarr_chunks(cube, optimize_access):
+    """Get regular Zarr chunk sizes favouring a reading scheme.
+
+    Dimensions that are not read at once get the largest chunk size that
+    keeps chunks below the Dask chunk size limit, because each Zarr chunk is
+    stored as a separate object.
+    """
+    if optimize_access:
+        chunks = tuple(
+            size if size == length else 'auto'
+            for size, length in zip(_get_chunksizes(cube, optimize_access),
+                                    cube.shape))
+    else:
+        chunks = 'auto'
+    chunks = da.core.normalize_chunks(chunks, cube.shape, dtype=cube.dtype)
+    return tuple(c[0] if c else 0 for c in chunks)
+
+
+def _get_cf_attributes(item):
+    """Get the CF attributes of a cube, coordinate or other variable."""
+    attributes = {}
+    for name in ('standard_name', 'long_name'):
+        if getattr(item, name, None):
+            attributes[name] = getattr(item, name)
+    units = getattr(item, 'units', None)
+    if units is not None and not units.is_unknown() and not units.is_no_unit():
+        attributes['units'] = str(units)
+        if units.calendar:
+            attributes['calendar'] = units.calendar
+    attributes.update(item.attributes)
+    return attributes
+
+
+def _format_cell_method(cell_method):
+    """Get the CF representation of a cell method."""
+    names = ' '.join(f'{name}:' for name in cell_method.coord_names)
+    extra = [f'interval: {i}' for i in cell_method.intervals]
+    extra.extend(f'comment: {c}' for c in cell_method.comments)
+    text = f'{names} {cell_method.method}'
+    if extra:
+        text += f" ({' '.join(extra)})"
+    return text
+
+
+def _get_dimension_names(cube):
+    """Get the names of the dimensions of a cube."""
+    names = []
+    for dim in range(cube.ndim):
+        coords = cube.coords(dimensions=dim, dim_coords=True)
+        if coords:
+            names.append(coords[0].var_name or coords[0].name())
+        else:
+            names.append(f'dim{dim}')
+    return names
+
+
+def _cube_to_dataset(cubes, optimize_access, compress):
+    """Convert cubes to a :class:`xarray.Dataset` following CF conventions.
+
+    Unlike :meth:`xarray.DataArray.from_iris`, this keeps the bounds, the
+    units and calendars and the cell methods as they are stored in NetCDF
+    files written by :mod:`iris`.
+    """
+    # Use a local import because `ESMValCore` does not depend on `xarray`
+    import xarray as xr
+
+    attributes = [dict(cube.attributes) for cube in cubes]
+    global_attributes = {
+        k: v
+        for k, v in attributes[0].items() if all(
+            k in a and np.array_equal(a[k], v) for a in attributes[1:])
+    }
+    global_attributes['Conventions'] = 'CF-1.7'
+
+    variables = {}
+    encoding = {}
+
+    def add_variable(name, dims, values, attrs, bounds=None):
+        if bounds is not None:
+            bounds_dim = 'bnds' if bounds.shape[-1] == 2 else (
+                f'bnds{bounds.shape[-1]}')
+            attrs['bounds'] = f'{name}_bnds'
+            variables[attrs['bounds']] = xr.Variable(
+                dims + [bounds_dim], bounds)
+            encoding[attrs['bounds']] = {'_FillValue': None}
+        variables[name] = xr.Variable(dims, values, attrs)
+        encoding[name] = {'_FillValue': None}
+        return name
+
+    for cube in cubes:
+        dims = _get_dimension_names(cube)
+        data_attributes = _get_cf_attributes(cube)
+        for key in global_attributes:
+            data_attributes.pop(key, None)
+        if cube.cell_methods:
+            data_attributes['cell_methods'] = ' '.join(
+                _format_cell_method(c) for c in cube.cell_methods)
+
+        coordinates = []
+        for coord in cube.coords():
+            coord_dims = [dims[d] for d in cube.coord_dims(coord)]
+            points = coord.core_points()
+            bounds = coord.core_bounds()
+            if not coord_dims:
+                # Scalar coordinates are stored as scalar variables
+                points = points[0]
+                bounds = None if bounds is None else bounds[0]
+            name = add_variable(
+                coord.var_name or coord.name(),
+                coord_dims,
+                points,
+                _get_cf_attributes(coord),
+                bounds=bounds,
+            )
+            if name not in dims:
+                coordinates.append(name)
+        if coordinates:
+            data_attributes['coordinates'] = ' '.join(coordinates)
+
+        cell_measures = []
+        for measure in cube.cell_measures():
+            name = add_variable(
+                measure.var_name or measure.name(),
+                [dims[d] for d in cube.cell_measure_dims(measure)],
+                measure.core_data(),
+                _get_cf_attributes(measure),
+            )
+            cell_measures.append(f'{measure.measure}: {name}')
+        if cell_measures:
+            data_attributes['cell_measures'] = ' '.join(cell_measures)
+
+        ancillary_variables = []
+        for ancillary_variable in cube.ancillary_variables():
+            ancillary_variables.append(
+                add_variable(
+                    ancillary_variable.var_name or ancillary_variable.name(),
+                    [
+                        dims[d] for d in cube.ancillary_variable_dims(
+                            ancillary_variable)
+                    ],
+                    ancillary_variable.core_data(),
+                    _get_cf_attributes(ancillary_variable),
+                ))
+        if ancillary_variables:
+            data_attributes['ancillary_variables'] = ' '.join(
+                ancillary_variables)
+
+        chunks = _get_zarr_chunks(cube, optimize_access)
+        if cube.dtype.kind == 'f':
+            fill_value = cube.dtype.type(GLOBAL_FILL_VALUE)
+        else:
+            fill_value = np.ma.default_fill_value(cube.dtype)
+        if cube.has_lazy_data():
+            data = da.ma.filled(cube.core_data(), fill_value)
+            data = data.rechunk(chunks)
+        else:
+            data = np.ma.filled(cube.data, fill_value)
+        name = cube.var_name or cube.name()
+        variables[name] = xr.Variable(dims, data, data_attributes)
+        encoding[name] = {'_FillValue': fill_value, 'chunks': chunks}
+        if not compress:
+            encoding[name]['compressor'] = None
+
+    # All variables are added as data variables, so xarray does not
+    # overwrite the `coordinates` attributes set above
+    dataset = xr.Dataset(variables, attrs=global_attributes)
+    return dataset, encoding
+
+
+def _save_zarr(cubes, filename, optimize_access, compress, compute=True):
+    """Save cubes to a Zarr store."""
+    dataset, encoding = _cube_to_dataset(cubes, optimize_access, compress)
+    return dataset.to_zarr(filename,
+                           mode='w',
+                           encoding=encoding,
+                           consolidated=True,
+                           compute=compute)
+
+
 def save(cubes,
          filename,
          optimize_access='',
          compress=False,
          alias='',
-         **kwargs):
+         max_memory=None,
+         format='netcdf',
+         **kwargs):  # pylint: disable=redefined-builtin
     """Save iris cubes to file.
 
     Parameters
@@ -239,6 +876,29 @@ def save(cubes,
     alias: str, optional
         Var name to use when saving instead of the one in the cube.
 
+    max_memory: float, optional
+        Approximate maximum amount of memory (GB) used to compute and write
+        lazy data. If set, lazy data is computed and written in regions along
+        the first dimension that fit within this limit. All regions are
+        written in a single pass over the data, so results shared between
+        regions, like a climatology, are only computed once. If compression
+        is used and no `optimize_access` is given, the file is chunked per
+        slice along the first dimension, so each region consists of whole
+        chunks. By default, the cubes are saved with :func:`iris.save`.
+        Writing in regions relies on the private NetCDF saver of
+        :mod:`iris` and is only available for the supported versions,
+        otherwise this setting is ignored with a warning.
+        Zarr stores are always written one chunk at a time, so this setting
+        is not used for them.
+
+    format: str, optional
+        Output format, either ``netcdf`` or ``zarr``. A Zarr store is a
+        directory with the same CF metadata as the NetCDF file would have.
+        Its chunks are regular and favour the reading scheme given by
+        `optimize_access`, and they are compressed with the default Zarr
+        compressor if `compress` is set. Writing Zarr stores requires
+        :mod:`xarray` and :mod:`zarr`.
+
     Returns
     -------
     str
@@ -247,13 +907,16 @@ def save(cubes,
     Raises
     ------
     ValueError
-        cubes is empty.
+        cubes is empty or the format is not supported.
     """
     if not cubes:
         raise ValueError(f"Cannot save empty cubes '{cubes}'")
+    if format not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"Unknown output format '{format}', choose from: "
+            f"{', '.join(OUTPUT_FORMATS)}")
 
     # Rename some arguments
-    kwargs['target'] = filename
     kwargs['zlib'] = compress
 
     dirname = os.path.dirname(filename)
@@ -267,33 +930,44 @@ def save(cubes,
             "The cube is probably unchanged.", cubes, filename)
         return filename
 
-    logger.debug("Saving cubes %s to %s", cubes, filename)
-    if optimize_access:
-        cube = cubes[0]
-        if optimize_access == 'map':
-            dims = set(
-                cube.coord_dims('latitude') + cube.coord_dims('longitude'))
-        elif optimize_access == 'timeseries':
-            dims = set(cube.coord_dims('time'))
-        else:
-            dims = tuple()
-            for coord_dims in (cube.coord_dims(dimension)
-                               for dimension in optimize_access.split(' ')):
-                dims += coord_dims
-            dims = set(dims)
-
-        kwargs['chunksizes'] = tuple(
-            length if index in dims else 1
-            for index, length in enumerate(cube.shape))
-
-    kwargs['fill_value'] = GLOBAL_FILL_VALUE
     if alias:
-
         for cube in cubes:
             logger.debug('Changing var_name from %s to %s', cube.var_name,
                          alias)
             cube.var_name = alias
-    iris.save(cubes, **kwargs)
+
+    logger.debug("Saving cubes %s to %s", cubes, filename)
+    group = getattr(_SAVE_GROUP, 'group', None)
+    if format == 'zarr':
+        store = _save_zarr(cubes, filename, optimize_access, compress,
+                           compute=group is None)
+        if group is not None:
+            group['stores'].append(store)
+        return filename
+
+    if optimize_access:
+        kwargs['chunksizes'] = _get_chunksizes(cubes[0], optimize_access)
+    elif max_memory is not None and compress and cubes[0].ndim > 1:
+        kwargs['chunksizes'] = (1, ) + cubes[0].shape[1:]
+
+    kwargs['fill_value'] = GLOBAL_FILL_VALUE
+
+    if max_memory is not None and not _DEFERRED_SAVE:
+        logger.warning(
+            "Saving in regions is not supported with iris %s, "
+            "ignoring max_memory", iris.__version__)
+        max_memory = None
+    if max_memory is None:
+        iris.save(cubes, filename, **kwargs)
+        return filename
+
+    saver = _save_netcdf(cubes, filename, **kwargs)
+    if group is None:
+        _store_lazy_data([saver], max_memory)
+    else:
+        group['savers'].append(saver)
+        group['max_memory'] = min(max_memory, group['max_memory']
+                                  or max_memory)
 
     return filename
 
@@ -324,7 +998,12 @@ def cleanup(files, remove=None):
 
 
 def write_metadata(products, write_ncl=False):
-    """Write product metadata to file."""
+    """Write product metadata to file.
+
+    The metadata of all products in a directory is written to
+    ``metadata.yml`` in that directory, with the paths to the NetCDF files or
+    Zarr stores as keys.
+    """
     output_files = []
     for output_dir, prods in groupby(products,
                                      lambda p: os.path.dirname(p.filename)):
@@ -349,6 +1028,14 @@ def write_metadata(products, write_ncl=False):
         with open(output_filename, 'w') as file:
             yaml.safe_dump(metadata, file)
         if write_ncl:
+            zarr_stores = [
+                f for f in metadata
+                if f.endswith(OUTPUT_FORMATS['zarr'])
+            ]
+            if zarr_stores:
+                logger.warning(
+                    "NCL diagnostics cannot read the Zarr stores %s, save "
+                    "them as NetCDF files instead", ', '.join(zarr_stores))
             output_files.append(_write_ncl_metadata(output_dir, metadata))
 
     return output_files
@@ -383,95 +1070,3 @@ def _write_ncl_metadata(output_dir, metadata):
     write_ncl_settings(info, filename)
 
     return filename
-
-
-def _concatenate_overlapping_cubes(cubes):
-    """Concatenate time-overlapping cubes (two cubes only)."""
-    # we arrange [cube1, cube2] so that cube1.start <= cube2.start
-    if cubes[0].coord('time').points[0] <= cubes[1].coord('time').points[0]:
-        cubes = [cubes[0], cubes[1]]
-        logger.debug(
-            "Will attempt to concatenate cubes %s "
-            "and %s in this order", cubes[0], cubes[1])
-    else:
-        cubes = [cubes[1], cubes[0]]
-        logger.debug(
-            "Will attempt to concatenate cubes %s "
-            "and %s in this order", cubes[1], cubes[0])
-
-    # get time end points
-    time_1 = cubes[0].coord('time')
-    time_2 = cubes[1].coord('time')
-    if time_1.units != time_2.units:
-        raise ValueError(
-            f"Cubes\n{cubes[0]}\nand\n{cubes[1]}\ncan not be concatenated: "
-            f"time units {time_1.units}, calendar {time_1.units.calendar} "
-            f"and {time_2.units}, calendar {time_2.units.calendar} differ")
-    data_start_1 = time_1.cell(0).point
-    data_start_2 = time_2.cell(0).point
-    data_end_1 = time_1.cell(-1).point
-    data_end_2 = time_2.cell(-1).point
-
-    # case 1: both cubes start at the same time -> return longer cube
-    if data_start_1 == data_start_2:
-        if data_end_1 <= data_end_2:
-            logger.debug(
-                "Both cubes start at the same time but cube %s "
-                "ends before %s", cubes[0], cubes[1])
-            logger.debug("Cube %s contains all needed data so using it fully",
-                         cubes[1])
-            cubes = [cubes[1]]
-        else:
-            logger.debug(
-                "Both cubes start at the same time but cube %s "
-                "ends before %s", cubes[1], cubes[0])
-            logger.debug("Cube %s contains all needed data so using it fully",
-                         cubes[0])
-            cubes = [cubes[0]]
-
-    # case 2: cube1 starts before cube2
-    else:
-        # find time overlap, if any
-        start_overlap = next((time_1.units.num2date(t)
-                              for t in time_1.points if t in time_2.points),
-                             None)
-        # case 2.0: no overlap (new iris implementation does allow
-        # concatenation of cubes with no overlap)
-        if not start_overlap:
-            logger.debug(
-                "Unable to concatenate non-overlapping cubes\n%s\nand\n%s"
-                "separated in time.", cubes[0], cubes[1])
-        # case 2.1: cube1 ends after cube2 -> return cube1
-        elif data_end_1 > data_end_2:
-            cubes = [cubes[0]]
-            logger.debug("Using only data from %s", cubes[0])
-        # case 2.2: cube1 ends before cube2 -> use full cube2 and shorten cube1
-        else:
-            logger.debug(
-                "Extracting time slice between %s and %s from cube %s to use "
-                "it for concatenation with cube %s", "-".join([
-                    str(data_start_1.year),
-                    str(data_start_1.month),
-                    str(data_start_1.day)
-                ]), "-".join([
-                    str(start_overlap.year),
-                    str(start_overlap.month),
-                    str(start_overlap.day)
-                ]), cubes[0], cubes[1])
-            c1_delta = extract_time(cubes[0], data_start_1.year,
-                                    data_start_1.month, data_start_1.day,
-                                    start_overlap.year, start_overlap.month,
-                                    start_overlap.day)
-            cubes = iris.cube.CubeList([c1_delta, cubes[1]])
-            logger.debug("Attempting concatenatenation of %s with %s",
-                         c1_delta, cubes[1])
-            try:
-                cubes = [iris.cube.CubeList(cubes).concatenate_cube()]
-            except iris.exceptions.ConcatenateError as ex:
-                logger.error('Can not concatenate cubes: %s', ex)
-                logger.error('Cubes:')
-                for cube in cubes:
-                    logger.error(cube)
-                raise ex
-
-    return cubes
@@ -50,8 +50,18 @@ def _get_fx_mask(fx_data, fx_option, mask_type):
     return inmask
 
 
+def _get_array_module(cube):
+    """Get the module to operate on the (lazy or realized) data of a cube."""
+    return da if cube.has_lazy_data() else np
+
+
 def _apply_fx_mask(fx_mask, var_data):
     """Apply the fx data extracted mask on the actual processed data."""
+    if isinstance(var_data, da.Array):
+        # Keep the data lazy
+        fx_mask = fx_mask | da.ma.getmaskarray(var_data)
+        return da.ma.masked_array(var_data, mask=fx_mask, fill_value=1e+20)
+
     # Apply mask across
     if np.ma.is_masked(var_data):
         fx_mask |= var_data.mask
@@ -128,7 +138,7 @@ def mask_landsea(cube, mask_out, always_use_ne_mask=False):
             fx_cube_data = da.broadcast_to(fx_cube.core_data(), cube.shape)
             landsea_mask = _get_fx_mask(fx_cube_data, mask_out,
                                         fx_cube.var_name)
-            cube.data = _apply_fx_mask(landsea_mask, cube.data)
+            cube.data = _apply_fx_mask(landsea_mask, cube.core_data())
             logger.debug("Applying land-sea mask: %s", fx_cube.var_name)
         else:
             if cube.coord('longitude').points.ndim < 2:
@@ -202,7 +212,7 @@ def mask_landseaice(cube, mask_out):
     if fx_cube:
         fx_cube_data = da.broadcast_to(fx_cube.core_data(), cube.shape)
         landice_mask = _get_fx_mask(fx_cube_data, mask_out, fx_cube.var_name)
-        cube.data = _apply_fx_mask(landice_mask, cube.data)
+        cube.data = _apply_fx_mask(landice_mask, cube.core_data())
         logger.debug("Applying landsea-ice mask: sftgif")
     else:
         msg = "Landsea-ice mask could not be found. Stopping. "
@@ -331,7 +341,11 @@ def _mask_with_shp(cube, shapefilename, region_indices=None):
             mask[:, :] = shp_vect.contains(region, x_p_180, y_p_90)
 
         # Then apply the mask
-        if isinstance(cube.data, np.ma.MaskedArray):
+        if cube.has_lazy_data():
+            data = cube.core_data()
+            cube.data = da.ma.masked_array(
+                data, mask=da.ma.getmaskarray(data) | mask)
+        elif isinstance(cube.data, np.ma.MaskedArray):
             cube.data.mask |= mask
         else:
             cube.data = np.ma.masked_array(cube.data, mask)
@@ -416,7 +430,9 @@ def mask_above_threshold(cube, threshold):
     iris.cube.Cube
         thresholded cube.
     """
-    cube.data = np.ma.masked_where(cube.data > threshold, cube.data)
+    npx = _get_array_module(cube)
+    data = cube.core_data()
+    cube.data = npx.ma.masked_where(data > threshold, data)
     return cube
 
 
@@ -438,7 +454,9 @@ def mask_below_threshold(cube, threshold):
     iris.cube.Cube
         thresholded cube.
     """
-    cube.data = np.ma.masked_where(cube.data < threshold, cube.data)
+    npx = _get_array_module(cube)
+    data = cube.core_data()
+    cube.data = npx.ma.masked_where(data < threshold, data)
     return cube
 
 
@@ -462,7 +480,9 @@ def mask_inside_range(cube, minimum, maximum):
     iris.cube.Cube
         thresholded cube.
     """
-    cube.data = np.ma.masked_inside(cube.data, minimum, maximum)
+    npx = _get_array_module(cube)
+    data = cube.core_data()
+    cube.data = npx.ma.masked_inside(data, minimum, maximum)
     return cube
 
 
@@ -486,7 +506,9 @@ def mask_outside_range(cube, minimum, maximum):
     iris.cube.Cube
         thresholded cube.
     """
-    cube.data = np.ma.masked_outside(cube.data, minimum, maximum)
+    npx = _get_array_module(cube)
+    data = cube.core_data()
+    cube.data = npx.ma.masked_outside(data, minimum, maximum)
     return cube
 
 
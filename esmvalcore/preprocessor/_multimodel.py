@@ -7,18 +7,24 @@ Wrapper functions separate esmvalcore internals, operating on products, from
 generalized functions that operate on iris cubes. These wrappers support
 grouped execution by passing a groupby keyword.
 """
+import copy
 import logging
 import re
 import warnings
 from datetime import datetime
-from functools import reduce
+from functools import partial
+from typing import Callable
 
 import cf_units
+import dask.array as da
 import iris
 import iris.coord_categorisation
 import numpy as np
+from dask.base import tokenize
+from dask.highlevelgraph import HighLevelGraph
 from iris.util import equalise_attributes
 
+from esmvalcore.cmor.check import _get_period_indices
 from esmvalcore.iris_helpers import date2num
 from esmvalcore.preprocessor import remove_fx_variables
 
@@ -46,6 +52,21 @@ STATISTIC_MAPPING = {
     'wpercentile': iris.analysis.WPERCENTILE,  # not lazy in iris
 }
 
+# Statistics that can be computed online, i.e. from one cube at a time
+ONLINE_STATISTICS = (
+    'max',
+    'mean',
+    'min',
+    'rms',
+    'std',
+    'std_dev',
+    'sum',
+    'variance',
+)
+
+# Accumulators used to compute statistics online
+ACCUMULATORS = ('count', 'mean', 'm2', 'min', 'max', 'sum_of_squares')
+
 CONCAT_DIM = 'multi-model'
 
 
@@ -87,6 +108,71 @@ def _get_consistent_time_unit(cubes):
     return cf_units.Unit("days since 1850-01-01", calendar="standard")
 
 
+def _get_day_length(units):
+    """Return the length of a day in time units ``units``."""
+    return (units.date2num(datetime(2000, 1, 2)) -
+            units.date2num(datetime(2000, 1, 1)))
+
+
+def _get_unified_time_points(coord, t_unit):
+    """Get the time points of ``coord`` reset to the default day in ``t_unit``.
+
+    The dates are computed from the calendar months that contain the time
+    points, so only the first days of the months are converted between
+    numbers and dates.
+
+    Returns
+    -------
+    points: np.ndarray
+        The new time points.
+    daily: bool
+        `True` if ``coord`` contains daily data.
+    """
+    # Like cf_units, round the time points to the nearest second
+    seconds = 86400 / _get_day_length(coord.units)
+    points = np.round(coord.points.astype(np.float64) * seconds) / seconds
+    indices, starts = _get_period_indices(points, coord.units, 1)
+    first = coord.units.num2date(np.min(points))
+    years, months = np.divmod(indices + first.year * 12 + first.month - 1, 12)
+    months += 1
+    days = np.round((points - starts[indices]) * seconds) // 86400 + 1
+
+    # Reconstruct default calendar
+    daily = False
+    if 0 not in np.diff(years):
+        # yearly data
+        months = np.full_like(years, 7)
+        days = np.ones_like(days)
+    elif 0 not in np.diff(months):
+        # monthly data
+        days = np.full_like(days, 15)
+    elif 0 not in np.diff(days):
+        # daily data
+        daily = True
+    else:
+        raise ValueError(
+            "Multimodel statistics preprocessor currently does not "
+            "support sub-daily data.")
+
+    # Only convert the first days of the months and of the following months,
+    # the days are added as offsets
+    periods, inverse = np.unique(years * 12 + months - 1, return_inverse=True)
+    starts, ends = date2num(
+        [
+            datetime(p // 12, p % 12 + 1, 1, 0, 0, 0)
+            for p in np.concatenate([periods, periods + 1]).tolist()
+        ],
+        t_unit,
+    ).reshape(2, -1)[:, inverse]
+    day_length = _get_day_length(t_unit)
+    if np.any((days - 1) * day_length >= ends - starts):
+        raise ValueError(
+            f"Multimodel statistics preprocessor cannot convert dates that "
+            f"do not exist in the {t_unit.calendar} calendar.")
+    points = starts + (days - 1) * day_length
+    return points.astype(coord.dtype), daily
+
+
 def _unify_time_coordinates(cubes):
     """Make sure all cubes' share the same time coordinate.
 
@@ -100,47 +186,29 @@ def _unify_time_coordinates(cubes):
 
     Might not work for (sub)daily data, because different calendars may have
     different number of days in the year.
+
+    Time coordinates that are shared by several cubes are only converted once.
     """
     t_unit = _get_consistent_time_unit(cubes)
 
+    unified = {}
     for cube in cubes:
-        # Extract date info from cube
         coord = cube.coord('time')
-        years = [p.year for p in coord.units.num2date(coord.points)]
-        months = [p.month for p in coord.units.num2date(coord.points)]
-        days = [p.day for p in coord.units.num2date(coord.points)]
-
-        # Reconstruct default calendar
-        if 0 not in np.diff(years):
-            # yearly data
-            dates = [datetime(year, 7, 1, 0, 0, 0) for year in years]
-        elif 0 not in np.diff(months):
-            # monthly data
-            dates = [
-                datetime(year, month, 15, 0, 0, 0)
-                for year, month in zip(years, months)
-            ]
-        elif 0 not in np.diff(days):
-            # daily data
-            dates = [
-                datetime(year, month, day, 0, 0, 0)
-                for year, month, day in zip(years, months, days)
-            ]
-            if coord.units != t_unit:
-                logger.warning(
-                    "Multimodel encountered (sub)daily data and inconsistent "
-                    "time units or calendars. Attempting to continue, but "
-                    "might produce unexpected results.")
-        else:
-            raise ValueError(
-                "Multimodel statistics preprocessor currently does not "
-                "support sub-daily data.")
+        key = (coord.units, coord.dtype, coord.points.tobytes())
+        if key not in unified:
+            unified[key] = _get_unified_time_points(coord, t_unit)
+        points, daily = unified[key]
+        if daily and coord.units != t_unit:
+            logger.warning(
+                "Multimodel encountered (sub)daily data and inconsistent "
+                "time units or calendars. Attempting to continue, but "
+                "might produce unexpected results.")
 
         # Update the cubes' time coordinate (both point values and the units!)
-        cube.coord('time').points = date2num(dates, t_unit, coord.dtype)
-        cube.coord('time').units = t_unit
-        cube.coord('time').bounds = None
-        cube.coord('time').guess_bounds()
+        coord.points = points
+        coord.units = t_unit
+        coord.bounds = None
+        coord.guess_bounds()
 
 
 def _time_coords_are_aligned(cubes):
@@ -155,43 +223,84 @@ def _time_coords_are_aligned(cubes):
     return True
 
 
+def _get_time_indices(old_points, new_points):
+    """Get the index of the nearest old time point for each new time point.
+
+    Returns the indices and a mask that is `True` where a new time point lies
+    outside the range of the old time points. Ties are resolved towards the
+    earlier time point, like :class:`iris.analysis.Nearest`.
+    """
+    indices = np.searchsorted(old_points, new_points)
+    if len(old_points) > 1:
+        indices = np.clip(indices, 1, len(old_points) - 1)
+        earlier = new_points - old_points[indices - 1]
+        later = old_points[indices] - new_points
+        indices -= earlier <= later
+    else:
+        indices = np.zeros_like(indices)
+    outside = (new_points < old_points[0]) | (new_points > old_points[-1])
+    return indices, outside
+
+
+def _mask_along_dim(array, mask, dim):
+    """Mask the slices of ``array`` along dimension ``dim`` given by ``mask``.
+
+    Lazy arrays stay lazy.
+    """
+    shape = [1] * array.ndim
+    shape[dim] = -1
+    mask = mask.reshape(shape)
+    if isinstance(array, da.Array):
+        chunks = [(1, )] * array.ndim
+        chunks[dim] = array.chunks[dim]
+        mask = da.from_array(mask, chunks=chunks)
+        mask = da.broadcast_to(mask, array.shape, chunks=array.chunks)
+        return da.ma.masked_where(mask, array)
+    return np.ma.masked_where(np.broadcast_to(mask, array.shape), array)
+
+
 def _map_to_new_time(cube, time_points):
     """Map cube onto new cube with specified time points.
 
     Missing data inside original bounds is filled with nearest neighbour
     Missing data outside original bounds is masked.
+
+    The data and the coordinates that span the time dimension are gathered
+    from the nearest original time points, so lazy data stays lazy.
     """
-    time_points = cube.coord('time').units.num2date(time_points)
-    sample_points = [('time', time_points)]
-    scheme = iris.analysis.Nearest(extrapolation_mode='mask')
-
-    # Make sure that all integer time coordinates ('year', 'month',
-    # 'day_of_year', etc.) are converted to floats, otherwise the
-    # nearest-neighbor interpolation will fail with a "cannot convert float NaN
-    # to integer". In addition, remove their bounds (this would be done by iris
-    # anyway).
-    int_time_coords = []
-    for coord in cube.coords(dimensions=cube.coord_dims('time'),
-                             dim_coords=False):
-        if np.issubdtype(coord.points.dtype, np.integer):
-            int_time_coords.append(coord.name())
-            coord.points = coord.points.astype(float)
-            coord.bounds = None
-
-    # Do the actual interpolation
+    time_points = np.asarray(time_points)
+    time_coord = cube.coord('time')
+    time_dim = cube.coord_dims(time_coord)[0]
+    indices, outside = _get_time_indices(time_coord.points, time_points)
+    keys = [slice(None)] * cube.ndim
+    keys[time_dim] = indices
+
+    # Index the cube without its time coordinate, because the gathered time
+    # points may contain duplicates
+    cube.remove_coord(time_coord)
     try:
-        new_cube = cube.interpolate(sample_points, scheme)
+        new_cube = cube[tuple(keys)]
+        new_cube.add_dim_coord(
+            time_coord.copy(points=time_points, bounds=None), time_dim)
     except Exception as excinfo:
         raise ValueError(
             f"Tried to align cubes in multi-model statistics, but failed for "
             f"cube {cube}\n and time points {time_points}") from excinfo
-
-    # Change the dtype of int_time_coords to their original values
-    for coord_name in int_time_coords:
-        coord = new_cube.coord(coord_name,
-                               dimensions=new_cube.coord_dims('time'),
-                               dim_coords=False)
-        coord.points = coord.points.astype(int)
+    finally:
+        cube.add_dim_coord(time_coord, time_dim)
+
+    # Mask data and time-dependent coordinates outside the original time span
+    if outside.any():
+        new_cube.data = _mask_along_dim(new_cube.core_data(), outside,
+                                        time_dim)
+    for coord in new_cube.aux_coords:
+        coord_dims = new_cube.coord_dims(coord)
+        if time_dim not in coord_dims:
+            continue
+        coord.bounds = None
+        if outside.any():
+            coord.points = _mask_along_dim(coord.core_points(), outside,
+                                           coord_dims.index(time_dim))
 
     return new_cube
 
@@ -203,16 +312,18 @@ def _align(cubes, span):
     if _time_coords_are_aligned(cubes):
         return cubes
 
-    all_time_arrays = [cube.coord('time').points for cube in cubes]
-
-    if span == 'overlap':
-        new_time_points = reduce(np.intersect1d, all_time_arrays)
-    elif span == 'full':
-        new_time_points = reduce(np.union1d, all_time_arrays)
-    else:
+    if span not in ('overlap', 'full'):
         raise ValueError(f"Invalid argument for span: {span!r}"
                          "Must be one of 'overlap', 'full'.")
 
+    # Compute the common time points once, the time points of each cube are
+    # unique, so the points that occur in every cube are the overlap
+    all_time_points = np.concatenate(
+        [cube.coord('time').points for cube in cubes])
+    new_time_points, counts = np.unique(all_time_points, return_counts=True)
+    if span == 'overlap':
+        new_time_points = new_time_points[counts == len(cubes)]
+
     new_cubes = [_map_to_new_time(cube, new_time_points) for cube in cubes]
 
     for cube in new_cubes:
@@ -295,63 +406,67 @@ def _combine(cubes):
     return merged_cube
 
 
-def _compute_slices(cubes):
-    """Create cube slices resulting in a combined cube of about 1 GiB."""
-    gibibyte = 2**30
-    total_bytes = cubes[0].data.nbytes * len(cubes)
-    n_slices = int(np.ceil(total_bytes / gibibyte))
-
-    n_timesteps = cubes[0].shape[0]
-    slice_len = int(np.ceil(n_timesteps / n_slices))
-
-    for i in range(n_slices):
-        start = i * slice_len
-        end = (i + 1) * slice_len
-        if end >= n_timesteps:
-            yield slice(start, n_timesteps)
-            return
-        yield slice(start, end)
-
-
-def _compute_eager(cubes: list, *, operator: iris.analysis.Aggregator,
-                   **kwargs):
-    """Compute statistics one slice at a time."""
-    _ = [cube.data for cube in cubes]  # make sure the cubes' data are realized
-
-    result_slices = []
-    for chunk in _compute_slices(cubes):
-        single_model_slices = [cube[chunk] for cube in cubes]
-        combined_slice = _combine(single_model_slices)
-        with warnings.catch_warnings():
-            warnings.filterwarnings(
-                'ignore',
-                message=(
-                    "Collapsing a non-contiguous coordinate. "
-                    f"Metadata may not be fully descriptive for '{CONCAT_DIM}."
-                ),
-                category=UserWarning,
-                module='iris',
-            )
-            collapsed_slice = combined_slice.collapsed(CONCAT_DIM, operator,
-                                                       **kwargs)
+def _aggregate_blocks(operator, data, axis, **kwargs):
+    """Aggregate a lazy array along `axis` one block at a time.
 
-        # some iris aggregators modify dtype, see e.g.
-        # https://numpy.org/doc/stable/reference/generated/numpy.ma.average.html
-        collapsed_slice.data = collapsed_slice.data.astype(np.float32)
+    The array is rechunked so every block contains the complete `axis`,
+    e.g. the data of all cubes for a part of the grid and time span.
+    """
+    if not isinstance(axis, int):
+        (axis, ) = axis
+    axis = axis % data.ndim
+    data = data.rechunk({axis: -1})
+    sample = operator.aggregate(np.ma.ones(data.shape[axis], data.dtype),
+                                axis=0,
+                                **kwargs)
+    dtype = np.asarray(sample).dtype
+    return da.map_blocks(
+        partial(operator.aggregate, axis=axis, **kwargs),
+        data,
+        drop_axis=axis,
+        dtype=dtype,
+        meta=np.ma.array(np.empty((0, ) * (data.ndim - 1), dtype=dtype)),
+    )
 
-        result_slices.append(collapsed_slice)
 
-    try:
-        result_cube = iris.cube.CubeList(result_slices).concatenate_cube()
-    except Exception as excinfo:
-        raise ValueError(
-            "Multi-model statistics failed to concatenate results into a"
-            f" single array. This happened for operator {operator}"
-            f" with computed statistics {result_slices}."
-            "This can happen e.g. if the calculation results in inconsistent"
-            f" dtypes. Encountered the following exception: {excinfo}")
+def _get_lazy_operator(operator: iris.analysis.Aggregator):
+    """Get a version of `operator` that keeps lazy data lazy.
+
+    Operators that iris can only apply to realized data are applied to
+    blocks of the data instead, see :func:`_aggregate_blocks`.
+    """
+    if operator.lazy_func is not None:
+        return operator
+    lazy_operator = copy.copy(operator)
+    lazy_operator.lazy_func = partial(_aggregate_blocks, operator)
+    return lazy_operator
+
+
+def _compute(cube: iris.cube.Cube, *, operator: iris.analysis.Aggregator,
+             **kwargs):
+    """Compute a statistic over the cubes combined by :func:`_combine`.
+
+    The data of the combined cube is lazy, so the statistic is computed
+    one block at a time when the result is realized and only one block of
+    each input cube needs to be in memory at the same time.
+    """
+    with warnings.catch_warnings():
+        warnings.filterwarnings(
+            'ignore',
+            message=(
+                "Collapsing a non-contiguous coordinate. "
+                f"Metadata may not be fully descriptive for '{CONCAT_DIM}."
+            ),
+            category=UserWarning,
+            module='iris',
+        )
+        result_cube = cube.collapsed(CONCAT_DIM, _get_lazy_operator(operator),
+                                     **kwargs)
+
+    # some iris aggregators modify dtype, see e.g.
+    # https://numpy.org/doc/stable/reference/generated/numpy.ma.average.html
+    result_cube.data = result_cube.lazy_data().astype(np.float32)
 
-    result_cube.data = np.ma.array(result_cube.data)
     result_cube.remove_coord(CONCAT_DIM)
     if result_cube.cell_methods:
         cell_method = result_cube.cell_methods[0]
@@ -360,35 +475,319 @@ def _compute_eager(cubes: list, *, operator: iris.analysis.Aggregator,
             method=cell_method.method,
             coords=cell_method.coord_names,
             intervals=cell_method.intervals,
-            comments=f'input_cubes: {len(cubes)}')
+            comments=f'input_cubes: {cube.coord(CONCAT_DIM).shape[0]}')
         result_cube.add_cell_method(updated_method)
     return result_cube
 
 
-def _multicube_statistics(cubes, statistics, span):
+def _is_order_statistic(operator, kwargs):
+    """Check if a statistic can be computed from the sorted data."""
+    if operator is iris.analysis.MEDIAN:
+        return not kwargs
+    if operator is iris.analysis.PERCENTILE:
+        return 'percent' in kwargs and set(kwargs) <= {
+            'percent', 'alphap', 'betap'
+        }
+    return False
+
+
+def _compute_quantile(sorted_data, count, prob, alphap=1., betap=1.):
+    """Compute a quantile from data sorted along the first axis.
+
+    This is a vectorised version of :func:`scipy.stats.mstats.mquantiles`,
+    which is used by :const:`iris.analysis.PERCENTILE`.
+
+    Parameters
+    ----------
+    sorted_data: np.ndarray
+        Data sorted along the first axis, with the valid values first.
+    count: np.ndarray
+        Number of valid values along the first axis.
+    prob: float
+        The quantile, between 0 and 1.
+    alphap, betap: float
+        Plotting positions, see :func:`scipy.stats.mstats.mquantiles`. The
+        defaults are the same as for :const:`iris.analysis.PERCENTILE`.
+
+    Returns
+    -------
+    np.ma.MaskedArray
+        The quantile, masked where there are no valid values.
+    """
+    aleph = count * prob + alphap + prob * (1. - alphap - betap)
+    k = np.floor(np.clip(aleph, 1, np.maximum(count - 1, 1))).astype(int)
+    gamma = np.clip(aleph - k, 0, 1)
+    lower = np.take_along_axis(sorted_data, k[np.newaxis] - 1, axis=0)[0]
+    upper = np.take_along_axis(sorted_data, k[np.newaxis], axis=0)[0]
+    result = (1. - gamma) * lower + gamma * upper
+    result = np.where(count == 1, sorted_data[0], result)
+    return np.ma.masked_where(count == 0, result)
+
+
+def _compute_block(block, operators):
+    """Compute several statistics of a block along the first axis.
+
+    Order statistics, i.e. the median and percentiles, are computed from
+    the same sorted block.
+    """
+    results = []
+    sorted_block = None
+    for operator, kwargs in operators:
+        if _is_order_statistic(operator, kwargs):
+            if sorted_block is None:
+                count = np.asarray(np.ma.count(block, axis=0))
+                sorted_block = np.ma.filled(np.ma.sort(block, axis=0), 0)
+            kwargs = dict(kwargs)
+            prob = kwargs.pop('percent', 50.) / 100.
+            result = _compute_quantile(sorted_block, count, prob, **kwargs)
+        else:
+            # Like iris, aggregate along the last axis, some aggregators,
+            # e.g. PEAK, ignore the `axis` argument.
+            result = operator.aggregate(np.moveaxis(block, 0, -1),
+                                        axis=-1,
+                                        **kwargs)
+        results.append(np.ma.asarray(result, dtype=np.float32))
+    return np.ma.stack(results)
+
+
+def _init_accumulators(block):
+    """Create the accumulators for the values of the first cube."""
+    shape = (len(ACCUMULATORS), ) + block.shape
+    accumulators = np.zeros(shape, dtype=np.float64)
+    accumulators[ACCUMULATORS.index('min')] = np.inf
+    accumulators[ACCUMULATORS.index('max')] = -np.inf
+    return _update_accumulators(accumulators, block)
+
+
+def _update_accumulators(accumulators, block):
+    """Add the values of one cube to the accumulators.
+
+    The mean and the sum of squared differences from the mean are updated
+    with Welford's algorithm. Masked values are ignored.
+    """
+    accumulators = accumulators.copy()
+    count, mean, m2, minimum, maximum, sum_of_squares = accumulators
+    valid = ~np.ma.getmaskarray(block)
+    values = np.ma.getdata(block).astype(np.float64)
+
+    count += valid
+    delta = np.subtract(values, mean, out=np.zeros_like(mean), where=valid)
+    mean += np.divide(delta, count, out=np.zeros_like(mean), where=valid)
+    m2 += np.multiply(delta, values - mean, out=delta, where=valid)
+    np.fmin(minimum, values, out=minimum, where=valid)
+    np.fmax(maximum, values, out=maximum, where=valid)
+    np.add(sum_of_squares, values**2, out=sum_of_squares, where=valid)
+    return accumulators
+
+
+def _finalize_accumulators(accumulators, operators):
+    """Compute several statistics from the accumulators."""
+    count, mean, m2, minimum, maximum, sum_of_squares = accumulators
+    results = []
+    for operator, kwargs in operators:
+        min_count = 1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if operator is iris.analysis.MEAN:
+                result = mean
+            elif operator is iris.analysis.SUM:
+                result = mean * count
+            elif operator is iris.analysis.MIN:
+                result = minimum
+            elif operator is iris.analysis.MAX:
+                result = maximum
+            elif operator is iris.analysis.RMS:
+                result = np.sqrt(sum_of_squares / count)
+            else:
+                ddof = kwargs.get('ddof', 1)
+                min_count += ddof
+                result = m2 / (count - ddof)
+                if operator is iris.analysis.STD_DEV:
+                    result = np.sqrt(result)
+        result = np.ma.masked_where(count < min_count, result)
+        results.append(result.astype(np.float32))
+    return np.ma.stack(results)
+
+
+def _chain_accumulators(accumulators, data):
+    """Add the data of one cube to lazy accumulators, block by block.
+
+    Each block of the result only depends on the same block of the
+    previous accumulators and of `data`. The tasks are added as a plain
+    graph layer, so dask does not fuse the updates for all cubes into
+    a single task that keeps all intermediate accumulators in memory.
+    """
+    name = f'update_accumulators-{tokenize(accumulators, data)}'
+    graph = {(name, 0) + index: (
+        _update_accumulators,
+        (accumulators.name, 0) + index,
+        (data.name, ) + index,
+    )
+             for index in np.ndindex(data.numblocks)}
+    graph = HighLevelGraph.from_collections(
+        name,
+        graph,
+        dependencies=[accumulators, data],
+    )
+    return da.Array(graph, name, chunks=accumulators.chunks,
+                    meta=accumulators)
+
+
+def _compute_online(cubes, operators, release=None):
+    """Compute several statistics one cube at a time.
+
+    For each block, the accumulators are updated with the data of one cube
+    after the other. Each update only depends on the previous update and on
+    the block of one cube, so peak memory does not depend on the number of
+    cubes.
+
+    If a function `release` is given, the accumulators are computed right
+    away instead, from the realized data of one cube after the other. After
+    the data of a cube has been added, the cube is removed from `cubes` and
+    `release` is called with its index, so its data can be released before
+    the next cube is read.
+    """
+    chunks = cubes[0].lazy_data().chunks
+    accumulator_chunks = ((len(ACCUMULATORS), ), ) + chunks
+    if release is None:
+        accumulators = da.map_blocks(
+            _init_accumulators,
+            cubes[0].lazy_data(),
+            new_axis=0,
+            chunks=accumulator_chunks,
+            dtype=np.float64,
+            meta=np.array((), dtype=np.float64),
+        )
+        for cube in cubes[1:]:
+            accumulators = _chain_accumulators(
+                accumulators,
+                cube.lazy_data().rechunk(chunks),
+            )
+    else:
+        accumulators = None
+        for index in range(len(cubes)):
+            data = cubes[index].lazy_data().compute()
+            cubes[index] = None
+            if accumulators is None:
+                accumulators = _init_accumulators(data)
+            else:
+                accumulators = _update_accumulators(accumulators, data)
+            data = None
+            release(index)
+        accumulators = da.from_array(accumulators, chunks=accumulator_chunks)
+    return da.map_blocks(
+        _finalize_accumulators,
+        accumulators,
+        operators=operators,
+        chunks=((len(operators), ), ) + chunks,
+        dtype=np.float32,
+        meta=np.ma.array(np.empty((0, ) * (len(chunks) + 1),
+                                  dtype=np.float32)),
+    )
+
+
+def _compute_statistics(cube: iris.cube.Cube,
+                        statistics: list,
+                        cubes: list = None,
+                        release: Callable = None):
+    """Compute several statistics over the cubes combined by :func:`_combine`.
+
+    All statistics are computed from the same blocks of the combined data,
+    so when the results are realized together, the data is only read once.
+    Peak memory is about the size of one block of each input cube.
+
+    If the `cubes` that were combined are given, the statistics are
+    computed online from their data instead, see :func:`_compute_online`
+    for the `release` argument.
+    """
+    operators = [_resolve_operator(statistic) for statistic in statistics]
+
+    statistics_cubes = {}
+    for statistic, (operator, kwargs) in zip(statistics, operators):
+        logger.debug('Multicube statistics: computing: %s', statistic)
+        statistics_cubes[statistic] = _compute(cube,
+                                               operator=operator,
+                                               **kwargs)
+
+    if cubes is not None:
+        stacked_data = _compute_online(cubes, operators, release)
+    else:
+        axis = cube.coord_dims(CONCAT_DIM)[0]
+        data = da.moveaxis(cube.lazy_data(), axis, 0).rechunk({0: -1})
+        stacked_data = da.map_blocks(
+            _compute_block,
+            data,
+            operators=operators,
+            chunks=((len(operators), ), ) + data.chunks[1:],
+            dtype=np.float32,
+            meta=np.ma.array(np.empty((0, ) * data.ndim, dtype=np.float32)),
+        )
+    for i, result_cube in enumerate(statistics_cubes.values()):
+        result_cube.data = stacked_data[i]
+    return statistics_cubes
+
+
+def _get_template(cube):
+    """Copy a cube, replacing its data by lazy zeros."""
+    data = cube.lazy_data()
+    return cube.copy(da.zeros(data.shape, dtype=data.dtype,
+                              chunks=data.chunks))
+
+
+def _multicube_statistics(cubes, statistics, span, online=False,
+                          release=None):
     """Compute statistics over multiple cubes.
 
     Can be used e.g. for ensemble or multi-model statistics.
 
     Cubes are merged and subsequently collapsed along a new auxiliary
     coordinate. Inconsistent attributes will be removed.
+
+    If the statistics are computed `online` and a function `release` is
+    given, it is called with the index of each cube in `cubes` as soon as
+    the statistics no longer need the cube. Realized data is added to the
+    statistics one cube after the other for this, lazy data is only read
+    when the statistics are computed.
     """
     if len(cubes) == 1:
         raise ValueError('Cannot perform multicube statistics '
                          'for a single cube.')
+    if online:
+        unsupported = [
+            s for s in statistics if s.lower() not in ONLINE_STATISTICS
+        ]
+        if unsupported:
+            raise ValueError(
+                f"Statistics {', '.join(unsupported)} cannot be computed "
+                f"online, choose from {', '.join(ONLINE_STATISTICS)}")
+
+    lazy_input = any(cube.has_lazy_data() for cube in cubes)
+    realize = online and release is not None and not lazy_input
+    # avoid modifying inputs, the copies share the (lazy) data
+    aligned_cubes = _align([cube.copy(cube.lazy_data()) for cube in cubes],
+                           span=span)
+    if realize:
+        # The combined cube only provides the metadata of the results, so it
+        # does not refer to the data that is released
+        combined_cube = _combine([_get_template(c) for c in aligned_cubes])
+    else:
+        combined_cube = _combine(aligned_cubes)
 
-    copied_cubes = [cube.copy() for cube in cubes]  # avoid modifying inputs
-    aligned_cubes = _align(copied_cubes, span=span)
-
-    statistics_cubes = {}
-    for statistic in statistics:
-        logger.debug('Multicube statistics: computing: %s', statistic)
-        operator, kwargs = _resolve_operator(statistic)
+    statistics_cubes = _compute_statistics(
+        combined_cube,
+        statistics,
+        cubes=aligned_cubes if online else None,
+        release=release if realize else None,
+    )
+    if online and release is not None and lazy_input:
+        for index in range(len(cubes)):
+            release(index)
 
-        result_cube = _compute_eager(aligned_cubes,
-                                     operator=operator,
-                                     **kwargs)
-        statistics_cubes[statistic] = result_cube
+    # real data in => real data out, computed together to share the input
+    if not lazy_input:
+        result_cubes = list(statistics_cubes.values())
+        results = da.compute(*[cube.lazy_data() for cube in result_cubes])
+        for result_cube, data in zip(result_cubes, results):
+            result_cube.data = np.ma.array(data)
 
     return statistics_cubes
 
@@ -397,16 +796,37 @@ def _multiproduct_statistics(products,
                              statistics,
                              output_products,
                              span=None,
-                             keep_input_datasets=None):
+                             keep_input_datasets=None,
+                             online=False):
     """Compute multi-cube statistics on ESMValCore products.
 
     Extract cubes from products, calculate multicube statistics and
     assign the resulting output cubes to the output_products.
+
+    If the statistics are computed `online` and the input products are not
+    kept, each input product is closed as soon as the statistics no longer
+    need it, so the realized data of only one of them needs to be in memory
+    at a time.
     """
-    cubes = [cube for product in products for cube in product.cubes]
+    cubes = []
+    last_cubes = {}
+    for product in products:
+        cubes.extend(product.cubes)
+        last_cubes[len(cubes) - 1] = product
+
+    release = None
+    if online and not keep_input_datasets:
+
+        def release(index):
+            cubes[index] = None
+            if index in last_cubes:
+                last_cubes[index].cubes = None
+
     statistics_cubes = _multicube_statistics(cubes=cubes,
                                              statistics=statistics,
-                                             span=span)
+                                             span=span,
+                                             online=online,
+                                             release=release)
     statistics_products = set()
     for statistic, cube in statistics_cubes.items():
         statistics_product = output_products[statistic]
@@ -429,7 +849,8 @@ def multi_model_statistics(products,
                            statistics,
                            output_products=None,
                            groupby=None,
-                           keep_input_datasets=True):
+                           keep_input_datasets=True,
+                           online=False):
     """Compute multi-model statistics.
 
     This function computes multi-model statistics on a list of ``products``,
@@ -476,6 +897,11 @@ def multi_model_statistics(products,
     keep_input_datasets: bool
         If True, the output will include the input datasets.
         If False, only the computed statistics will be returned.
+    online: bool
+        If True, compute the statistics one dataset at a time, so the memory
+        needed does not depend on the number of datasets. Only ``max``,
+        ``mean``, ``min``, ``rms``, ``std_dev``, ``sum`` and ``variance`` can
+        be computed online.
 
     Returns
     -------
@@ -494,6 +920,7 @@ def multi_model_statistics(products,
             cubes=products,
             statistics=statistics,
             span=span,
+            online=online,
         )
     if all(type(p).__name__ == 'PreprocessorFile' for p in products):
         # Avoid circular input: https://stackoverflow.com/q/16964467
@@ -507,7 +934,8 @@ def multi_model_statistics(products,
                 statistics=statistics,
                 output_products=sub_output_products,
                 span=span,
-                keep_input_datasets=keep_input_datasets
+                keep_input_datasets=keep_input_datasets,
+                online=online,
             )
 
             statistics_products |= group_statistics
@@ -520,7 +948,7 @@ def multi_model_statistics(products,
 
 
 def ensemble_statistics(products, statistics,
-                        output_products, span='overlap'):
+                        output_products, span='overlap', online=False):
     """Entry point for ensemble statistics.
 
     An ensemble grouping is performed on the input products.
@@ -544,6 +972,11 @@ def ensemble_statistics(products, statistics,
         Overlap or full; if overlap, statitstics are computed on common time-
         span; if full, statistics are computed on full time spans, ignoring
         missing data.
+    online: bool (default: False)
+        If True, compute the statistics one ensemble member at a time, so the
+        memory needed does not depend on the number of members. Only
+        ``max``, ``mean``, ``min``, ``rms``, ``std_dev``, ``sum`` and
+        ``variance`` can be computed online.
 
     Returns
     -------
@@ -562,5 +995,6 @@ def ensemble_statistics(products, statistics,
         statistics=statistics,
         output_products=output_products,
         groupby=ensemble_grouping,
-        keep_input_datasets=False
+        keep_input_datasets=False,
+        online=online,
     )
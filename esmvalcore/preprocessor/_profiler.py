@@ -0,0 +1,202 @@
+"""Profiler for the resources used by preprocessor steps."""
+import contextlib
+import csv
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = 'preprocessor_profile'
+"""Directory in the run directory where the profile of each task is saved."""
+
+FIELDS = (
+    'task',
+    'product',
+    'step',
+    'wall_time',
+    'cpu_time',
+    'peak_memory_increase',
+    'disk_read',
+    'disk_write',
+)
+"""Fields of a profile record.
+
+Times are in seconds, memory and disk usage in bytes.
+"""
+
+
+@contextlib.contextmanager
+def _sample_peak_memory(process, interval):
+    """Sample the resident memory of `process` until the context exits."""
+    peak = [process.memory_info().rss]
+    halt = threading.Event()
+
+    def _sample():
+        while not halt.wait(interval):
+            peak[0] = max(peak[0], process.memory_info().rss)
+
+    thread = threading.Thread(target=_sample, daemon=True)
+    thread.start()
+    try:
+        yield peak
+    finally:
+        halt.set()
+        thread.join()
+        peak[0] = max(peak[0], process.memory_info().rss)
+
+
+def _get_io_counters(process):
+    """Get the number of bytes read and written by `process`."""
+    try:
+        counters = process.io_counters()
+    except (AttributeError, psutil.AccessDenied):
+        return (0, 0)
+    return (counters.read_bytes, counters.write_bytes)
+
+
+def _get_cpu_time(process):
+    """Get the CPU time used by `process`, including all its threads."""
+    times = process.cpu_times()
+    return times.user + times.system
+
+
+class PreprocessorProfiler:
+    """Record the resources used by preprocessor steps.
+
+    Resource usage is measured for the whole process, so if other work is
+    done in the same process at the same time, e.g. when running tasks in
+    threads, it is included in the measurements.
+
+    Parameters
+    ----------
+    task_name: str
+        Name of the task that is profiled.
+    interval: float
+        Interval (s) for sampling the memory usage.
+    """
+
+    def __init__(self, task_name, interval=0.01):
+        self.task_name = task_name
+        self.interval = interval
+        self.records = []
+
+    @contextlib.contextmanager
+    def profile(self, product, step):
+        """Record the resources used while running `step` on `product`.
+
+        Parameters
+        ----------
+        product: str
+            Name of the product the step is applied to.
+        step: str
+            Name of the preprocessor step.
+        """
+        process = psutil.Process()
+        start_io = _get_io_counters(process)
+        start_cpu = _get_cpu_time(process)
+        start_time = time.perf_counter()
+        with _sample_peak_memory(process, self.interval) as peak:
+            start_memory = peak[0]
+            try:
+                yield
+            finally:
+                wall_time = time.perf_counter() - start_time
+                cpu_time = _get_cpu_time(process) - start_cpu
+        end_io = _get_io_counters(process)
+        self.records.append({
+            'task': self.task_name,
+            'product': product,
+            'step': step,
+            'wall_time': wall_time,
+            'cpu_time': cpu_time,
+            'peak_memory_increase': peak[0] - start_memory,
+            'disk_read': end_io[0] - start_io[0],
+            'disk_write': end_io[1] - start_io[1],
+        })
+
+    def save(self, filename):
+        """Save the records to a JSON file."""
+        filename = Path(filename)
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        with filename.open('w') as file:
+            json.dump(self.records, file, indent=1)
+
+
+def _format_summary(records):
+    """Summarize the wall time and memory usage per preprocessor step."""
+    total_time = defaultdict(float)
+    max_memory = defaultdict(int)
+    calls = defaultdict(int)
+    for record in records:
+        step = record['step']
+        total_time[step] += record['wall_time']
+        max_memory[step] = max(max_memory[step],
+                               record['peak_memory_increase'])
+        calls[step] += 1
+
+    all_time = sum(total_time.values()) or 1.
+    lines = [
+        f"{'Step':30s} {'Calls':>6s} {'Time (s)':>10s} {'Time (%)':>8s} "
+        f"{'Max memory increase (GB)':>25s}"
+    ]
+    for step in sorted(total_time, key=total_time.get, reverse=True):
+        lines.append(f"{step:30s} {calls[step]:6d} {total_time[step]:10.1f} "
+                     f"{100 * total_time[step] / all_time:8.1f} "
+                     f"{max_memory[step] / 2**30:25.3f}")
+    return '\n'.join(lines)
+
+
+def write_profile_report(run_dir):
+    """Combine the profiles of all preprocessing tasks into a report.
+
+    The profiles saved by the tasks in the ``preprocessor_profile``
+    directory are combined into ``preprocessor_profile.json`` and
+    ``preprocessor_profile.csv``. In addition, the wall time of each step is
+    written to ``preprocessor_profile.folded`` in the "folded stacks" format
+    used by flame graph tools, with stacks ``task;product;step`` and times in
+    milliseconds.
+
+    Parameters
+    ----------
+    run_dir: str
+        The run directory of the recipe.
+
+    Returns
+    -------
+    list of dict
+        The combined records.
+    """
+    run_dir = Path(run_dir)
+    records = []
+    for filename in sorted((run_dir / PROFILE_DIR).glob('**/*.json')):
+        with filename.open() as file:
+            records.extend(json.load(file))
+    if not records:
+        return records
+
+    with (run_dir / 'preprocessor_profile.json').open('w') as file:
+        json.dump(records, file, indent=1)
+
+    with (run_dir / 'preprocessor_profile.csv').open('w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+
+    with (run_dir / 'preprocessor_profile.folded').open('w') as file:
+        for record in records:
+            stack = ';'.join(
+                str(record[k]).replace(';', '_').replace(' ', '_')
+                for k in ('task', 'product', 'step'))
+            file.write(f"{stack} {round(1000 * record['wall_time'])}\n")
+
+    logger.info("Time spent in preprocessor steps:\n%s",
+                _format_summary(records))
+    logger.info("Wrote preprocessor profile to %s",
+                run_dir / 'preprocessor_profile.csv')
+    return records
@@ -1,5 +1,6 @@
 """Horizontal and vertical regridding module."""
 
+import functools
 import importlib
 import logging
 import os
@@ -19,11 +20,14 @@ from iris.util import broadcast_to_shape
 
 from esmvalcore.exceptions import ESMValCoreDeprecationWarning
 
+from .. import __version__
+from .._data_finder import get_file_metadata
 from ..cmor._fixes.shared import add_altitude_from_plev, add_plev_from_altitude
 from ..cmor.fix import fix_file, fix_metadata
 from ..cmor.table import CMOR_TABLES
 from ._ancillary_vars import add_ancillary_variable, add_cell_measure
 from ._io import GLOBAL_FILL_VALUE, concatenate_callback, load
+from ._regrid_cache import get_fingerprint, get_regridder
 from ._regrid_esmpy import ESMF_REGRID_METHODS
 from ._regrid_esmpy import regrid as esmpy_regrid
 
@@ -545,6 +549,11 @@ def regrid(cube, target_grid, scheme, lat_offset=True, lon_offset=True):
     .. note::
 
         Note that :doc:`iris-esmf-regrid:index` is still experimental.
+
+    Regridders, e.g. the weights of area weighted regridding, are computed
+    once and re-used for all cubes with the same horizontal grid, see the
+    ``regridder_cache_dir`` option in the :ref:`user configuration file
+    <user configuration file>` to also re-use them between runs.
     """
     if isinstance(scheme, dict):
         try:
@@ -564,8 +573,10 @@ def regrid(cube, target_grid, scheme, lat_offset=True, lon_offset=True):
             for attr in scheme_name.split('.'):
                 obj = getattr(obj, attr)
         loaded_scheme = obj(**scheme)
+        scheme_key = (object_ref, sorted(scheme.items()))
     else:
         loaded_scheme = HORIZONTAL_SCHEMES.get(scheme.lower())
+        scheme_key = scheme.lower()
     if loaded_scheme is None:
         emsg = 'Unknown regridding scheme, got {!r}.'
         raise ValueError(emsg.format(scheme))
@@ -625,7 +636,9 @@ def regrid(cube, target_grid, scheme, lat_offset=True, lon_offset=True):
         if _attempt_irregular_regridding(cube, scheme):
             cube = esmpy_regrid(cube, target_grid, scheme)
         else:
-            cube = cube.regrid(target_grid, loaded_scheme)
+            regridder = _get_regridder(cube, target_grid, scheme_key,
+                                       loaded_scheme)
+            cube = regridder(cube)
 
         # Preserve dtype and use masked arrays for 'unstructured_nearest'
         # scheme (see https://github.com/SciTools/iris/issues/4463)
@@ -643,6 +656,76 @@ def regrid(cube, target_grid, scheme, lat_offset=True, lon_offset=True):
     return cube
 
 
+def _get_grid_cube(cube):
+    """Get a slice of a cube that only spans its horizontal dimensions."""
+    horizontal_dims = {
+        dim
+        for coord in cube.coords(axis='x') + cube.coords(axis='y')
+        for dim in cube.coord_dims(coord)
+    }
+    keys = tuple(
+        slice(None) if dim in horizontal_dims else 0
+        for dim in range(cube.ndim))
+    return cube[keys]
+
+
+def _get_grid_mask(cube):
+    """Get the mask of the horizontal grid of a cube for regridding.
+
+    The mask is taken from the ancillary variables on the horizontal grid,
+    e.g. land or sea area fractions, so the data does not need to be
+    computed. Without these, the mask of realized data is used. Returns
+    `None` if the mask is not known without computing the data.
+    """
+    horizontal_dims = set(
+        dim for coord in cube.coords(axis='x') + cube.coords(axis='y')
+        for dim in cube.coord_dims(coord))
+    masks = [
+        np.ma.getmaskarray(ancillary_variable.data)
+        for ancillary_variable in sorted(cube.ancillary_variables(),
+                                         key=lambda a: a.name())
+        if set(cube.ancillary_variable_dims(ancillary_variable)) ==
+        horizontal_dims
+    ]
+    if masks:
+        return np.stack(masks)
+    if not cube.has_lazy_data():
+        return np.ma.getmaskarray(cube.data)
+    return None
+
+
+def _get_regridder(cube, target_grid, scheme_key, loaded_scheme):
+    """Get a regridder from ``cube`` to ``target_grid``.
+
+    Regridders are re-used for cubes on the same grid, see
+    :mod:`esmvalcore.preprocessor._regrid_cache`. They are built from slices
+    of the cubes along the horizontal dimensions, so they do not keep the
+    data of the cubes in memory.
+
+    The weights of the :mod:`iris` regridding schemes only depend on the
+    coordinates. Other generic schemes may also use the masks of the grids,
+    see :func:`_get_grid_mask`. If these are not known, the regridder is not
+    re-used.
+    """
+    src_grid = _get_grid_cube(cube)
+    tgt_grid = _get_grid_cube(target_grid)
+
+    def build():
+        return loaded_scheme.regridder(src_grid, tgt_grid)
+
+    depends_on_mask = not (isinstance(scheme_key, str)
+                           or scheme_key[0].startswith('iris.analysis:'))
+    items = [iris.__version__, scheme_key]
+    for full_grid, grid in ((cube, src_grid), (target_grid, tgt_grid)):
+        items.extend(grid.coords(axis='x') + grid.coords(axis='y'))
+        if depends_on_mask:
+            mask = _get_grid_mask(full_grid)
+            if mask is None:
+                return build()
+            items.append(mask)
+    return get_regridder(get_fingerprint(*items), build)
+
+
 def _horizontal_grid_is_close(cube1, cube2):
     """Check if two cubes have the same horizontal grid definition.
 
@@ -1063,6 +1146,27 @@ def get_reference_levels(filename, project, dataset, short_name, mip,
         If the dataset is not defined, the coordinate does not specify any
         levels or the string is badly formatted.
     """
+    # The fixes applied may differ between versions
+    key = (f"reference_levels {__version__} {project} {dataset} {short_name} "
+           f"{mip} {frequency}")
+    return get_file_metadata(
+        filename,
+        key,
+        functools.partial(
+            _read_reference_levels,
+            project=project,
+            dataset=dataset,
+            short_name=short_name,
+            mip=mip,
+            frequency=frequency,
+            fix_dir=fix_dir,
+        ),
+    )
+
+
+def _read_reference_levels(filename, project, dataset, short_name, mip,
+                           frequency, fix_dir):
+    """Read the levels from a reference file, see `get_reference_levels`."""
     filename = fix_file(
         file=filename,
         short_name=short_name,
@@ -0,0 +1,202 @@
+"""Cache of regridders that is shared between cubes on the same grid.
+
+Building a regridder, e.g. computing the weights of area weighted or ESMF
+regridding, often takes much longer than applying it. Many cubes, e.g. the
+variables of a model, are defined on the same grid, so the regridders are
+stored under a key that identifies the source grid, the target grid and the
+regridding scheme and re-used for all cubes with the same key.
+"""
+import hashlib
+import logging
+import os
+import pickle
+from collections import OrderedDict
+from pathlib import Path
+
+import iris
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _update_array(checksum, array):
+    """Add an array to a checksum."""
+    array = np.ascontiguousarray(array)
+    checksum.update(repr((array.shape, array.dtype.str)).encode('utf-8'))
+    checksum.update(array.tobytes())
+
+
+def get_fingerprint(*items):
+    """Compute a fingerprint of coordinates, arrays and other values.
+
+    Coordinates are identified by their type, metadata, points and bounds,
+    arrays by their shape, data type and values and other values by their
+    :func:`repr`.
+
+    Returns
+    -------
+    str
+        The fingerprint.
+    """
+    checksum = hashlib.sha256()
+    for item in items:
+        if isinstance(item, iris.coords.Coord):
+            checksum.update(
+                repr((type(item).__name__, item.metadata)).encode('utf-8'))
+            _update_array(checksum, item.points)
+            if item.has_bounds():
+                _update_array(checksum, item.bounds)
+        elif isinstance(item, np.ndarray):
+            _update_array(checksum, item)
+        else:
+            checksum.update(repr(item).encode('utf-8'))
+    return checksum.hexdigest()
+
+
+class RegridderCache:
+    """Least recently used cache of regridders.
+
+    Regridders are kept in memory. If a `directory` is given, regridders
+    that can be pickled, e.g. those of the :mod:`iris` regridding schemes,
+    are also stored there, so they can be re-used by other processes and
+    later runs.
+
+    Parameters
+    ----------
+    max_entries: int
+        Maximum number of regridders kept in memory. If there are more, the
+        least recently used regridders are removed first.
+    directory: str or None
+        Directory where regridders are stored, or `None` to only keep
+        regridders in memory.
+    max_size: float
+        Maximum total size (GB) of the regridders stored in `directory`. If
+        the stored regridders grow larger, the least recently used ones are
+        removed first.
+    """
+
+    def __init__(self, max_entries=16, directory=None, max_size=10):
+        self.max_entries = max_entries
+        self.directory = None if directory is None else Path(directory)
+        self.max_size = int(max_size * 2**30)
+        self._regridders = OrderedDict()
+
+    def clear(self):
+        """Remove all regridders from memory."""
+        self._regridders.clear()
+
+    def get(self, key, build):
+        """Get a regridder.
+
+        Parameters
+        ----------
+        key: str
+            Key that identifies the source grid, the target grid and the
+            regridding scheme, see :func:`get_fingerprint`.
+        build: callable
+            Function without arguments that builds the regridder if it is not
+            in the cache.
+
+        Returns
+        -------
+        callable
+            The regridder.
+        """
+        if key in self._regridders:
+            self._regridders.move_to_end(key)
+            return self._regridders[key]
+
+        regridder = self._load(key)
+        if regridder is None:
+            regridder = build()
+            self._store(key, regridder)
+        self._regridders[key] = regridder
+        while len(self._regridders) > self.max_entries:
+            self._regridders.popitem(last=False)
+        return regridder
+
+    def _get_path(self, key):
+        """Return the path where the regridder with `key` is stored."""
+        return self.directory / f"{key}.pickle"
+
+    def _load(self, key):
+        """Load a stored regridder, or return `None` if it is not stored."""
+        if self.directory is None:
+            return None
+        path = self._get_path(key)
+        try:
+            # Mark the regridder as recently used
+            os.utime(path)
+            with open(path, 'rb') as file:
+                regridder = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, AttributeError, EOFError,
+                ImportError, IndexError) as exc:
+            logger.warning("Ignoring stored regridder %s because it cannot "
+                           "be read: %s", path, exc)
+            return None
+        logger.debug("Using stored regridder %s", path)
+        return regridder
+
+    def _store(self, key, regridder):
+        """Store a regridder in the directory, if it can be pickled."""
+        if self.directory is None:
+            return
+        try:
+            blob = pickle.dumps(regridder, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, AttributeError, TypeError) as exc:
+            logger.debug("Not storing regridder %s: %s", key, exc)
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._get_path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(blob)
+        os.replace(tmp_path, path)
+        logger.debug("Stored regridder %s", path)
+        self._evict()
+
+    def _evict(self):
+        """Remove the least recently used regridders from the directory."""
+        entries = []
+        for path in self.directory.glob('*.pickle'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # Removed by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in sorted(entries, key=lambda e: e[0]):
+            if size <= self.max_size:
+                break
+            logger.debug("Removing least recently used regridder %s", path)
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+
+
+_REGRIDDER_CACHE = RegridderCache()
+
+
+def set_regridder_cache(directory=None, max_size=10):
+    """Configure the cache of regridders.
+
+    Parameters
+    ----------
+    directory: str or None
+        Directory where regridders are stored between runs, or `None` to only
+        keep regridders in memory.
+    max_size: float
+        Maximum total size (GB) of the regridders stored in `directory`.
+    """
+    global _REGRIDDER_CACHE  # pylint: disable=global-statement
+    _REGRIDDER_CACHE = RegridderCache(directory=directory, max_size=max_size)
+
+
+def get_regridder(key, build):
+    """Get a regridder from the cache, see :meth:`RegridderCache.get`."""
+    return _REGRIDDER_CACHE.get(key, build)
@@ -6,6 +6,7 @@ import iris
 import numpy as np
 
 from ._mapping import get_empty_data, map_slices, ref_to_dims_index
+from ._regrid_cache import get_fingerprint, get_regridder
 
 
 ESMF_MANAGER = ESMF.Manager(debug=False)
@@ -309,11 +310,27 @@ def get_grid_representants(src, dst):
     return src_rep, dst_rep
 
 
+def get_regridder_fingerprint(src_rep, dst_rep, method):
+    """Compute the fingerprint of a regridder between grid representants."""
+    # The weights depend on the mask of the source grid
+    return get_fingerprint(
+        'esmpy',
+        method,
+        *src_rep.coords(dim_coords=True),
+        src_rep.coord('latitude'),
+        src_rep.coord('longitude'),
+        np.ma.getmaskarray(src_rep.data),
+        dst_rep.coord('latitude'),
+        dst_rep.coord('longitude'),
+    )
+
+
 def regrid(src, dst, method='linear'):
     """
     Regrid src_cube to the grid defined by dst_cube.
 
-    Regrid the data in src_cube onto the grid defined by dst_cube.
+    Regrid the data in src_cube onto the grid defined by dst_cube. The
+    regridder is re-used for later source cubes with the same grid and mask.
 
     Parameters
     ----------
@@ -338,6 +355,8 @@ def regrid(src, dst, method='linear'):
        RegridMethod.html#ESMF.api.constants.RegridMethod
     """
     src_rep, dst_rep = get_grid_representants(src, dst)
-    regridder = build_regridder(src_rep, dst_rep, method)
+    key = get_regridder_fingerprint(src_rep, dst_rep, method)
+    regridder = get_regridder(
+        key, lambda: build_regridder(src_rep, dst_rep, method))
     res = map_slices(src, regridder, src_rep, dst_rep)
     return res
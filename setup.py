@@ -62,6 +62,7 @@ REQUIREMENTS = {
     # Test dependencies
     # Execute 'python setup.py test' to run tests
     'test': [
+        'distributed',
         'flake8<4',  # https://github.com/ESMValGroup/ESMValCore/issues/1405
         'pytest>=3.9,!=6.0.0rc1,!=6.0.0',
         'pytest-cov>=2.10.1',
@@ -77,6 +78,14 @@ REQUIREMENTS = {
         'types-requests',
         'types-pkg_resources',
         'types-PyYAML',
+        'xarray',
+        'zarr',
+    ],
+    # Optional dependencies for saving preprocessed data as Zarr stores
+    # Use pip install .[zarr] to install them
+    'zarr': [
+        'xarray',
+        'zarr',
     ],
     # Development dependencies
     # Use pip install -e .[develop] to install in development mode
@@ -227,6 +236,7 @@ setup(
     extras_require={
         'develop': REQUIREMENTS['develop'] + REQUIREMENTS['test'],
         'test': REQUIREMENTS['test'],
+        'zarr': REQUIREMENTS['zarr'],
     },
     entry_points={
         'console_scripts': [
@@ -0,0 +1,82 @@
+"""Integration tests for loading files with patched attributes."""
+import copy
+import pickle
+
+import numpy as np
+import pytest
+from netCDF4 import Dataset
+
+from esmvalcore.cmor._fixes.attribute_patches import PatchedFile
+from esmvalcore.preprocessor import load
+
+
+@pytest.fixture
+def sample_file(tmp_path):
+    """Create a file with a fill value that is not declared."""
+    filename = str(tmp_path / 'tas.nc')
+    with Dataset(filename, 'w') as dataset:
+        dataset.createDimension('time', 4)
+        time = dataset.createVariable('time', 'f8', ('time', ))
+        time[:] = [0., 1., 2., 3.]
+        time.standard_name = 'time'
+        time.units = 'days since 1850-01-01'
+        tas = dataset.createVariable('tas', 'i2', ('time', ), fill_value=-1)
+        tas.set_auto_maskandscale(False)
+        tas[:] = [-1, 10, 999, 20]
+        tas.units = 'K'
+        tas.comment = 'wrong'
+    return filename
+
+
+def test_load_unpatched(sample_file):
+    cube = load(sample_file)[0]
+    np.testing.assert_array_equal(cube.data.mask, [True, False, False, False])
+
+
+def test_load_patched_masking(sample_file):
+    patches = {'tas': {'missing_value': 999, 'scale_factor': 0.5}}
+    cube = load(PatchedFile(sample_file, patches))[0]
+    assert cube.has_lazy_data()
+    assert cube.dtype == np.float64
+    np.testing.assert_array_equal(cube.data.mask, [True, False, True, False])
+    np.testing.assert_array_equal(cube.data.compressed(), [5., 10.])
+    assert cube.attributes['source_file'] == sample_file
+    assert type(cube.attributes['source_file']) is str
+
+
+def test_load_patched_fill_value(sample_file):
+    patches = {'tas': {'_FillValue': 999}}
+    cube = load(PatchedFile(sample_file, patches))[0]
+    assert cube.dtype == np.int16
+    np.testing.assert_array_equal(cube.data.mask, [False, False, True, False])
+    np.testing.assert_array_equal(cube.data.compressed(), [-1, 10, 20])
+
+
+def test_load_patched_metadata(sample_file):
+    patches = {
+        'tas': {
+            'standard_name': 'air_temperature',
+            'units': 'degC',
+            'comment': None,
+            'history': 'patched',
+        },
+        'time': {
+            'calendar': '365_day',
+        },
+    }
+    cube = load(PatchedFile(sample_file, patches))[0]
+    assert cube.standard_name == 'air_temperature'
+    assert cube.units == 'degC'
+    assert 'comment' not in cube.attributes
+    assert cube.attributes['history'] == 'patched'
+    assert cube.coord('time').units.calendar == '365_day'
+    np.testing.assert_array_equal(cube.data.mask, [True, False, False, False])
+
+
+def test_patched_file_copy(sample_file):
+    patches = {'tas': {'missing_value': 999}}
+    patched_file = PatchedFile(sample_file, patches)
+    for copied in (copy.deepcopy(patched_file),
+                   pickle.loads(pickle.dumps(patched_file))):
+        assert copied == sample_file
+        assert copied.patches == patches
@@ -1,10 +1,20 @@
 """Integration tests for the variable_info module."""
 
 import os
+import shutil
 import unittest
 
+import pytest
+
 import esmvalcore.cmor
-from esmvalcore.cmor.table import CMIP3Info, CMIP5Info, CMIP6Info, CustomInfo
+from esmvalcore.cmor.table import (
+    CMIP3Info,
+    CMIP5Info,
+    CMIP6Info,
+    CustomInfo,
+    InfoBase,
+    set_cmor_table_cache,
+)
 
 
 class TestCMIP6Info(unittest.TestCase):
@@ -390,3 +400,67 @@ class TestCustomInfo(unittest.TestCase):
         self.assertEqual(var.long_name,
                          'Global-mean Near-Surface Air Temperature Anomaly')
         self.assertEqual(var.units, 'K')
+
+
+@pytest.fixture
+def cordex_tables(tmp_path):
+    """Copy of the CORDEX tables with the cache in a temporary directory."""
+    cmor_path = os.path.dirname(os.path.realpath(esmvalcore.cmor.__file__))
+    cmor_tables_path = tmp_path / 'cordex'
+    shutil.copytree(os.path.join(cmor_path, 'tables', 'cordex'),
+                    cmor_tables_path)
+    set_cmor_table_cache(tmp_path / 'cache')
+    yield cmor_tables_path
+    set_cmor_table_cache(None)
+
+
+def test_tables_read_lazily(cordex_tables, mocker):
+    read_tables = mocker.spy(CMIP5Info, '_read_tables')
+    variables_info = CMIP5Info(str(cordex_tables))
+    read_tables.assert_not_called()
+    assert variables_info.get_variable('mon', 'tas').short_name == 'tas'
+    assert variables_info.get_variable('day', 'tas').short_name == 'tas'
+    read_tables.assert_called_once()
+
+
+def test_tables_cached(cordex_tables, mocker):
+    tables = CMIP5Info(str(cordex_tables)).tables
+    assert len(list((cordex_tables.parent / 'cache').iterdir())) == 1
+
+    mocker.patch.object(CMIP5Info, '_read_tables', side_effect=AssertionError)
+    variables_info = CMIP5Info(str(cordex_tables))
+    assert variables_info.tables.keys() == tables.keys()
+    var = variables_info.get_variable('mon', 'tas')
+    assert var.short_name == 'tas'
+    assert var.coordinates.keys() == tables['mon']['tas'].coordinates.keys()
+
+
+def test_tables_cache_outdated(cordex_tables):
+    CMIP5Info(str(cordex_tables)).get_variable('mon', 'tas')
+    table_file = cordex_tables / 'Tables' / 'CORDEX_mon'
+    table_file.write_text(table_file.read_text().replace(
+        'Near-Surface Air Temperature', 'Changed Air Temperature'))
+    var = CMIP5Info(str(cordex_tables)).get_variable('mon', 'tas')
+    assert var.long_name == 'Changed Air Temperature'
+    assert len(list((cordex_tables.parent / 'cache').iterdir())) == 2
+
+
+def test_tables_cache_disabled(cordex_tables):
+    set_cmor_table_cache(None)
+    CMIP5Info(str(cordex_tables)).get_variable('mon', 'tas')
+    assert not (cordex_tables.parent / 'cache').exists()
+
+
+def test_missing_attribute(cordex_tables):
+    variables_info = CMIP5Info(str(cordex_tables))
+    with pytest.raises(AttributeError):
+        variables_info.activities
+    assert 'tables' not in vars(variables_info)
+    with pytest.raises(AttributeError):
+        variables_info.var_to_freq
+    assert 'tables' in vars(variables_info)
+
+
+def test_info_base_is_abstract():
+    with pytest.raises(TypeError):
+        InfoBase(None, None, True)
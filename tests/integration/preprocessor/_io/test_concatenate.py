@@ -14,7 +14,6 @@ from iris.aux_factory import (
 )
 from iris.coords import AuxCoord, DimCoord
 from iris.cube import Cube, CubeList
-from iris.exceptions import ConcatenateError
 
 from esmvalcore.preprocessor import _io
 
@@ -358,8 +357,8 @@ class TestConcatenate(unittest.TestCase):
         np.testing.assert_array_equal(
             concatenated.coord('time').points, np.array([1., 7.]))
 
-    def test_concatenate_with_iris_exception(self):
-        """Test a more generic case."""
+    def test_concatenate_with_overlap_between_points(self):
+        """Test overlapping cubes where a cube starts between time points."""
         time_coord_1 = DimCoord([1.5, 5., 7.],
                                 var_name='time',
                                 standard_name='time',
@@ -371,12 +370,32 @@ class TestConcatenate(unittest.TestCase):
                                 var_name='time',
                                 standard_name='time',
                                 units='days since 1950-01-01')
-        cube2 = Cube([33., 55., 77.],
+        cube2 = Cube([22., 44., 66.],
                      var_name='sample',
                      dim_coords_and_dims=((time_coord_2, 0), ))
-        cubes_single_ovlp = [cube2, cube1]
-        with self.assertRaises(ConcatenateError):
-            _io.concatenate(cubes_single_ovlp)
+        concatenated = _io.concatenate([cube2, cube1])
+        np.testing.assert_array_equal(
+            concatenated.coord('time').points, np.array([1., 1.5, 5., 7.]))
+        np.testing.assert_array_equal(concatenated.data,
+                                      np.array([22., 33., 55., 77.]))
+
+    def test_fail_overlap_without_common_points(self):
+        """Test fail of concatenation of interleaved time points."""
+        self._add_cube([3.5, 4.5], [3.5, 4.5])
+        with self.assertRaises(ValueError):
+            _io.concatenate(self.raw_cubes)
+
+    def test_concatenate_with_overlap_lazy(self):
+        """Test that overlapping lazy cubes are concatenated lazily."""
+        self._add_cube([6.5, 7.5], [6., 7.])
+        for cube in self.raw_cubes:
+            cube.data = cube.lazy_data()
+        concatenated = _io.concatenate(self.raw_cubes)
+        self.assertTrue(concatenated.has_lazy_data())
+        for cube in self.raw_cubes:
+            self.assertTrue(cube.has_lazy_data())
+        np.testing.assert_array_equal(concatenated.data,
+                                      np.array([1., 2., 3., 4., 5., 6.5, 7.5]))
 
     def test_concatenate_no_time_coords(self):
         """Test a more generic case."""
@@ -543,3 +562,30 @@ class TestConcatenate(unittest.TestCase):
         _io._fix_cube_attributes(self.raw_cubes)  # noqa
         for cube in self.raw_cubes:
             self.assertEqual(cube.attributes, resulting_attrs)
+
+
+@pytest.mark.parametrize('overlap', [0, 1])
+def test_concatenate_many_cubes(overlap):
+    """Benchmark concatenation of 500 small cubes."""
+    cubes = []
+    for i in range(500):
+        time = DimCoord(np.arange(12. + overlap) + 12 * i,
+                        var_name='time',
+                        standard_name='time',
+                        units='days since 1950-01-01')
+        cubes.append(
+            Cube(np.full(12 + overlap, i, dtype=np.float32).reshape(-1, 1),
+                 var_name='sample',
+                 dim_coords_and_dims=((time, 0), (DimCoord([0.], var_name='x'),
+                                                  1))))
+    cubes = [cube.copy(cube.lazy_data()) for cube in cubes[::-1]]
+
+    concatenated = _io.concatenate(cubes)
+
+    assert concatenated.has_lazy_data()
+    np.testing.assert_array_equal(concatenated.coord('time').points,
+                                  np.arange(6000. + overlap))
+    expected = np.repeat(np.arange(500), 12)
+    if overlap:
+        expected = np.append(expected, 499)
+    np.testing.assert_array_equal(concatenated.data[:, 0], expected)
@@ -4,13 +4,18 @@ import os
 import tempfile
 import unittest
 
+import dask
+import dask.array as da
 import iris
 import netCDF4
 import numpy as np
-from iris.coords import DimCoord
+import pytest
+from cf_units import Unit
+from iris.coords import AuxCoord, CellMethod, DimCoord
 from iris.cube import Cube, CubeList
 
 from esmvalcore.preprocessor import save
+from esmvalcore.preprocessor._io import GLOBAL_FILL_VALUE, _get_save_regions
 
 
 class TestSave(unittest.TestCase):
@@ -78,6 +83,40 @@ class TestSave(unittest.TestCase):
         self.assertEqual(sample_filters['complevel'], 4)
         handler.close()
 
+    def _create_lazy_sample_cube(self):
+        cube, filename = self._create_sample_cube()
+        os.remove(filename)
+        data = np.ma.masked_greater(cube.data, 0.5)
+        cube.data = da.from_array(data, chunks=(1, 2, 2))
+        return cube, filename
+
+    def test_save_max_memory(self):
+        """Test saving lazy data in regions."""
+        cube, filename = self._create_lazy_sample_cube()
+        expected = cube.copy().data
+        path = save([cube], filename, max_memory=1e-9)
+        self.assertTrue(cube.has_lazy_data())
+        loaded_cube = iris.load_cube(path)
+        self._compare_cubes(cube, loaded_cube)
+        np.testing.assert_array_equal(loaded_cube.data.mask, expected.mask)
+
+    def test_save_max_memory_zlib(self):
+        """Test saving compressed lazy data in regions."""
+        cube, filename = self._create_lazy_sample_cube()
+        path = save([cube], filename, compress=True, max_memory=1e-9)
+        loaded_cube = iris.load_cube(path)
+        self._compare_cubes(cube, loaded_cube)
+        self._check_chunks(path, [1, 2, 2])
+
+    def test_save_max_memory_optimized(self):
+        """Test saving lazy data in regions with custom chunking."""
+        cube, filename = self._create_lazy_sample_cube()
+        path = save([cube], filename, compress=True, max_memory=1e-9,
+                    optimize_access='timeseries')
+        loaded_cube = iris.load_cube(path)
+        self._compare_cubes(cube, loaded_cube)
+        self._check_chunks(path, [1, 1, 2])
+
     def test_fail_empty_cubes(self):
         """Test save fails if empty cubes is provided."""
         (_, filename) = self._create_sample_cube()
@@ -135,3 +174,174 @@ class TestSave(unittest.TestCase):
         for coord in cube.coords():
             self.assertTrue(
                 (coord.points == loaded_cube.coord(coord.name()).points).all())
+
+
+@pytest.mark.parametrize('chunks,max_length,regions', [
+    ((10, 10, 10), 25, (20, 10)),
+    ((10, 10, 10), 30, (30, )),
+    ((10, 10, 10), 10, (10, 10, 10)),
+    ((100, ), 30, (30, 30, 30, 10)),
+    ((5, 40, 5), 30, (5, 30, 15)),
+    ((0, ), 30, (0, )),
+])
+def test_get_save_regions(chunks, max_length, regions):
+    """Test the selection of regions to compute and save at once."""
+    data = da.zeros((sum(chunks), 3), chunks=(chunks, 3), dtype=np.float32)
+    assert _get_save_regions(data, max_length * 3 * 4) == regions
+
+
+def test_save_max_memory_shared_intermediate(tmp_path):
+    """Test that results shared between regions are computed only once."""
+    loaded = []
+
+    def _load(block, block_info=None):
+        loaded.append(block_info[None]['chunk-location'])
+        return block
+
+    data = da.arange(20 * 3, dtype=np.float32,
+                     chunks=15).reshape((20, 3)).rechunk((5, 3))
+    data = data.map_blocks(_load, dtype=data.dtype)
+    anomalies = data - data.mean(axis=0)
+    cube = Cube(anomalies, var_name='sample')
+    filename = str(tmp_path / 'sample.nc')
+
+    save([cube], filename, max_memory=5 * 3 * 4 * 4 / 2**30)
+
+    # Each chunk is loaded once for the mean and once for its own region
+    assert sorted(loaded) == [(i, 0) for i in range(4) for _ in range(2)]
+    expected = np.arange(60, dtype=np.float32).reshape((20, 3))
+    expected -= expected.mean(axis=0)
+    np.testing.assert_allclose(iris.load_cube(filename).data, expected)
+
+
+def test_save_max_memory_scalar_coord_bounds(tmp_path):
+    """Test saving lazy bounds of a scalar coordinate in regions."""
+    cube = Cube(da.arange(4., chunks=2), var_name='sample')
+    cube.add_aux_coord(
+        AuxCoord(1.5, bounds=da.from_array([[1., 2.]]), var_name='height'))
+    filename = str(tmp_path / 'sample.nc')
+
+    save([cube], filename, max_memory=1e-9)
+
+    loaded_cube = iris.load_cube(filename)
+    np.testing.assert_array_equal(loaded_cube.coord('height').bounds,
+                                  [[1., 2.]])
+    np.testing.assert_array_equal(loaded_cube.data, [0., 1., 2., 3.])
+
+
+def test_save_max_memory_warns_on_fill_value(tmp_path):
+    """Test the warning when lazy data contains the fill value."""
+    data = da.from_array(np.array([0., GLOBAL_FILL_VALUE]), chunks=1)
+    cube = Cube(data, var_name='sample')
+    filename = str(tmp_path / 'sample.nc')
+
+    with pytest.warns(UserWarning, match='equal to the fill-value'):
+        save([cube], filename, max_memory=1e-9)
+
+
+def test_save_without_max_memory_uses_iris(tmp_path, mocker):
+    """Test that files are written by iris if no memory limit is set."""
+    cube = Cube(da.arange(4., chunks=2), var_name='sample')
+    filename = str(tmp_path / 'sample.nc')
+    iris_save = mocker.spy(iris, 'save')
+
+    save([cube], filename)
+
+    iris_save.assert_called_once()
+    np.testing.assert_array_equal(iris.load_cube(filename).data,
+                                  [0., 1., 2., 3.])
+
+
+def test_fail_unknown_format(tmp_path):
+    """Test save fails if the output format is not supported."""
+    cube = Cube(np.zeros(2), var_name='sample')
+    with pytest.raises(ValueError, match="Unknown output format 'grib'"):
+        save([cube], str(tmp_path / 'sample.grib'), format='grib')
+
+
+def _create_zarr_sample_cube(lazy):
+    time = DimCoord([15.5, 45.],
+                    bounds=[[0., 31.], [31., 59.]],
+                    standard_name='time',
+                    var_name='time',
+                    units=Unit('days since 2000-01-01', calendar='noleap'))
+    lat = DimCoord([0., 10., 20.],
+                   bounds=[[-5., 5.], [5., 15.], [15., 25.]],
+                   standard_name='latitude',
+                   var_name='lat',
+                   units='degrees_north')
+    data = np.ma.masked_array(np.arange(6, dtype=np.float32).reshape(2, 3),
+                              mask=[[0, 1, 0], [0, 0, 0]])
+    if lazy:
+        data = da.from_array(data, chunks=(1, 3))
+    cube = Cube(data,
+                standard_name='air_temperature',
+                var_name='tas',
+                units='K',
+                dim_coords_and_dims=[(time, 0), (lat, 1)],
+                attributes={'source': 'model'})
+    cube.add_aux_coord(
+        AuxCoord(2., standard_name='height', var_name='height', units='m'))
+    cube.add_cell_method(CellMethod('mean', 'time'))
+    return cube
+
+
+@pytest.mark.parametrize('lazy', [True, False])
+def test_save_zarr(tmp_path, lazy):
+    """Test saving to a Zarr store keeps the CF metadata."""
+    xr = pytest.importorskip('xarray')
+    pytest.importorskip('zarr')
+    cube = _create_zarr_sample_cube(lazy)
+    filename = str(tmp_path / 'tas.zarr')
+
+    assert save([cube], filename, format='zarr', alias='alias') == filename
+
+    dataset = xr.open_zarr(filename, decode_cf=False)
+    assert dataset.attrs['source'] == 'model'
+    assert dataset.attrs['Conventions'] == 'CF-1.7'
+    variable = dataset['alias']
+    assert variable.attrs['standard_name'] == 'air_temperature'
+    assert variable.attrs['units'] == 'K'
+    assert variable.attrs['cell_methods'] == 'time: mean'
+    assert variable.attrs['coordinates'] == 'height'
+    assert variable.attrs['_FillValue'] == np.float32(GLOBAL_FILL_VALUE)
+    np.testing.assert_array_equal(
+        variable.values,
+        np.array([[0., GLOBAL_FILL_VALUE, 2.], [3., 4., 5.]], np.float32))
+    assert dataset['time'].attrs['units'] == 'days since 2000-01-01'
+    assert dataset['time'].attrs['calendar'] == '365_day'
+    assert dataset['time'].attrs['bounds'] == 'time_bnds'
+    np.testing.assert_array_equal(dataset['time_bnds'].values,
+                                  [[0., 31.], [31., 59.]])
+    assert dataset['lat'].dims == ('lat', )
+    assert float(dataset['height']) == 2.
+
+    dataset = xr.open_zarr(filename)
+    assert np.isnan(dataset['alias'].values[0, 1])
+
+
+@pytest.mark.parametrize('optimize_access,chunks', [
+    ('', (1, 1)),
+    ('latitude', (1, 3)),
+    ('timeseries', (2, 1)),
+])
+def test_save_zarr_chunks(tmp_path, optimize_access, chunks):
+    """Test the chunks of a Zarr store favour the reading scheme."""
+    zarr = pytest.importorskip('zarr')
+    cube = _create_zarr_sample_cube(lazy=True)
+    filename = str(tmp_path / 'tas.zarr')
+    with dask.config.set({'array.chunk-size': '4B'}):
+        save([cube], filename, format='zarr', optimize_access=optimize_access)
+    array = zarr.open_group(filename, mode='r')['tas']
+    assert array.chunks == chunks
+
+
+@pytest.mark.parametrize('compress', [True, False])
+def test_save_zarr_compress(tmp_path, compress):
+    """Test compression of Zarr stores."""
+    zarr = pytest.importorskip('zarr')
+    cube = _create_zarr_sample_cube(lazy=False)
+    filename = str(tmp_path / 'tas.zarr')
+    save([cube], filename, format='zarr', compress=compress)
+    array = zarr.open_group(filename, mode='r')['tas']
+    assert (array.compressor is not None) == compress
@@ -14,6 +14,7 @@ import iris.coords
 import iris.cube
 import numpy as np
 
+from esmvalcore._data_finder import set_file_index
 from esmvalcore.preprocessor import _regrid
 
 
@@ -35,7 +36,8 @@ class TestGetFileLevels(unittest.TestCase):
         """Remove the sample file for the test"""
         os.remove(self.path)
 
-    def test_get_coord(self):
+    def _get_reference_levels(self):
+        """Get the reference levels without applying fixes."""
         fix_file = unittest.mock.create_autospec(_regrid.fix_file)
         fix_file.side_effect = lambda file, **_: file
         fix_metadata = unittest.mock.create_autospec(_regrid.fix_metadata)
@@ -54,4 +56,20 @@ class TestGetFileLevels(unittest.TestCase):
                     frequency='mon',
                     fix_dir='output_dir',
                 )
+        return reference_levels, fix_file
+
+    def test_get_coord(self):
+        reference_levels, _ = self._get_reference_levels()
+        self.assertListEqual(reference_levels, [0., 1])
+
+    def test_get_coord_from_file_index(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            set_file_index(os.path.join(tmp_dir, 'index.sqlite'))
+            try:
+                reference_levels, fix_file = self._get_reference_levels()
+                fix_file.assert_called_once()
+                reference_levels, fix_file = self._get_reference_levels()
+                fix_file.assert_not_called()
+            finally:
+                set_file_index(None)
         self.assertListEqual(reference_levels, [0., 1])
@@ -20,7 +20,7 @@ from esmvalcore._recipe import (
     _get_derive_input_variables,
     read_recipe_file,
 )
-from esmvalcore._task import DiagnosticTask
+from esmvalcore._task import DiagnosticTask, MultiprocessingExecutor
 from esmvalcore.cmor.check import CheckLevels
 from esmvalcore.exceptions import InputFilesNotFound, RecipeError
 from esmvalcore.preprocessor import DEFAULT_ORDER, PreprocessingTask
@@ -90,6 +90,7 @@ DEFAULT_PREPROCESSOR_STEPS = (
     'concatenate',
     'clip_timerange',
     'fix_data',
+    'fix_dataset_metadata',
     'fix_file',
     'fix_metadata',
     'load',
@@ -156,6 +157,29 @@ def _get_default_settings_for_chl(fix_dir, save_filename, preprocessor):
             'units': 'kg m-3',
             'variable_group': 'chl',
         },
+        'fix_dataset_metadata': {
+            'alias': 'CanESM2',
+            'dataset': 'CanESM2',
+            'diagnostic': 'diagnostic_name',
+            'ensemble': 'r1i1p1',
+            'exp': 'historical',
+            'filename': fix_dir.replace('_fixed', '.nc'),
+            'frequency': 'yr',
+            'institute': ['CCCma'],
+            'long_name': 'Total Chlorophyll Mass Concentration',
+            'mip': 'Oyr',
+            'modeling_realm': ['ocnBgchem'],
+            'original_short_name': 'chl',
+            'preprocessor': preprocessor,
+            'product': ['output1', 'output2'],
+            'project': 'CMIP5',
+            'recipe_dataset_index': 0,
+            'short_name': 'chl',
+            'standard_name': standard_name,
+            'timerange': '2000/2005',
+            'units': 'kg m-3',
+            'variable_group': 'chl',
+        },
         'fix_data': {
             'check_level': CheckLevels.DEFAULT,
             'alias': 'CanESM2',
@@ -614,6 +638,28 @@ def test_default_fx_preprocessor(tmp_path, patched_datafinder, config_user):
             'units': '%',
             'variable_group': 'sftlf'
         },
+        'fix_dataset_metadata': {
+            'alias': 'CanESM2',
+            'dataset': 'CanESM2',
+            'diagnostic': 'diagnostic_name',
+            'ensemble': 'r0i0p0',
+            'exp': 'historical',
+            'filename': fix_dir.replace('_fixed', '.nc'),
+            'frequency': 'fx',
+            'institute': ['CCCma'],
+            'long_name': 'Land Area Fraction',
+            'mip': 'fx',
+            'modeling_realm': ['atmos'],
+            'original_short_name': 'sftlf',
+            'preprocessor': 'default',
+            'product': ['output1', 'output2'],
+            'project': 'CMIP5',
+            'recipe_dataset_index': 0,
+            'short_name': 'sftlf',
+            'standard_name': 'land_area_fraction',
+            'units': '%',
+            'variable_group': 'sftlf'
+        },
         'fix_data': {
             'check_level': CheckLevels.DEFAULT,
             'alias': 'CanESM2',
@@ -1359,7 +1405,7 @@ def test_derive_not_needed(tmp_path, patched_datafinder, config_user):
     assert 'derive' not in ancestor_product.settings
 
     # Check that fixes are applied just once
-    fixes = ('fix_file', 'fix_metadata', 'fix_data')
+    fixes = ('fix_file', 'fix_metadata', 'fix_dataset_metadata', 'fix_data')
     for fix in fixes:
         assert fix in ancestor_product.settings
         assert fix not in product.settings
@@ -2029,6 +2075,80 @@ def test_multi_model_statistics(tmp_path, patched_datafinder, config_user):
     assert next(iter(products)).provenance is not None
 
 
+@pytest.mark.parametrize('output_format,extension', [
+    ('netcdf', '.nc'),
+    ('zarr', '.zarr'),
+])
+def test_save_format(tmp_path, patched_datafinder, config_user,
+                     output_format, extension):
+    content = dedent(f"""
+        preprocessors:
+          default:
+            multi_model_statistics:
+              span: overlap
+              statistics: [mean]
+            save:
+              format: {output_format}
+
+        diagnostics:
+          diagnostic_name:
+            variables:
+              pr:
+                project: CMIP5
+                mip: Amon
+                exp: historical
+                ensemble: r1i1p1
+                start_year: 2000
+                end_year: 2002
+                preprocessor: default
+                additional_datasets:
+                  - {{dataset: CanESM2}}
+                  - {{dataset: CCSM4}}
+            scripts: null
+    """)
+
+    recipe = get_recipe(tmp_path, content, config_user)
+    task = next(iter(recipe.tasks))
+    products = set(task.products)
+    for product in task.products:
+        products.update(product.settings['multi_model_statistics']
+                        ['output_products'][''].values())
+    assert len(products) == 3
+    for product in products:
+        assert product.filename.endswith(extension)
+        assert product.settings['save']['format'] == output_format
+
+
+def test_save_unknown_format(tmp_path, patched_datafinder, config_user):
+    content = dedent("""
+        preprocessors:
+          default:
+            save:
+              format: grib
+
+        diagnostics:
+          diagnostic_name:
+            variables:
+              pr:
+                project: CMIP5
+                mip: Amon
+                exp: historical
+                ensemble: r1i1p1
+                start_year: 2000
+                end_year: 2002
+                preprocessor: default
+                additional_datasets:
+                  - {dataset: CanESM2}
+            scripts: null
+    """)
+
+    with pytest.raises(RecipeError) as exc:
+        get_recipe(tmp_path, content, config_user)
+    assert str(exc.value) == 'Could not create all tasks'
+    assert ("Unknown output format 'grib'"
+            in exc.value.failed_tasks[0].message)
+
+
 def test_multi_model_statistics_exclude(tmp_path,
                                         patched_datafinder,
                                         config_user):
@@ -3542,7 +3662,9 @@ def test_recipe_run(tmp_path, patched_datafinder, config_user, mocker):
     esmvalcore._recipe.esgf.download.assert_called_once_with(
         set(), config_user['download_dir'])
     recipe.tasks.run.assert_called_once_with(
-        max_parallel_tasks=config_user['max_parallel_tasks'])
+        max_parallel_tasks=config_user['max_parallel_tasks'],
+        max_memory=config_user['max_memory'],
+        executor=MultiprocessingExecutor)
     recipe.write_filled_recipe.assert_called_once()
 
 
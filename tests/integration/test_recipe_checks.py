@@ -318,6 +318,26 @@ def test_invalid_multi_model_keep_input():
         'Must be defined as a boolean. Got wrong.')
 
 
+def test_invalid_online():
+    with pytest.raises(RecipeError) as rec_err:
+        check._verify_online('wrong', ['mean'], 'ensemble_statistics')
+    assert str(rec_err.value) == (
+        'Invalid value encountered for `online`.'
+        'Must be defined as a boolean. Got wrong.')
+
+
+def test_online_unsupported_statistics():
+    msg = (r"Statistics \['median', 'p95'\] in preprocessor "
+           r"multi_model_statistics cannot be computed online. Valid values "
+           r"are \['max', .*\].")
+    with pytest.raises(RecipeError, match=msg):
+        check._verify_online(True, ['mean', 'median', 'p95'],
+                             'multi_model_statistics')
+    check._verify_online(False, ['mean', 'median', 'p95'],
+                         'multi_model_statistics')
+    check._verify_online(True, ['Mean', 'STD_DEV'], 'multi_model_statistics')
+
+
 def test_invalid_ensemble_statistics():
     msg = (r"Invalid value encountered for `statistic` in preprocessor "
            r"ensemble_statistics. Valid values are .* Got 'wrong'.")
@@ -8,12 +8,18 @@ import pytest
 
 import esmvalcore
 from esmvalcore._config import DIAGNOSTICS
+from esmvalcore._provenance import TrackedFile
 from esmvalcore._task import (
     BaseTask,
+    DaskExecutor,
     DiagnosticError,
     DiagnosticTask,
+    TaskExecutor,
+    TaskScheduler,
     TaskSet,
+    _copy_results,
     _py2ncl,
+    _run_task,
 )
 
 
@@ -80,6 +86,33 @@ def test_run_tasks(monkeypatch, tmp_path, max_parallel_tasks, example_tasks,
         assert task.output_files
 
 
+def test_run_tasks_dask(tmp_path, example_tasks):
+    """Check that tasks are run correctly on a Dask cluster."""
+    pytest.importorskip('distributed')
+    example_tasks.run(max_parallel_tasks=2, executor=DaskExecutor)
+
+    for task in example_tasks.flatten():
+        print(task.name, task.output_files)
+        assert task.output_files
+
+
+def test_run_tasks_dask_fail(tmp_path):
+    """Check that an error in a task on a Dask cluster is raised."""
+    pytest.importorskip('distributed')
+    tasks = TaskSet([MockBaseTask(name='task0'), MockBaseTask(name='task1')])
+    for task in tasks:
+        task._tmp_path = tmp_path / 'does_not_exist'
+
+    with pytest.raises(FileNotFoundError):
+        tasks.run(max_parallel_tasks=2, executor=DaskExecutor)
+
+
+def test_task_executor_is_abstract():
+    """Check that executors need to implement submitting tasks."""
+    with pytest.raises(TypeError):
+        TaskExecutor()
+
+
 @pytest.mark.parametrize('runner', [
     TaskSet._run_sequential,
     partial(TaskSet._run_parallel, max_parallel_tasks=1),
@@ -102,6 +135,135 @@ def test_runner_uses_priority(monkeypatch, runner, example_tasks):
     assert order == sorted(order)
 
 
+def test_task_scheduler(example_tasks):
+    """Check that tasks become ready as soon as their ancestors are done."""
+    scheduler = TaskScheduler(example_tasks.flatten())
+    assert scheduler.n_tasks == 12
+    assert scheduler.n_ready == 9
+
+    order = []
+    while scheduler.n_ready:
+        task = scheduler.pop_ready()
+        order.append(task)
+        scheduler.mark_done(task)
+
+    assert scheduler.n_remaining == 0
+    assert scheduler.n_done == 12
+    assert [t.priority for t in order] == sorted(t.priority for t in order)
+    for i, task in enumerate(order):
+        assert all(a in order[:i] for a in task.ancestors)
+    assert scheduler.statistics.n_tasks == 12
+    assert len(scheduler.statistics.queue_times) == 12
+
+
+class MemoryTask(MockBaseTask):
+
+    def estimate_memory(self):
+        return self._memory
+
+
+def test_task_scheduler_max_memory():
+    """Check that tasks are only started if they fit in the memory budget."""
+    tasks = []
+    for i, memory in enumerate([6, 3, 3, 12]):
+        task = MemoryTask(name=f'task{i}')
+        task.priority = i
+        task._memory = memory
+        tasks.append(task)
+
+    scheduler = TaskScheduler(tasks, max_memory=10)
+
+    assert scheduler.next_fits()
+    assert scheduler.pop_ready() is tasks[0]
+    assert scheduler.next_fits()
+    assert scheduler.pop_ready() is tasks[1]
+    assert scheduler.memory_in_use == 9
+    assert not scheduler.next_fits()
+
+    scheduler.mark_done(tasks[0])
+    assert scheduler.next_fits()
+    assert scheduler.pop_ready() is tasks[2]
+    assert not scheduler.next_fits()
+
+    # A task larger than the budget is started when nothing else is running
+    scheduler.mark_done(tasks[1])
+    scheduler.mark_done(tasks[2])
+    assert scheduler.memory_in_use == 0
+    assert scheduler.next_fits()
+    assert scheduler.pop_ready() is tasks[3]
+
+
+def test_run_tasks_max_memory(monkeypatch, tmp_path):
+    """Check that tasks are run correctly with a memory budget."""
+    monkeypatch.setattr(esmvalcore._task, 'Pool', ThreadPool)
+    tasks = TaskSet()
+    for i in range(4):
+        task = MemoryTask(name=f'task{i}')
+        task._tmp_path = tmp_path
+        task._memory = 2**30
+        tasks.add(task)
+
+    tasks.run(max_parallel_tasks=4, max_memory=1.5)
+
+    for task in tasks:
+        assert task.output_files
+
+
+def test_run_task_returns_compact_results(tmp_path):
+    """Check that only filenames and attributes of products are returned."""
+    task = MockBaseTask(name='task0')
+    task._tmp_path = tmp_path
+    ancestor = TrackedFile('in.nc', {'filename': 'in.nc'})
+    product = TrackedFile(str(tmp_path / 'out.nc'),
+                          {'filename': str(tmp_path / 'out.nc'), 'a': 1},
+                          ancestors=[ancestor],
+                          prov_filename='/moved/out.nc')
+    task.products.add(product)
+
+    result = _run_task(task)
+
+    assert result == (
+        [str(tmp_path / 'task0')],
+        [(product.filename, product.attributes, '/moved/out.nc')],
+    )
+
+    new_task = MockBaseTask(name='task0')
+    with ThreadPool(1) as pool:
+        future = pool.apply_async(lambda: result)
+        _copy_results(new_task, future)
+
+    assert new_task.output_files == [str(tmp_path / 'task0')]
+    assert new_task.get_product_attributes() == task.get_product_attributes()
+    new_product = new_task.products.pop()
+    assert new_product.prov_filename == '/moved/out.nc'
+    assert new_product.provenance is None
+
+
+class SyntheticTask(BaseTask):
+
+    def _run(self, input_files):
+        return [self.name]
+
+
+def test_scheduler_overhead_synthetic_tasks(monkeypatch):
+    """Benchmark the scheduling overhead per task on many synthetic tasks."""
+    monkeypatch.setattr(esmvalcore._task, 'Pool', ThreadPool)
+    tasks = TaskSet()
+    for i in range(100):
+        preproc = [SyntheticTask(name=f'diag{i}/var{j}') for j in range(20)]
+        tasks.add(SyntheticTask(name=f'diag{i}/script', ancestors=preproc))
+
+    tasks.run(max_parallel_tasks=8)
+
+    stats = tasks.statistics
+    print(stats)
+    assert stats.n_tasks == 2100
+    assert stats.throughput > 0
+    assert stats.overhead_per_task < 0.01
+    for task in tasks.flatten():
+        assert task.output_files == [task.name]
+
+
 def test_py2ncl():
     """Test for _py2ncl func."""
     ncl_text = _py2ncl(None, 'tas')
@@ -1002,6 +1002,28 @@ class TestCMORCheck(unittest.TestCase):
         self.cube.add_dim_coord(time.copy(points), dims)
         self._check_cube(frequency='mon')
 
+    def test_frequency_month_gap(self):
+        """Fail at metadata if a month is missing."""
+        self.cube = self.get_cube(self.var_info, frequency='mon')
+        time = self.cube.coord('time')
+        points = np.array(time.points)
+        points[1:] = points[1:] + 31
+        dims = self.cube.coord_dims(time)
+        self.cube.remove_coord(time)
+        self.cube.add_dim_coord(time.copy(points), dims)
+        self._check_fails_in_metadata(frequency='mon')
+
+    def test_frequency_month_360_day(self):
+        """Test checks succeeds for monthly data with a 360_day calendar."""
+        self.cube = self.get_cube(self.var_info, frequency='mon')
+        time = self.cube.coord('time')
+        time.units = Unit(time.units.origin, calendar='360_day')
+        time.points = 15. + 30. * np.arange(time.shape[0])
+        time.bounds = None
+        self._check_cube(automatic_fixes=True, frequency='mon')
+        np.testing.assert_array_equal(
+            time.bounds[:2], [[0., 30.], [30., 60.]])
+
     def test_check_pt_freq(self):
         """Test checks succeeds for a good Pt frequency."""
         self.var_info.frequency = 'dayPt'
@@ -1037,6 +1059,16 @@ class TestCMORCheck(unittest.TestCase):
         """Fail at metadata if frequency (3hr) not matches data frequency."""
         self._check_fails_in_metadata(frequency='3hr')
 
+    def test_bad_frequency_not_checked(self):
+        """Skip the frequency check if requested."""
+        checker = CMORCheck(
+            self.cube,
+            self.var_info,
+            frequency='mon',
+            check_frequency=False)
+        checker.check_metadata()
+        assert not checker.has_errors()
+
     def test_frequency_not_supported(self):
         """Fail at metadata if frequency is not supported."""
         self._check_fails_in_metadata(frequency='wrong_freq')
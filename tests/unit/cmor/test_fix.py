@@ -4,7 +4,13 @@ from unittest import TestCase
 from unittest.mock import Mock, patch
 
 from esmvalcore.cmor.check import CheckLevels
-from esmvalcore.cmor.fix import Fix, fix_data, fix_file, fix_metadata
+from esmvalcore.cmor.fix import (
+    Fix,
+    fix_data,
+    fix_dataset_metadata,
+    fix_file,
+    fix_metadata,
+)
 
 
 class TestFixFile(TestCase):
@@ -14,6 +20,7 @@ class TestFixFile(TestCase):
         self.filename = 'filename'
         self.mock_fix = Mock()
         self.mock_fix.fix_file.return_value = 'new_filename'
+        self.mock_fix.get_attribute_patches.return_value = {}
 
     def test_fix(self):
         """Check that the returned fix is applied."""
@@ -30,6 +37,35 @@ class TestFixFile(TestCase):
             self.assertNotEqual(file_returned, self.filename)
             self.assertEqual(file_returned, 'new_filename')
 
+    def test_attribute_patches(self):
+        """Check that attribute patches are returned with the file."""
+        self.mock_fix.fix_file.return_value = self.filename
+        self.mock_fix.get_attribute_patches.return_value = {
+            'tas': {'missing_value': 1e20},
+        }
+        other_fix = Mock()
+        other_fix.fix_file.side_effect = lambda file, _: file
+        other_fix.get_attribute_patches.return_value = {
+            'tas': {'units': 'K'},
+            'time': {'calendar': 'noleap'},
+        }
+        with patch('esmvalcore.cmor._fixes.fix.Fix.get_fixes',
+                   return_value=[self.mock_fix, other_fix]):
+            file_returned = fix_file(
+                file='filename',
+                short_name='short_name',
+                project='project',
+                dataset='model',
+                mip='mip',
+                output_dir='output_dir',
+            )
+        self.assertEqual(file_returned, self.filename)
+        self.assertEqual(
+            file_returned.patches, {
+                'tas': {'missing_value': 1e20, 'units': 'K'},
+                'time': {'calendar': 'noleap'},
+            })
+
     def test_nofix(self):
         """Check that the same file is returned if no fix is available."""
         with patch('esmvalcore.cmor._fixes.fix.Fix.get_fixes',
@@ -88,6 +124,7 @@ class TestFixMetadata(TestCase):
         self.intermediate_cube = self._create_mock_cube()
         self.fixed_cube = self._create_mock_cube()
         self.mock_fix = Mock()
+        self.mock_fix.per_dataset = False
         self.mock_fix.fix_metadata.return_value = [self.intermediate_cube]
         self.checker = Mock()
         self.check_metadata = self.checker.return_value.check_metadata
@@ -197,10 +234,73 @@ class TestFixMetadata(TestCase):
                     mip='mip',
                     short_name='short_name',
                     table='CMIP6',
-                    check_level=CheckLevels.DEFAULT,)
+                    check_level=CheckLevels.DEFAULT,
+                    check_frequency=False,
+                )
                 checker.assert_called_once_with(self.cube)
                 checker.return_value.check_metadata.assert_called_once_with()
 
+    def test_per_dataset_fix_skipped(self):
+        """Check that fixes declared per dataset are not applied."""
+        self.mock_fix.per_dataset = True
+        self.check_metadata.side_effect = lambda: self.cube
+        with patch('esmvalcore.cmor._fixes.fix.Fix.get_fixes',
+                   return_value=[self.mock_fix]):
+            with patch('esmvalcore.cmor.fix._get_cmor_checker',
+                       return_value=self.checker):
+                cube_returned = fix_metadata(
+                    cubes=[self.cube],
+                    short_name='short_name',
+                    project='project',
+                    dataset='model',
+                    mip='mip',
+                )[0]
+        self.mock_fix.fix_metadata.assert_not_called()
+        assert cube_returned is self.cube
+
+
+class TestFixDatasetMetadata(TestCase):
+    """Fix dataset metadata tests."""
+    def setUp(self):
+        """Prepare for testing."""
+        self.cube = Mock()
+        self.fixed_cube = Mock()
+        self.file_fix = Mock()
+        self.file_fix.per_dataset = False
+        self.dataset_fix = Mock()
+        self.dataset_fix.per_dataset = True
+        self.dataset_fix.fix_metadata.return_value = [self.fixed_cube]
+
+    def test_fix(self):
+        """Check that only fixes declared per dataset are applied."""
+        with patch('esmvalcore.cmor._fixes.fix.Fix.get_fixes',
+                   return_value=[self.file_fix, self.dataset_fix]):
+            cube_returned = fix_dataset_metadata(
+                self.cube,
+                short_name='short_name',
+                project='project',
+                dataset='model',
+                mip='mip',
+                frequency='mon',
+            )
+        self.file_fix.fix_metadata.assert_not_called()
+        self.dataset_fix.fix_metadata.assert_called_once_with([self.cube])
+        assert cube_returned is self.fixed_cube
+
+    def test_nofix(self):
+        """Check that the same cube is returned if no fix is available."""
+        with patch('esmvalcore.cmor._fixes.fix.Fix.get_fixes',
+                   return_value=[self.file_fix]):
+            cube_returned = fix_dataset_metadata(
+                self.cube,
+                short_name='short_name',
+                project='project',
+                dataset='model',
+                mip='mip',
+            )
+        self.file_fix.fix_metadata.assert_not_called()
+        assert cube_returned is self.cube
+
 
 class TestFixData(TestCase):
     """Fix data tests."""
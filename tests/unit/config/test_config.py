@@ -140,6 +140,7 @@ def test_load_default_config(monkeypatch):
         'auxiliary_data_dir': str(Path.home() / 'auxiliary_data'),
         'compress_netcdf': False,
         'config_developer_file': None,
+        'dask_scheduler_address': None,
         'config_file': str(default_cfg_file),
         'download_dir': str(Path.home() / 'climate_data'),
         'drs': {
@@ -149,13 +150,22 @@ def test_load_default_config(monkeypatch):
             'CORDEX': 'ESGF',
             'obs4MIPs': 'ESGF'
         },
+        'cmor_table_cache_dir': None,
         'exit_on_warning': False,
         'extra_facets_dir': tuple(),
+        'input_file_index': None,
         'log_level': 'info',
+        'max_memory': None,
         'max_parallel_tasks': None,
+        'max_save_memory': None,
         'offline': True,
         'output_file_type': 'png',
+        'preprocessor_cache_dir': None,
+        'preprocessor_cache_max_size': 100,
+        'profile_preprocessor': False,
         'profile_diagnostic': False,
+        'regridder_cache_dir': None,
+        'regridder_cache_max_size': 10,
         'remove_preproc_dir': True,
         'resume_from': [],
         'rootpath': {
@@ -163,6 +173,7 @@ def test_load_default_config(monkeypatch):
         },
         'run_diagnostic': True,
         'save_intermediary_cubes': False,
+        'task_executor': 'multiprocessing',
     }
     default_keys = set(
         list(default_cfg) + [
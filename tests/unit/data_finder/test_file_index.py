@@ -0,0 +1,164 @@
+"""Tests for :mod:`esmvalcore._file_index`."""
+import os
+
+import numpy as np
+import pytest
+
+import esmvalcore._data_finder
+import esmvalcore._file_index
+from esmvalcore._data_finder import (
+    _glob,
+    clear_scandir_cache,
+    get_file_metadata,
+    select_files,
+    set_file_index,
+)
+from esmvalcore._file_index import MTIME_RESOLUTION, FileIndex
+
+
+def _set_old_mtime(path):
+    """Make sure listings of `path` can be re-used."""
+    mtime_ns = os.stat(path).st_mtime_ns - 2 * MTIME_RESOLUTION
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    data = tmp_path / 'data'
+    (data / 'sub').mkdir(parents=True)
+    (data / 'a.nc').write_text('')
+    _set_old_mtime(data)
+    return data
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = FileIndex(tmp_path / 'index.sqlite')
+    yield index
+    index.close()
+
+
+def test_list_directories(tree, index):
+    dirname = str(tree)
+    missing = str(tree / 'missing')
+    expected = {'a.nc': False, 'sub': True}
+    assert index.list_directories([dirname, missing]) == {
+        dirname: expected,
+        missing: None,
+    }
+
+
+def test_list_directories_reused(tree, index, mocker):
+    dirname = str(tree)
+    index.list_directories([dirname])
+
+    mocker.patch.object(esmvalcore._file_index.os, 'scandir',
+                        side_effect=AssertionError)
+    assert index.list_directories([dirname]) == {
+        dirname: {'a.nc': False, 'sub': True},
+    }
+
+
+def test_list_directories_persistent(tmp_path, tree, index, mocker):
+    dirname = str(tree)
+    index.list_directories([dirname])
+    index.close()
+
+    mocker.patch.object(esmvalcore._file_index.os, 'scandir',
+                        side_effect=AssertionError)
+    new_index = FileIndex(tmp_path / 'index.sqlite')
+    assert new_index.list_directories([dirname]) == {
+        dirname: {'a.nc': False, 'sub': True},
+    }
+    new_index.close()
+
+
+def test_list_directories_modified(tree, index):
+    dirname = str(tree)
+    index.list_directories([dirname])
+    (tree / 'b.nc').write_text('')
+    assert index.list_directories([dirname]) == {
+        dirname: {'a.nc': False, 'b.nc': False, 'sub': True},
+    }
+
+
+def test_list_directories_recently_modified(tree, index, mocker):
+    """Listings made right after a modification are not trusted."""
+    dirname = str(tree)
+    os.utime(tree)
+    index.list_directories([dirname])
+
+    scandir = mocker.spy(esmvalcore._file_index.os, 'scandir')
+    index.list_directories([dirname])
+    scandir.assert_called_once_with(dirname)
+
+
+def test_corrupt_index(tmp_path):
+    filename = tmp_path / 'index.sqlite'
+    filename.write_bytes(b'not a database' * 100)
+    index = FileIndex(filename)
+    assert index.list_directories([str(tmp_path / 'missing')]) == {
+        str(tmp_path / 'missing'): None,
+    }
+    index.close()
+
+
+def test_get_metadata(tree, index, mocker):
+    filename = str(tree / 'a.nc')
+    function = mocker.Mock(return_value={'a': np.arange(3)})
+
+    for _ in range(2):
+        value = index.get_metadata(filename, 'key', function)
+        assert list(value) == ['a']
+        np.testing.assert_array_equal(value['a'], [0, 1, 2])
+    function.assert_called_once_with(filename)
+
+    index.get_metadata(filename, 'other key', function)
+    assert function.call_count == 2
+
+    (tree / 'a.nc').write_text('modified')
+    index.get_metadata(filename, 'key', function)
+    assert function.call_count == 3
+
+
+def test_get_metadata_missing_file(tree, index, mocker):
+    filename = str(tree / 'missing.nc')
+    function = mocker.Mock(return_value=1)
+    for _ in range(2):
+        assert index.get_metadata(filename, 'key', function) == 1
+    assert function.call_count == 2
+
+
+def test_reconnect_after_fork(tree, index, mocker):
+    dirname = str(tree)
+    connection = index._connection
+    mocker.patch.object(esmvalcore._file_index.os, 'getpid',
+                        return_value=-1)
+    assert index.list_directories([dirname]) == {
+        dirname: {'a.nc': False, 'sub': True},
+    }
+    assert index._connection is not connection
+    connection.close()
+
+
+def test_data_finder_uses_index(tmp_path, tree, mocker):
+    filename = str(tree /
+                   'tas_Amon_MODEL_historical_r1i1p1f1_185001-201412.nc')
+    with open(filename, 'w'):
+        pass
+    _set_old_mtime(tree)
+    set_file_index(str(tmp_path / 'index.sqlite'))
+    try:
+        clear_scandir_cache()
+        assert _glob(str(tree / 'tas_*.nc')) == [filename]
+        clear_scandir_cache()
+        mocker.patch.object(esmvalcore._file_index.os, 'scandir',
+                            side_effect=AssertionError)
+        assert _glob(str(tree / 'tas_*.nc')) == [filename]
+
+        assert select_files([filename], '1900/2000') == [filename]
+        assert get_file_metadata(filename, 'start_end_date',
+                                 None) == ('185001', '201412')
+    finally:
+        set_file_index(None)
+        clear_scandir_cache()
@@ -0,0 +1,90 @@
+"""Tests for the cached directory scanning in `esmvalcore._data_finder`."""
+import glob
+import os
+
+import pytest
+
+import esmvalcore._data_finder
+from esmvalcore._data_finder import (
+    _glob,
+    _scandir,
+    clear_scandir_cache,
+    find_files,
+)
+
+FILES = [
+    'CMIP6/CMIP/MODEL-1/historical/r1i1p1f1/Amon/tas/gn/v1/tas_1.nc',
+    'CMIP6/CMIP/MODEL-1/historical/r1i1p1f1/Amon/tas/gn/v2/tas_2.nc',
+    'CMIP6/CMIP/MODEL-1/historical/r1i1p1f1/Amon/pr/gn/v1/pr_1.nc',
+    'CMIP6/CMIP/MODEL-2/historical/r1i1p1f1/Amon/tas/gr/v1/tas_1.nc',
+    'CMIP6/CMIP/MODEL-2/historical/r2i1p1f1/Amon/tas/gr/v1/.tas_1.nc',
+    'CMIP6/ScenarioMIP/MODEL-2/ssp585/r1i1p1f1/Amon/tas/gr/v1/tas_3.nc',
+    'CMIP6/ScenarioMIP/MODEL-2/ssp585/r1i1p1f1/Amon/tas/gr/v1/tas_3.txt',
+]
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for filename in FILES:
+        path = tmp_path / filename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('')
+    clear_scandir_cache()
+    yield str(tmp_path)
+    clear_scandir_cache()
+
+
+@pytest.mark.parametrize('pattern', [
+    'CMIP6/*/MODEL-1/historical/r1i1p1f1/Amon/tas/*/*',
+    'CMIP6/*/*/*/*/Amon/tas/*/*/*.nc',
+    'CMIP6/*/*/*/*/Amon/tas/*/*/.*.nc',
+    'CMIP6/CMIP/MODEL-[12]/historical/r?i1p1f1/Amon/*',
+    'CMIP6/CMIP/MODEL-1/historical/r1i1p1f1/Amon/tas/gn/v1/tas_1.nc',
+    'CMIP6/CMIP/MODEL-1/historical/r1i1p1f1/Amon/tas/gn/v1/missing.nc',
+    'CMIP6/*/MODEL-3/*',
+    'CMIP6/*',
+    '*',
+])
+def test_glob(tree, pattern):
+    pattern = os.path.join(tree, pattern)
+    expected = sorted(glob.glob(pattern))
+    assert sorted(_glob(pattern)) == expected
+
+    expected_dirs = [p for p in expected if os.path.isdir(p)]
+    assert sorted(_glob(pattern, dirs_only=True)) == expected_dirs
+
+
+def test_glob_relative(tree, monkeypatch):
+    monkeypatch.chdir(tree)
+    pattern = 'CMIP6/*/MODEL-2/*'
+    assert sorted(_glob(pattern)) == sorted(glob.glob(pattern))
+
+
+def test_scandir_cached(tree, mocker):
+    dirname = os.path.join(tree, 'CMIP6')
+    assert _scandir(dirname) == {'CMIP': True, 'ScenarioMIP': True}
+
+    mocker.patch.object(esmvalcore._data_finder.os, 'scandir',
+                        side_effect=AssertionError)
+    assert _scandir(dirname) == {'CMIP': True, 'ScenarioMIP': True}
+
+    clear_scandir_cache()
+    with pytest.raises(AssertionError):
+        _scandir(dirname)
+
+
+def test_scandir_missing(tree):
+    assert _scandir(os.path.join(tree, 'missing')) is None
+
+
+def test_find_files(tree):
+    dirnames = _glob(
+        os.path.join(tree, 'CMIP6/*/*/*/r1i1p1f1/Amon/tas/*/v1'),
+        dirs_only=True,
+    )
+    result = find_files(dirnames, ['tas_*.nc'])
+    assert result == [
+        os.path.join(tree, FILES[0]),
+        os.path.join(tree, FILES[3]),
+        os.path.join(tree, FILES[5]),
+    ]
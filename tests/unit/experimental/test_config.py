@@ -21,6 +21,7 @@ from esmvalcore.experimental.config._config_validators import (
     validate_positive,
     validate_string,
     validate_string_or_none,
+    validate_task_executor,
 )
 from esmvalcore.experimental.config._validated_config import (
     InvalidConfigParameter, )
@@ -94,6 +95,17 @@ def generate_validator_testcases(valid):
              for _ in ('1, 2', [1.5, 2.5], [1, 2], (1, 2), np.array((1, 2)))),
             'fail': ((_, ValueError) for _ in ('fail', ('a', 1), (1, 2, 3)))
         },
+        {
+            'validator': validate_task_executor,
+            'success': (
+                ('multiprocessing', 'multiprocessing'),
+                ('dask', 'dask'),
+            ),
+            'fail': (
+                ('threads', ValueError),
+                (None, ValueError),
+            ),
+        },
         {
             'validator': validate_int_or_none,
             'success': ((None, None), ),
@@ -1,8 +1,22 @@
+import dask.array as da
+import numpy as np
+import pytest
+from cf_units import Unit
+from iris.coords import (
+    AncillaryVariable,
+    AuxCoord,
+    CellMeasure,
+    CellMethod,
+    DimCoord,
+)
+from iris.cube import Cube
+
 from esmvalcore.experimental.recipe_output import (
     DataFile,
     ImageFile,
     OutputFile,
 )
+from esmvalcore.preprocessor import save
 
 
 def test_output_file_create():
@@ -13,6 +27,9 @@ def test_output_file_create():
     data_file = OutputFile.create('some/data.nc')
     assert isinstance(data_file, DataFile)
 
+    zarr_file = OutputFile.create('some/data.zarr')
+    assert isinstance(zarr_file, DataFile)
+
 
 def test_output_file_locations():
     """Test methods for location output files."""
@@ -21,3 +38,66 @@ def test_output_file_locations():
     assert file.citation_file.name.endswith('_citation.bibtex')
     assert file.data_citation_file.name.endswith('_data_citation_info.txt')
     assert file.provenance_xml_file.name.endswith('_provenance.xml')
+
+
+@pytest.mark.parametrize('lazy', [True, False])
+def test_data_file_load_zarr(tmp_path, lazy):
+    """Test loading Zarr stores round-trips the saved cubes."""
+    pytest.importorskip('xarray')
+    pytest.importorskip('zarr')
+    time = DimCoord([15.5, 45.],
+                    bounds=[[0., 31.], [31., 59.]],
+                    standard_name='time',
+                    var_name='time',
+                    units=Unit('days since 2000-01-01', calendar='noleap'))
+    lat = DimCoord([0., 10., 20.],
+                   bounds=[[-5., 5.], [5., 15.], [15., 25.]],
+                   standard_name='latitude',
+                   var_name='lat',
+                   units='degrees_north',
+                   attributes={'comment': 'regular'})
+    data = np.ma.masked_array(np.arange(6, dtype=np.float32).reshape(2, 3),
+                              mask=[[0, 1, 0], [0, 0, 0]])
+    if lazy:
+        data = da.from_array(data, chunks=(1, 3))
+    cube = Cube(data,
+                standard_name='air_temperature',
+                long_name='Near-Surface Air Temperature',
+                var_name='tas',
+                units='K',
+                dim_coords_and_dims=[(time, 0), (lat, 1)],
+                attributes={'source': 'model'})
+    cube.add_aux_coord(
+        AuxCoord(2., standard_name='height', var_name='height', units='m'))
+    cube.add_cell_measure(
+        CellMeasure([1., 2., 3.],
+                    standard_name='cell_area',
+                    var_name='areacella',
+                    units='m2',
+                    measure='area'), 1)
+    cube.add_ancillary_variable(
+        AncillaryVariable([100., 100., 50.],
+                          standard_name='land_area_fraction',
+                          var_name='sftlf',
+                          units='%'), 1)
+    cube.add_cell_method(CellMethod('mean', 'time', intervals='1 month'))
+    expected = cube.copy()
+    filename = str(tmp_path / 'tas.zarr')
+    save([cube], filename, format='zarr')
+    data_file = OutputFile.create(filename)
+
+    dataset = data_file.load_xarray()
+    np.testing.assert_array_equal(dataset['tas'].values,
+                                  [[0., np.nan, 2.], [3., 4., 5.]])
+
+    cubes = data_file.load_iris()
+    assert len(cubes) == 1
+    loaded = cubes[0]
+    assert not loaded.has_lazy_data()
+    assert loaded.attributes.pop('Conventions') == 'CF-1.7'
+    assert loaded.coord('time').units.calendar == '365_day'
+    assert loaded == expected
+    assert loaded.coord('latitude').var_name == 'lat'
+    assert loaded.cell_measure('cell_area').var_name == 'areacella'
+    assert loaded.ancillary_variable('land_area_fraction').var_name == 'sftlf'
+    np.testing.assert_array_equal(loaded.data.mask, [[0, 1, 0], [0, 0, 0]])
@@ -35,15 +35,27 @@ def test_noop(tmp_path):
     assert resume_dirs == []
 
 
-def test_fail_on_different_recipe(tmp_path):
+def test_different_recipe(tmp_path):
     """Test `esmvalcore._main.parse_resume`.
 
-    Test that trying to resume a different recipe fails.
+    Test that a modified recipe can be resumed.
     """
     prev_run = create_previous_run(tmp_path, '20210924_123553')
 
     recipe = tmp_path / 'recipe_test.yml'
     recipe.write_text('something else')
 
-    with pytest.raises(ValueError):
-        parse_resume(str(prev_run), recipe)
+    resume_dirs = parse_resume(str(prev_run), recipe)
+    assert resume_dirs == [prev_run]
+
+
+def test_fail_on_missing_recipe(tmp_path):
+    """Test `esmvalcore._main.parse_resume`.
+
+    Test that trying to resume a directory without recipe fails.
+    """
+    recipe = tmp_path / 'recipe_test.yml'
+    recipe.write_text('test')
+
+    with pytest.raises(FileNotFoundError):
+        parse_resume(str(tmp_path / 'recipe_test_20210924_123553'), recipe)
@@ -1,7 +1,6 @@
 """Unit test for :func:`esmvalcore.preprocessor._multimodel`."""
 
 from datetime import datetime
-from unittest import mock
 
 import cftime
 import dask.array as da
@@ -178,81 +177,6 @@ VALIDATION_DATA_SUCCESS = (
 )
 
 
-@pytest.mark.parametrize(
-    'length,slices',
-    [
-        (1, [slice(0, 1)]),
-        (25000, [slice(0, 8334),
-                 slice(8334, 16668),
-                 slice(16668, 25000)]),
-    ],
-)
-def test_compute_slices(length, slices):
-    """Test cube `_compute_slices`."""
-    cubes = [
-        Cube(da.empty([length, 50, 100], dtype=np.float32)) for _ in range(5)
-    ]
-    result = list(mm._compute_slices(cubes))
-    assert result == slices
-
-
-def test_compute_slices_exceed_end_index():
-    """Test that ``_compute_slices`` terminates when exceeding end index."""
-    # The following settings will result in a cube length of 71, 10 slices and
-    # a slice length of 8. Thus, without early termination, the last slice
-    # would be slice(72, 71), which would result in an exception.
-    cube_data = mock.Mock(nbytes=1.1 * 2**30)  # roughly 1.1 GiB
-    cube = mock.Mock(spec=Cube, data=cube_data, shape=(71,))
-    cubes = [cube] * 9
-
-    slices = list(mm._compute_slices(cubes))
-
-    # Early termination lead to 9 (instead of 10) slices
-    assert len(slices) == 9
-    expected_slices = [
-        slice(0, 8, None),
-        slice(8, 16, None),
-        slice(16, 24, None),
-        slice(24, 32, None),
-        slice(32, 40, None),
-        slice(40, 48, None),
-        slice(48, 56, None),
-        slice(56, 64, None),
-        slice(64, 71, None),
-    ]
-    assert slices == expected_slices
-
-
-def test_compute_slices_equals_end_index():
-    """Test that ``_compute_slices`` terminates when reaching end index."""
-    # The following settings will result in a cube length of 36, 13 slices and
-    # a slice length of 3. Thus, without early termination, the last slice
-    # would be slice(36, 39), which would result in an exception.
-    cube_data = mock.Mock(nbytes=1.05 * 2**30)  # roughly 1.05 GiB
-    cube = mock.Mock(spec=Cube, data=cube_data, shape=(36,))
-    cubes = [cube] * 12
-
-    slices = list(mm._compute_slices(cubes))
-
-    # Early termination lead to 12 (instead of 13) slices
-    assert len(slices) == 12
-    expected_slices = [
-        slice(0, 3, None),
-        slice(3, 6, None),
-        slice(6, 9, None),
-        slice(9, 12, None),
-        slice(12, 15, None),
-        slice(15, 18, None),
-        slice(18, 21, None),
-        slice(21, 24, None),
-        slice(24, 27, None),
-        slice(27, 30, None),
-        slice(30, 33, None),
-        slice(33, 36, None),
-    ]
-    assert slices == expected_slices
-
-
 @pytest.mark.parametrize('frequency', FREQUENCY_OPTIONS)
 @pytest.mark.parametrize('span, statistics, expected', VALIDATION_DATA_SUCCESS)
 def test_multimodel_statistics(frequency, span, statistics, expected):
@@ -279,7 +203,184 @@ def test_multimodel_statistics(frequency, span, statistics, expected):
         assert_array_allclose(result_cube.data, expected_data)
 
 
-@pytest.mark.xfail(reason='Lazy data not (yet) supported.')
+@pytest.mark.parametrize('span, statistics, expected', VALIDATION_DATA_SUCCESS)
+def test_multimodel_statistics_lazy(span, statistics, expected):
+    """Test that lazy data in => lazy data out with the same results."""
+    cubes = get_cubes_for_validation_test('monthly')
+    for cube in cubes:
+        cube.data = cube.lazy_data()
+
+    if isinstance(statistics, str):
+        statistics = (statistics, )
+        expected = (expected, )
+
+    result = multi_model_statistics(cubes, span, statistics)
+
+    for i, statistic in enumerate(statistics):
+        result_cube = result[statistic]
+        assert result_cube.has_lazy_data()
+        assert result_cube.dtype == np.float32
+        assert_array_allclose(result_cube.data, np.ma.array(expected[i]))
+    for cube in cubes:
+        assert cube.has_lazy_data()
+
+
+def test_multimodel_statistics_lazy_chunks():
+    """Test that statistics are computed on blocks of the input data."""
+    cubes = [
+        generate_cube_from_dates('monthly', fill_val=val, lazy=True)
+        for val in (1, 2, 6)
+    ]
+    for cube in cubes:
+        cube.data = cube.lazy_data().rechunk(1)
+
+    result = multi_model_statistics(cubes, 'full', ['mean', 'median'])
+
+    for statistic, expected in (('mean', 3), ('median', 2)):
+        result_cube = result[statistic]
+        assert result_cube.lazy_data().chunks == cubes[0].lazy_data().chunks
+        np.testing.assert_allclose(result_cube.data, expected)
+
+
+def test_multimodel_statistics_single_pass():
+    """Test that all statistics are computed from one read of the data."""
+    blocks_read = []
+
+    def read(block):
+        blocks_read.append(block)
+        return block
+
+    cubes = [
+        generate_cube_from_dates('monthly', fill_val=val, lazy=True)
+        for val in (1, 2, 6)
+    ]
+    for cube in cubes:
+        cube.data = cube.lazy_data().map_blocks(read,
+                                                meta=np.array([], cube.dtype))
+    statistics = ['mean', 'std_dev', 'median', 'min', 'max', 'p5', 'p95']
+
+    result = multi_model_statistics(cubes, 'full', statistics)
+    data = da.compute(*[result[s].lazy_data() for s in statistics])
+
+    assert len(blocks_read) == len(cubes)
+    expected = [3, 2.6457512, 2, 1, 6, 1.1, 5.6]
+    for result_data, expected_data in zip(data, expected):
+        np.testing.assert_allclose(result_data, expected_data, rtol=1e-6)
+
+
+@pytest.mark.parametrize('statistic', ['median', 'p0', 'p5', 'p50', 'p99.9'])
+def test_compute_block_order_statistics(statistic):
+    """Test that order statistics are the same as computed by iris."""
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(5, 40))
+    mask = rng.random(size=data.shape) < 0.4
+    mask[:, 0] = True
+    mask[1:, 1] = True
+    block = np.ma.array(data, mask=mask)
+    operator, kwargs = mm._resolve_operator(statistic)
+
+    result = mm._compute_block(block, [(operator, kwargs)])
+
+    expected = operator.aggregate(block.T, axis=-1, **kwargs)
+    assert result.shape == (1, 40)
+    np.testing.assert_array_equal(result.mask[0], np.ma.getmaskarray(expected))
+    np.testing.assert_allclose(result[0].compressed(),
+                               expected.compressed().astype(np.float32),
+                               rtol=1e-6)
+
+
+VALIDATION_DATA_ONLINE = [
+    (span, statistics, expected)
+    for span, statistics, expected in VALIDATION_DATA_SUCCESS
+    if set(np.atleast_1d(statistics)) <= set(mm.ONLINE_STATISTICS)
+]
+
+
+@pytest.mark.parametrize('lazy', [True, False])
+@pytest.mark.parametrize('span, statistics, expected', VALIDATION_DATA_ONLINE)
+def test_multimodel_statistics_online(lazy, span, statistics, expected):
+    """Test that statistics computed online are the same."""
+    cubes = get_cubes_for_validation_test('monthly', lazy=lazy)
+
+    if isinstance(statistics, str):
+        statistics = (statistics, )
+        expected = (expected, )
+
+    result = multi_model_statistics(cubes, span, statistics, online=True)
+
+    for i, statistic in enumerate(statistics):
+        result_cube = result[statistic]
+        assert result_cube.has_lazy_data() is lazy
+        assert result_cube.dtype == np.float32
+        assert_array_allclose(result_cube.data, np.ma.array(expected[i]))
+
+
+def test_multimodel_statistics_online_masked():
+    """Test statistics computed online from masked data."""
+    rng = np.random.default_rng(0)
+    cubes = []
+    for i in range(5):
+        cube = generate_cube_from_dates('daily', len_data=20, lazy=True)
+        data = rng.normal(size=20).astype(np.float32)
+        mask = rng.random(size=20) < 0.4
+        mask[0] = True
+        mask[1] = i > 0
+        data[mask] = np.nan
+        cube.data = da.from_array(np.ma.array(data, mask=mask), chunks=7)
+        cubes.append(cube)
+    statistics = ['mean', 'std_dev', 'variance', 'min', 'max', 'sum', 'rms']
+
+    online = multi_model_statistics(cubes, 'full', statistics, online=True)
+    expected = multi_model_statistics(cubes, 'full', statistics)
+
+    for statistic in statistics:
+        assert_array_allclose(online[statistic].data,
+                              expected[statistic].data)
+        assert online[statistic].data.mask[0]
+
+
+def test_multimodel_statistics_online_single_block_at_a_time():
+    """Test that the data is read one block at a time.
+
+    The synchronous scheduler runs the tasks in the order chosen by dask.
+    """
+    blocks_read = []
+
+    def read(block, block_id=None):
+        blocks_read.append((block_id, block[0]))
+        return block
+
+    cubes = [
+        generate_cube_from_dates('monthly', fill_val=val, len_data=4)
+        for val in (1, 2, 6)
+    ]
+    for cube in cubes:
+        cube.data = da.from_array(cube.data, chunks=2).map_blocks(
+            read, meta=np.array([], cube.dtype))
+
+    result = multi_model_statistics(cubes, 'full', ['mean', 'max'],
+                                    online=True)
+    data = da.compute(result['mean'].lazy_data(),
+                      result['max'].lazy_data(),
+                      scheduler='synchronous')
+
+    assert [i for i, _ in blocks_read] == [(0, )] * 3 + [(1, )] * 3
+    for block_id in [(0, ), (1, )]:
+        values = [value for i, value in blocks_read if i == block_id]
+        assert sorted(values) == [1, 2, 6]
+    np.testing.assert_allclose(data[0], 3)
+    np.testing.assert_allclose(data[1], 6)
+
+
+def test_multimodel_statistics_online_unsupported():
+    """Test that order statistics cannot be computed online."""
+    cubes = get_cubes_for_validation_test('monthly')
+    msg = "Statistics median, p95 cannot be computed online"
+    with pytest.raises(ValueError, match=msg):
+        multi_model_statistics(cubes, 'full', ['mean', 'median', 'p95'],
+                               online=True)
+
+
 @pytest.mark.parametrize('span', SPAN_OPTIONS)
 def test_lazy_data_consistent_times(span):
     """Test laziness of multimodel statistics with consistent time axis."""
@@ -301,7 +402,6 @@ def test_lazy_data_consistent_times(span):
     assert result_cube.has_lazy_data()
 
 
-@pytest.mark.xfail(reason='Lazy data not (yet) supported.')
 @pytest.mark.parametrize('span', SPAN_OPTIONS)
 def test_lazy_data_inconsistent_times(span):
     """Test laziness of multimodel statistics with inconsistent time axis.
@@ -765,6 +865,62 @@ def test_ensemble_products():
     assert len(result) == 2
 
 
+def test_ensemble_products_online():
+    cube1 = generate_cube_from_dates('monthly', fill_val=1)
+    cube2 = generate_cube_from_dates('monthly', fill_val=9)
+    attributes = {'project': 'project', 'dataset': 'dataset', 'exp': 'exp'}
+    products = {
+        PreprocessorFile(cube1, attributes=dict(attributes, ensemble='1')),
+        PreprocessorFile(cube2, attributes=dict(attributes, ensemble='2')),
+    }
+    output = PreprocessorFile()
+    output_products = {'project_dataset_exp': {'mean': output}}
+
+    result = mm.ensemble_statistics(products, ['mean'],
+                                    output_products,
+                                    online=True)
+
+    assert result == {output}
+    assert_array_allclose(output.cubes[0].data, np.ma.array([5, 5, 5]))
+
+
+@pytest.mark.parametrize('members', [2, 5, 10])
+@pytest.mark.parametrize('lazy', [True, False])
+def test_ensemble_products_online_closes_inputs(monkeypatch, members, lazy):
+    """Test that each member is closed once it has been used."""
+    attributes = {'project': 'project', 'dataset': 'dataset', 'exp': 'exp'}
+    products = set()
+    for i in range(members):
+        cube = generate_cube_from_dates('monthly', fill_val=i)
+        if lazy:
+            cube.data = cube.lazy_data()
+        products.add(
+            PreprocessorFile(cube, attributes=dict(attributes,
+                                                   ensemble=str(i))))
+    output = PreprocessorFile()
+    output_products = {'project_dataset_exp': {'mean': output}}
+
+    open_products = []
+    update_accumulators = mm._update_accumulators
+
+    def _update_accumulators(accumulators, block):
+        if block.size:
+            open_products.append(
+                sum(product.cubes is not None for product in products))
+        return update_accumulators(accumulators, block)
+
+    monkeypatch.setattr(mm, '_update_accumulators', _update_accumulators)
+
+    mm.ensemble_statistics(products, ['mean'], output_products, online=True)
+
+    assert all(product.cubes is None for product in products)
+    if not lazy:
+        # Each member is added after closing the previous ones
+        assert open_products == list(range(members, 0, -1))
+    assert_array_allclose(output.cubes[0].data,
+                          np.ma.array([(members - 1) / 2] * 3))
+
+
 def test_ignore_tas_scalar_height_coord():
     """Ignore conflicting aux_coords for height in tas."""
     tas_2m = generate_cube_from_dates("monthly")
@@ -900,6 +1056,40 @@ def test_map_to_new_time_int_coords():
     assert np.issubdtype(out_cube.coord('decade').dtype, np.integer)
 
 
+def test_map_to_new_time_lazy():
+    """Test ``_map_to_new_time`` keeps lazy data lazy."""
+    cube = generate_cube_from_dates('daily', len_data=5, lazy=True)
+    cube.data = da.ma.masked_equal(da.arange(5, dtype=np.float32), 2)
+    cube = cube[[0, 2, 4]]
+    iris.coord_categorisation.add_day_of_year(cube, 'time')
+    target_points = np.arange(-1., 6.)
+
+    out_cube = mm._map_to_new_time(cube, target_points)
+
+    assert out_cube.has_lazy_data()
+    assert_array_allclose(out_cube.coord('time').points, target_points)
+    assert_array_allclose(
+        out_cube.data,
+        np.ma.masked_array([0, 0, 0, 2, 2, 4, 4],
+                           mask=[1, 0, 0, 1, 1, 0, 1]),
+    )
+    assert_array_allclose(
+        out_cube.coord('day_of_year').points,
+        np.ma.masked_array([1, 1, 1, 3, 3, 5, 5],
+                           mask=[1, 0, 0, 0, 0, 0, 1]),
+    )
+
+
+def test_unify_time_coordinates_nonexistent_dates():
+    """Test that dates that do not exist in the new calendar raise."""
+    dates = [cftime.Datetime360Day(1850, 2, day) for day in (28, 29, 30)]
+    cube1 = generate_cube_from_dates(dates, calendar='360_day')
+    cube2 = generate_cube_from_dates('daily')
+    msg = "cannot convert dates that do not exist in the standard calendar"
+    with pytest.raises(ValueError, match=msg):
+        mm._unify_time_coordinates([cube1, cube2])
+
+
 def test_preserve_equal_coordinates():
     """Test ``multi_model_statistics`` with equal input coordinates."""
     cubes = get_cube_for_equal_coords_test(5)
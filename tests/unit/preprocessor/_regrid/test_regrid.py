@@ -4,18 +4,22 @@ function."""
 import unittest
 from unittest import mock
 
+import dask.array as da
 import iris
 import numpy as np
 import pytest
 
+import esmvalcore.preprocessor._regrid_cache
 import tests
 from esmvalcore.preprocessor import regrid
 from esmvalcore.preprocessor._io import GLOBAL_FILL_VALUE
 from esmvalcore.preprocessor._regrid import (
     _CACHE,
     HORIZONTAL_SCHEMES,
+    _get_regridder,
     _horizontal_grid_is_close,
 )
+from esmvalcore.preprocessor._regrid_cache import RegridderCache
 
 
 class Test(tests.Test):
@@ -87,6 +91,12 @@ class Test(tests.Test):
         ):
             return self.tgt_grid
 
+        def _mock_get_regridder(src, tgt, scheme_key, scheme):
+            return lambda cube: cube.regrid(tgt, scheme)
+
+        self.patch('esmvalcore.preprocessor._regrid._get_regridder',
+                   side_effect=_mock_get_regridder)
+
         self.mock_stock = self.patch(
             'esmvalcore.preprocessor._regrid._global_stock_cube',
             side_effect=_return_mock_global_stock_cube)
@@ -283,5 +293,125 @@ def test_regrid_is_skipped_if_grids_are_the_same():
     assert expected_different_cube is not cube
 
 
+@pytest.fixture
+def regridder_cache(mocker):
+    """Use an empty cache of regridders."""
+    cache = RegridderCache()
+    mocker.patch.object(esmvalcore.preprocessor._regrid_cache,
+                        '_REGRIDDER_CACHE', cache)
+    return cache
+
+
+@pytest.mark.parametrize('scheme', ['linear', 'area_weighted'])
+def test_regrid_reuses_regridder(regridder_cache, mocker, scheme):
+    """Test that regridders are re-used for cubes on the same grid."""
+    cube = _make_cube(lat=LAT_SPEC1, lon=LON_SPEC1)
+    cube.data = np.arange(cube.data.size, dtype=float).reshape(cube.shape)
+    time = iris.coords.DimCoord([0., 1.], standard_name='time',
+                                units='days since 1850-01-01')
+    cube_3d = iris.cube.Cube(
+        np.stack([cube.data, cube.data + 1]),
+        dim_coords_and_dims=[
+            (time, 0),
+            (cube.coord('latitude'), 1),
+            (cube.coord('longitude'), 2),
+        ],
+    )
+
+    expected = regrid(cube, target_grid='5x5', scheme=scheme)
+    assert len(regridder_cache._regridders) == 1
+
+    build = mocker.spy(HORIZONTAL_SCHEMES[scheme], 'regridder')
+    result = regrid(cube_3d, target_grid='5x5', scheme=scheme)
+    build.assert_not_called()
+    assert result.shape == (2, ) + expected.shape
+    np.testing.assert_allclose(result[0].data, expected.data)
+    np.testing.assert_allclose(result[1].data, expected.data + 1)
+
+    regrid(cube, target_grid='2x2', scheme=scheme)
+    assert len(regridder_cache._regridders) == 2
+
+
+def test_regrid_reuses_stored_regridder(tmp_path, mocker):
+    """Test that regridders are stored between runs."""
+    cube = _make_cube(lat=LAT_SPEC1, lon=LON_SPEC1)
+    cube.data = np.arange(cube.data.size, dtype=float).reshape(cube.shape)
+    cache = RegridderCache(directory=tmp_path)
+    mocker.patch.object(esmvalcore.preprocessor._regrid_cache,
+                        '_REGRIDDER_CACHE', cache)
+    expected = regrid(cube, target_grid='5x5', scheme='area_weighted')
+    assert len(list(tmp_path.glob('*.pickle'))) == 1
+
+    cache.clear()
+    build = mocker.spy(HORIZONTAL_SCHEMES['area_weighted'], 'regridder')
+    result = regrid(cube, target_grid='5x5', scheme='area_weighted')
+    build.assert_not_called()
+    np.testing.assert_allclose(result.data, expected.data)
+
+
+def test_regrid_regridder_independent_of_mask(regridder_cache):
+    """Test that the iris schemes re-use regridders for all masks."""
+    cube = _make_cube(lat=LAT_SPEC1, lon=LON_SPEC1)
+    cube.data = np.ma.masked_array(np.ones(cube.shape))
+    scheme = {'reference': 'iris.analysis:Linear'}
+    regrid(cube, target_grid='5x5', scheme=dict(scheme))
+    cube.data[0, 0] = np.ma.masked
+    regrid(cube, target_grid='5x5', scheme=dict(scheme))
+    assert len(regridder_cache._regridders) == 1
+
+
+GENERIC_SCHEME_KEY = ('some.module:Scheme', [])
+
+
+def _get_generic_regridder(cube, mocker):
+    target_grid = _make_cube(lat=LAT_SPEC2, lon=LON_SPEC2)
+    scheme = mocker.Mock()
+    scheme.regridder.side_effect = lambda src, tgt: object()
+    return _get_regridder(cube, target_grid, GENERIC_SCHEME_KEY, scheme)
+
+
+def test_get_regridder_depends_on_fx_mask(regridder_cache, mocker):
+    """Test that generic schemes get a regridder per fx mask."""
+    cube = _make_cube(lat=LAT_SPEC1, lon=LON_SPEC1)
+    cube.data = da.ones(cube.shape)
+    fraction = np.ones(cube.shape)
+    sftof = iris.coords.AncillaryVariable(
+        da.ma.masked_equal(fraction, 0),
+        standard_name='sea_area_fraction',
+        units='%',
+    )
+    cube.add_ancillary_variable(sftof, (0, 1))
+
+    regridder = _get_generic_regridder(cube, mocker)
+    assert _get_generic_regridder(cube.copy(), mocker) is regridder
+    assert cube.has_lazy_data()
+
+    fraction[0, 0] = 0
+    sftof.data = da.ma.masked_equal(fraction, 0)
+    assert _get_generic_regridder(cube, mocker) is not regridder
+    assert len(regridder_cache._regridders) == 2
+
+
+def test_get_regridder_depends_on_realized_mask(regridder_cache, mocker):
+    """Test that generic schemes get a regridder per mask of real data."""
+    cube = _make_cube(lat=LAT_SPEC1, lon=LON_SPEC1)
+    cube.data = np.ma.masked_array(np.ones(cube.shape))
+    regridder = _get_generic_regridder(cube, mocker)
+    assert _get_generic_regridder(cube.copy(), mocker) is regridder
+    cube.data[0, 0] = np.ma.masked
+    assert _get_generic_regridder(cube, mocker) is not regridder
+    assert len(regridder_cache._regridders) == 2
+
+
+def test_get_regridder_unknown_mask(regridder_cache, mocker):
+    """Test that generic schemes do not compute data for the mask."""
+    cube = _make_cube(lat=LAT_SPEC1, lon=LON_SPEC1)
+    cube.data = da.ones(cube.shape)
+    regridder = _get_generic_regridder(cube, mocker)
+    assert _get_generic_regridder(cube, mocker) is not regridder
+    assert cube.has_lazy_data()
+    assert not regridder_cache._regridders
+
+
 if __name__ == '__main__':
     unittest.main()
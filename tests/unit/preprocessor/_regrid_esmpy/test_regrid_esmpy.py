@@ -9,6 +9,7 @@ import pytest
 from iris.exceptions import CoordinateNotFoundError
 
 import tests
+from esmvalcore.preprocessor._regrid_cache import RegridderCache
 from esmvalcore.preprocessor._regrid_esmpy import (
     build_regridder,
     build_regridder_2d,
@@ -639,6 +640,11 @@ class TestHelpers(tests.Test):
             aux_coords_and_dims=[],
         )
 
+    @mock.patch('esmvalcore.preprocessor._regrid_cache._REGRIDDER_CACHE',
+                RegridderCache())
+    @mock.patch(
+        'esmvalcore.preprocessor._regrid_esmpy.get_regridder_fingerprint',
+        mock.Mock(return_value='key'))
     @mock.patch('esmvalcore.preprocessor._regrid_esmpy.map_slices')
     @mock.patch('esmvalcore.preprocessor._regrid_esmpy.build_regridder')
     @mock.patch('esmvalcore.preprocessor._regrid_esmpy.get_grid_representants',
@@ -653,3 +659,8 @@ class TestHelpers(tests.Test):
         mock_map_slices.assert_called_once_with(self.cube_3d,
                                                 mock.sentinel.regridder,
                                                 self.cube_3d, self.cube)
+
+        # The regridder is re-used for cubes on the same grid
+        regrid(self.cube_3d, self.cube)
+        mock_build_regridder.assert_called_once()
+        self.assertEqual(mock_map_slices.call_count, 2)
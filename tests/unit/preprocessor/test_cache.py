@@ -0,0 +1,149 @@
+"""Unit tests for :mod:`esmvalcore.preprocessor._cache`."""
+import os
+
+import pytest
+
+from esmvalcore.preprocessor import DEFAULT_ORDER, PreprocessorFile
+from esmvalcore.preprocessor._cache import PreprocessorCache
+
+
+def _get_product(tmp_path, name, settings, input_files=('input.nc', )):
+    ancestors = []
+    for input_file in input_files:
+        path = tmp_path / 'input' / input_file
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b'input data')
+        ancestors.append(PreprocessorFile({'filename': str(path)}, {}))
+    return PreprocessorFile(
+        attributes={'filename': str(tmp_path / 'preproc' / name)},
+        settings=settings,
+        ancestors=ancestors,
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PreprocessorCache(tmp_path / 'cache', 1., tmp_path / 'preproc')
+
+
+def test_get_key_ignores_output_location(tmp_path, cache):
+    settings = {'extract_season': {'season': 'DJF'}}
+    product1 = _get_product(tmp_path / 'run1', 'a.nc', settings)
+    product2 = _get_product(tmp_path / 'run1', 'b.nc', settings)
+    assert product1.settings['save']['filename'] != product2.settings['save'][
+        'filename']
+
+    key1 = cache.get_key(product1, DEFAULT_ORDER)
+    key2 = cache.get_key(product2, DEFAULT_ORDER)
+    assert key1 == key2
+
+
+@pytest.mark.parametrize('other_settings,other_inputs', [
+    ({'extract_season': {'season': 'JJA'}}, ('input.nc', )),
+    ({'extract_season': {'season': 'DJF'}, 'annual_statistics': {}},
+     ('input.nc', )),
+    ({'extract_season': {'season': 'DJF'}}, ('other.nc', )),
+])
+def test_get_key_differs(tmp_path, cache, other_settings, other_inputs):
+    product1 = _get_product(tmp_path, 'a.nc',
+                            {'extract_season': {'season': 'DJF'}})
+    product2 = _get_product(tmp_path, 'a.nc', other_settings, other_inputs)
+
+    key1 = cache.get_key(product1, DEFAULT_ORDER)
+    key2 = cache.get_key(product2, DEFAULT_ORDER)
+    assert key1 != key2
+
+
+def test_get_key_input_modified(tmp_path, cache):
+    product = _get_product(tmp_path, 'a.nc', {})
+    key1 = cache.get_key(product, DEFAULT_ORDER)
+    input_file = product._input_files[0]
+    stat = os.stat(input_file)
+    os.utime(input_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    key2 = cache.get_key(product, DEFAULT_ORDER)
+    assert key1 != key2
+
+
+def test_store_restore(tmp_path, cache):
+    product = _get_product(tmp_path / 'run1', 'a.nc', {})
+    os.makedirs(os.path.dirname(product.filename))
+    with open(product.filename, 'wb') as file:
+        file.write(b'output data')
+    key = cache.get_key(product, DEFAULT_ORDER)
+
+    new_product = _get_product(tmp_path / 'run2', 'a.nc', {})
+    assert not cache.restore(new_product, key)
+
+    cache.store(product, key)
+    assert cache.restore(new_product, key)
+    with open(new_product.filename, 'rb') as file:
+        assert file.read() == b'output data'
+
+
+def test_restored_file_is_a_copy(tmp_path, cache):
+    product = _get_product(tmp_path / 'run1', 'a.nc', {})
+    os.makedirs(os.path.dirname(product.filename))
+    with open(product.filename, 'wb') as file:
+        file.write(b'output data')
+    key = cache.get_key(product, DEFAULT_ORDER)
+    cache.store(product, key)
+
+    new_product = _get_product(tmp_path / 'run2', 'a.nc', {})
+    assert cache.restore(new_product, key)
+    # Modify both files in place, like e.g. adding provenance does
+    for filename in (product.filename, new_product.filename):
+        with open(filename, 'r+b') as file:
+            file.write(b'new')
+
+    assert cache.restore(new_product, key)
+    with open(new_product.filename, 'rb') as file:
+        assert file.read() == b'output data'
+
+
+def test_evict(tmp_path):
+    cache = PreprocessorCache(tmp_path / 'cache', 25 / 2**30,
+                              tmp_path / 'preproc')
+    keys = []
+    for i in range(3):
+        product = _get_product(tmp_path / 'run1', f'{i}.nc', {}, [f'{i}.nc'])
+        os.makedirs(os.path.dirname(product.filename), exist_ok=True)
+        with open(product.filename, 'wb') as file:
+            file.write(b'0123456789')
+        key = cache.get_key(product, DEFAULT_ORDER)
+        if i == 2:
+            # Using the first file makes the second the least recently used
+            restored = _get_product(tmp_path / 'run2', '0.nc', {})
+            assert cache.restore(restored, keys[0])
+        cache.store(product, key)
+        if i < 2:
+            # Make sure the files have distinct modification times
+            os.utime(cache._get_path(key, product.filename), (i, i))
+        keys.append(key)
+
+    paths = [cache._get_path(key, 'x.nc') for key in keys]
+    assert paths[0].exists()
+    assert not paths[1].exists()
+    assert paths[2].exists()
+
+
+def test_store_restore_directory(tmp_path):
+    cache = PreprocessorCache(tmp_path / 'cache', 15 / 2**30,
+                              tmp_path / 'preproc')
+    keys = []
+    for name in ('a.zarr', 'b.zarr'):
+        product = _get_product(tmp_path / 'run1', name, {}, [f'{name}.nc'])
+        os.makedirs(os.path.join(product.filename, 'tas'))
+        for filename in ('.zattrs', os.path.join('tas', '0.0')):
+            with open(os.path.join(product.filename, filename), 'wb') as file:
+                file.write(b'01234')
+        key = cache.get_key(product, DEFAULT_ORDER)
+        cache.store(product, key)
+        keys.append(key)
+
+    # The first store was removed because both do not fit in the cache
+    assert not cache._get_path(keys[0], 'x.zarr').exists()
+    new_product = _get_product(tmp_path / 'run2', 'b.zarr', {})
+    assert cache.restore(new_product, keys[1])
+    with open(os.path.join(new_product.filename, 'tas', '0.0'), 'rb') as file:
+        assert file.read() == b'01234'
@@ -0,0 +1,60 @@
+"""Unit tests for :mod:`esmvalcore.preprocessor._profiler`."""
+import csv
+import json
+
+import numpy as np
+
+from esmvalcore.preprocessor._profiler import (
+    FIELDS,
+    PROFILE_DIR,
+    PreprocessorProfiler,
+    write_profile_report,
+)
+
+
+def test_profile():
+    profiler = PreprocessorProfiler('diagnostic/tas', interval=0.001)
+    with profiler.profile('CMIP6_MODEL_tas.nc', 'area_statistics'):
+        data = np.ones(2**24)
+        data.sum()
+        del data
+
+    assert len(profiler.records) == 1
+    record = profiler.records[0]
+    assert tuple(record) == FIELDS
+    assert record['task'] == 'diagnostic/tas'
+    assert record['product'] == 'CMIP6_MODEL_tas.nc'
+    assert record['step'] == 'area_statistics'
+    assert record['wall_time'] > 0
+    assert record['cpu_time'] >= 0
+    assert record['peak_memory_increase'] >= 0
+    assert record['disk_read'] >= 0
+    assert record['disk_write'] >= 0
+
+
+def test_write_profile_report(tmp_path):
+    for task_name, steps in (('diag/tas', ['load', 'regrid']),
+                             ('diag/pr', ['load'])):
+        profiler = PreprocessorProfiler(task_name)
+        for step in steps:
+            with profiler.profile('a file.nc', step):
+                pass
+        profiler.save(tmp_path / PROFILE_DIR / f"{task_name}.json")
+
+    records = write_profile_report(tmp_path)
+
+    assert len(records) == 3
+    with (tmp_path / 'preprocessor_profile.json').open() as file:
+        assert json.load(file) == records
+    with (tmp_path / 'preprocessor_profile.csv').open() as file:
+        rows = list(csv.DictReader(file))
+    assert [row['step'] for row in rows] == ['load', 'load', 'regrid']
+    folded = (tmp_path / 'preprocessor_profile.folded').read_text()
+    lines = folded.splitlines()
+    assert len(lines) == 3
+    assert lines[0].startswith('diag/pr;a_file.nc;load ')
+
+
+def test_write_profile_report_empty(tmp_path):
+    assert write_profile_report(tmp_path) == []
+    assert not (tmp_path / 'preprocessor_profile.csv').exists()
@@ -0,0 +1,112 @@
+"""Unit tests for :mod:`esmvalcore.preprocessor._regrid_cache`."""
+import os
+
+import iris
+import numpy as np
+import pytest
+
+from esmvalcore.preprocessor._regrid_cache import (
+    RegridderCache,
+    get_fingerprint,
+)
+
+
+def _make_coord(points, **kwargs):
+    coord = iris.coords.DimCoord(np.array(points, dtype=float),
+                                 standard_name='latitude', units='degrees',
+                                 **kwargs)
+    coord.guess_bounds()
+    return coord
+
+
+def _set_old_mtime(path, age):
+    mtime = os.stat(path).st_mtime - age
+    os.utime(path, (mtime, mtime))
+
+
+def test_get_fingerprint():
+    coord = _make_coord([0, 1, 2])
+    mask = np.array([True, False, False])
+    key = get_fingerprint('linear', coord, mask)
+    assert key == get_fingerprint('linear', coord.copy(), mask.copy())
+
+
+@pytest.mark.parametrize('other', [
+    ('nearest', _make_coord([0, 1, 2]), np.array([True, False, False])),
+    ('linear', _make_coord([0, 1, 3]), np.array([True, False, False])),
+    ('linear', _make_coord([0, 1, 2], var_name='lat'),
+     np.array([True, False, False])),
+    ('linear', _make_coord([0, 1, 2]), np.array([False, False, False])),
+])
+def test_get_fingerprint_differs(other):
+    key = get_fingerprint('linear', _make_coord([0, 1, 2]),
+                          np.array([True, False, False]))
+    assert key != get_fingerprint(*other)
+
+
+def test_get_reuses_regridder(mocker):
+    cache = RegridderCache()
+    build = mocker.Mock(return_value=mocker.sentinel.regridder)
+    for _ in range(2):
+        assert cache.get('key', build) is mocker.sentinel.regridder
+    build.assert_called_once_with()
+
+
+def test_get_evicts_least_recently_used(mocker):
+    cache = RegridderCache(max_entries=2)
+    build = mocker.Mock(side_effect=lambda: object())
+    regridder_a = cache.get('a', build)
+    cache.get('b', build)
+    assert cache.get('a', build) is regridder_a
+    cache.get('c', build)
+    assert build.call_count == 3
+
+    assert cache.get('a', build) is regridder_a
+    assert build.call_count == 3
+    cache.get('b', build)
+    assert build.call_count == 4
+
+
+def test_get_stored_regridder(tmp_path, mocker):
+    cache = RegridderCache(directory=tmp_path)
+    cache.get('key', lambda: {'weights': np.arange(3)})
+    assert (tmp_path / 'key.pickle').exists()
+
+    new_cache = RegridderCache(directory=tmp_path)
+    build = mocker.Mock()
+    regridder = new_cache.get('key', build)
+    build.assert_not_called()
+    np.testing.assert_array_equal(regridder['weights'], [0, 1, 2])
+
+
+def test_get_unpicklable_regridder(tmp_path):
+    cache = RegridderCache(directory=tmp_path)
+    regridder = cache.get('key', lambda: lambda cube: cube)
+    assert callable(regridder)
+    assert not list(tmp_path.iterdir())
+
+
+def test_get_corrupt_stored_regridder(tmp_path, mocker):
+    (tmp_path / 'key.pickle').write_bytes(b'not a pickle')
+    cache = RegridderCache(directory=tmp_path)
+    build = mocker.Mock(return_value=1)
+    assert cache.get('key', build) == 1
+    build.assert_called_once_with()
+    assert RegridderCache(directory=tmp_path).get('key', build) == 1
+    build.assert_called_once_with()
+
+
+def test_stored_regridders_are_evicted(tmp_path):
+    cache = RegridderCache(directory=tmp_path, max_size=1600 / 2**30)
+    for age, key in enumerate(['c', 'b', 'a']):
+        cache.get(key, lambda: b'x' * 500)
+        _set_old_mtime(tmp_path / f'{key}.pickle', 10 * (age + 1))
+
+    # Using a stored regridder marks it as recently used
+    RegridderCache(directory=tmp_path).get('a', lambda: None)
+    cache.get('d', lambda: b'x' * 500)
+    assert sorted(p.name for p in tmp_path.glob('*.pickle')) == [
+        'a.pickle',
+        'c.pickle',
+        'd.pickle',
+    ]
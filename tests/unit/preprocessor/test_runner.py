@@ -1,5 +1,12 @@
-from esmvalcore.preprocessor import (DEFAULT_ORDER, MULTI_MODEL_FUNCTIONS,
-                                     _get_itype)
+import dask.array as da
+import iris
+import numpy as np
+import pytest
+
+from esmvalcore.preprocessor import (DEFAULT_ORDER, LAZY_FUNCTIONS,
+                                     MULTI_MODEL_FUNCTIONS, NON_LAZY_OPERATORS,
+                                     PreprocessorFile, _get_itype,
+                                     keeps_data_lazy)
 
 
 def test_first_argument_name():
@@ -15,3 +22,68 @@ def test_first_argument_name():
 
 def test_multi_model_exist():
     assert MULTI_MODEL_FUNCTIONS.issubset(set(DEFAULT_ORDER))
+
+
+def test_lazy_exist():
+    assert LAZY_FUNCTIONS.issubset(set(DEFAULT_ORDER))
+    assert not LAZY_FUNCTIONS & MULTI_MODEL_FUNCTIONS
+    assert set(NON_LAZY_OPERATORS).issubset(LAZY_FUNCTIONS)
+
+
+@pytest.mark.parametrize('step,settings,expected', [
+    ('extract_region', {}, True),
+    ('extract_levels', {}, False),
+    ('climate_statistics', {}, True),
+    ('climate_statistics', {'operator': 'std_dev'}, True),
+    ('climate_statistics', {'operator': 'median'}, False),
+    ('area_statistics', {'operator': 'RMS'}, False),
+    ('zonal_statistics', {'operator': 'rms'}, True),
+    ('regrid', {'scheme': 'linear'}, False),
+    ('regrid', {'scheme': 'unstructured_nearest'}, False),
+    ('regrid', {'scheme': 'linear_extrapolate'}, True),
+    ('regrid', {'scheme': {'reference': 'iris.analysis:Linear'}}, True),
+    ('regrid', {'scheme': {'reference': 'esmf_regrid.schemes:'
+                                        'ESMFAreaWeighted'}}, False),
+    ('mask_landsea', {'mask_out': 'sea'}, False),
+])
+def test_keeps_data_lazy(step, settings, expected):
+    assert keeps_data_lazy(step, {step: settings}) is expected
+
+
+@pytest.mark.parametrize('fx_variables,always_use_ne_mask,expected', [
+    ({'sftlf': {}}, False, True),
+    ({'sftof': {}}, False, True),
+    ({'sftgif': {}}, False, False),
+    ({'sftlf': {}}, True, False),
+])
+def test_keeps_data_lazy_mask_landsea(fx_variables, always_use_ne_mask,
+                                      expected):
+    settings = {
+        'add_fx_variables': {'fx_variables': fx_variables},
+        'mask_landsea': {
+            'mask_out': 'sea',
+            'always_use_ne_mask': always_use_ne_mask,
+        },
+    }
+    assert keeps_data_lazy('mask_landsea', settings) is expected
+
+
+def test_keeps_data_lazy_product():
+    cube = iris.cube.Cube(da.arange(4, dtype=np.float32), var_name='tas',
+                          units='K')
+    product = PreprocessorFile(
+        attributes={'filename': '/out/tas.nc'},
+        settings={
+            'mask_above_threshold': {'threshold': 2.},
+            'convert_units': {'units': 'degC'},
+        },
+    )
+    product.cubes = iris.cube.CubeList([cube])
+    assert product.keeps_data_lazy()
+
+    for step in ['mask_above_threshold', 'convert_units']:
+        product.apply(step)
+
+    result = product.cubes[0]
+    assert result.has_lazy_data()
+    np.testing.assert_allclose(result.data.mask, [False, False, False, True])
@@ -46,3 +46,19 @@ def test_copy_provenance(tracked_file):
     assert copied_file.entity == tracked_file.entity
     assert copied_file.provenance == tracked_file.provenance
     assert copied_file.provenance is not tracked_file.provenance
+
+
+def test_include_provenance_zarr(tmp_path):
+    """Test including provenance in the attributes of a Zarr store."""
+    zarr = pytest.importorskip('zarr')
+    filename = str(tmp_path / 'file.zarr')
+    zarr.open_group(filename, mode='w').attrs['a'] = 'A'
+    zarr.consolidate_metadata(filename)
+
+    tracked_file = TrackedFile(filename, attributes={'caption': 'text'})
+    tracked_file._include_provenance()
+
+    attributes = zarr.open_consolidated(filename, mode='r').attrs
+    assert attributes['a'] == 'A'
+    assert attributes['caption'] == 'text'
+    assert attributes['software'].startswith('Created with ESMValTool')
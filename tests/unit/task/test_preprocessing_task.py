@@ -0,0 +1,183 @@
+"""Unit tests for :class:`esmvalcore.preprocessor.PreprocessingTask`."""
+import dask.array as da
+import numpy as np
+import pytest
+from iris.cube import Cube
+
+import esmvalcore.preprocessor
+from esmvalcore._provenance import TrackedFile
+from esmvalcore.preprocessor import (
+    PROCESS_MEMORY,
+    PreprocessingTask,
+    PreprocessorFile,
+    _close_together,
+)
+
+
+def _get_product(filename, input_files, settings):
+    ancestors = [
+        PreprocessorFile({'filename': f}, {}) for f in input_files
+    ]
+    return PreprocessorFile(
+        attributes={'filename': filename, 'short_name': 'tas'},
+        settings=settings,
+        ancestors=ancestors,
+    )
+
+
+@pytest.fixture
+def data_sizes(monkeypatch):
+    sizes = {'a1.nc': 100, 'a2.nc': 200, 'b1.nc': 1000}
+
+    def _get_data_size(filename, short_name):
+        assert short_name == 'tas'
+        return sizes[filename]
+
+    monkeypatch.setattr(esmvalcore.preprocessor, '_get_data_size',
+                        _get_data_size)
+
+
+@pytest.mark.parametrize('settings,expected', [
+    ({}, 2 * 1000),
+    ({'extract_levels': {}}, 3 * 1000),
+    ({'multi_model_statistics': {}}, 2 * 1300),
+])
+def test_estimate_memory(data_sizes, settings, expected):
+    products = [
+        _get_product('a.nc', ['a1.nc', 'a2.nc'], settings),
+        _get_product('b.nc', ['b1.nc'], settings),
+    ]
+    task = PreprocessingTask(products)
+
+    assert task.estimate_memory() == PROCESS_MEMORY + expected
+
+
+@pytest.mark.parametrize('operator,expected', [
+    ('mean', 2 * 500),
+    ('median', 2 * 1000),
+])
+def test_estimate_memory_lazy(data_sizes, monkeypatch, operator, expected):
+    monkeypatch.setattr(esmvalcore.preprocessor, 'STREAMING_MEMORY', 500)
+    settings = {'climate_statistics': {'operator': operator}}
+    products = [
+        _get_product('a.nc', ['a1.nc', 'a2.nc'], settings),
+        _get_product('b.nc', ['b1.nc'], settings),
+    ]
+    task = PreprocessingTask(products)
+
+    assert task.estimate_memory() == PROCESS_MEMORY + expected
+
+
+def test_get_fingerprint(tmp_path):
+    settings = {'extract_season': {'season': 'DJF'}}
+    task1 = PreprocessingTask(
+        [_get_product(str(tmp_path / 'run1' / 'a.nc'), ['a1.nc'], settings)])
+    task2 = PreprocessingTask(
+        [_get_product(str(tmp_path / 'run2' / 'a.nc'), ['a1.nc'], settings)])
+    assert task1.get_fingerprint() == task2.get_fingerprint()
+
+    settings = {'extract_season': {'season': 'JJA'}}
+    task3 = PreprocessingTask(
+        [_get_product(str(tmp_path / 'run1' / 'a.nc'), ['a1.nc'], settings)])
+    assert task1.get_fingerprint() != task3.get_fingerprint()
+
+    task4 = PreprocessingTask(
+        [_get_product(str(tmp_path / 'run1' / 'a.nc'), ['a2.nc'], {})])
+    assert task1.get_fingerprint() != task4.get_fingerprint()
+
+
+def test_get_fingerprint_input_modified(tmp_path):
+    input_file = tmp_path / 'a1.nc'
+    input_file.write_bytes(b'data')
+    product = PreprocessorFile(
+        attributes={'filename': str(tmp_path / 'a.nc')},
+        settings={},
+        ancestors=[TrackedFile(str(input_file), {})],
+    )
+    task = PreprocessingTask([product])
+    fingerprint = task.get_fingerprint()
+    assert task.get_fingerprint() == fingerprint
+
+    input_file.write_bytes(b'modified data')
+    assert task.get_fingerprint() != fingerprint
+
+
+def test_get_fingerprint_upstream_products(tmp_path):
+    def _get_task(run_dir, season):
+        upstream = _get_product(str(run_dir / 'derive_input' / 'a.nc'),
+                                ['a1.nc'],
+                                {'extract_season': {'season': season}})
+        product = PreprocessorFile(
+            attributes={'filename': str(run_dir / 'a.nc')},
+            settings={},
+            ancestors=[upstream],
+        )
+        return PreprocessingTask([product])
+
+    fingerprint = _get_task(tmp_path / 'run1', 'DJF').get_fingerprint()
+    assert _get_task(tmp_path / 'run2', 'DJF').get_fingerprint() == fingerprint
+    assert _get_task(tmp_path / 'run2', 'JJA').get_fingerprint() != fingerprint
+
+
+def test_restore_from_cache_includes_provenance(tmp_path, mocker):
+    product = _get_product(str(tmp_path / 'a.nc'), ['a1.nc'], {})
+    mocker.patch.object(product, 'save_provenance', autospec=True)
+    cache = mocker.Mock()
+    cache.restore.return_value = True
+    task = PreprocessingTask([product], cache=cache)
+
+    keys, restored = task._restore_from_cache(set())
+
+    assert keys == {product: cache.get_key.return_value}
+    assert restored == {product}
+    product.save_provenance.assert_called_once_with()
+
+
+def test_run_writes_fingerprints(tmp_path, mocker):
+    product = _get_product(str(tmp_path / 'a.nc'), ['a1.nc'], {})
+    task = PreprocessingTask([product])
+    task.recipe_fingerprint = 'recipe'
+    mocker.patch.object(task, '_initialize_product_provenance')
+    mocker.patch.object(esmvalcore.preprocessor,
+                        'write_metadata',
+                        return_value=[str(tmp_path / 'metadata.yml')])
+
+    task._run(None)
+
+    fingerprint_file = tmp_path / esmvalcore.preprocessor.FINGERPRINT_FILE
+    assert fingerprint_file.read_text().splitlines() == [
+        'recipe', task.get_fingerprint()]
+
+
+# The memory limit allows for regions of one chunk of both files, without a
+# limit the files are written by iris one after the other.
+@pytest.mark.parametrize('max_memory,reads', [
+    (None, 4),
+    (2 * 2 * 8 * 4 / 2**30, 2),
+])
+def test_close_together(tmp_path, mocker, max_memory, reads):
+    blocks_read = []
+
+    def read(block):
+        blocks_read.append(block)
+        return block
+
+    data = da.arange(4., chunks=2).map_blocks(read, meta=np.array([]))
+    settings = {'save': {'max_memory': max_memory}}
+    products = [
+        _get_product(str(tmp_path / 'plus.nc'), [], settings),
+        _get_product(str(tmp_path / 'times.nc'), [], settings),
+    ]
+    products[0].cubes = [Cube(data + 1, var_name='tas')]
+    products[1].cubes = [Cube(data * 2, var_name='tas')]
+    for product in products:
+        mocker.patch.object(product, 'save_provenance', autospec=True)
+
+    _close_together(products)
+
+    assert len(blocks_read) == reads
+    for product in products:
+        assert product.is_closed
+        product.save_provenance.assert_called_once_with()
+    np.testing.assert_array_equal(products[0].cubes[0].data, [1, 2, 3, 4])
+    np.testing.assert_array_equal(products[1].cubes[0].data, [0, 2, 4, 6])
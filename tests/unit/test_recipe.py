@@ -1,4 +1,5 @@
 from collections import defaultdict
+from copy import deepcopy
 from unittest import mock
 
 import iris
@@ -9,7 +10,7 @@ import pytest
 import esmvalcore.experimental.recipe_output
 from esmvalcore import _recipe
 from esmvalcore.esgf._download import ESGFFile
-from esmvalcore.exceptions import RecipeError
+from esmvalcore.exceptions import InputFilesNotFound, RecipeError
 from tests import PreprocessorFile
 
 
@@ -145,18 +146,37 @@ def test_allow_skipping(ancestors, var, cfg, out):
     assert result is out
 
 
-def test_resume_preprocessor_tasks(mocker, tmp_path):
-    """Test that `Recipe._create_preprocessor_tasks` creates a ResumeTask."""
+def _create_resume_test_setup(mocker,
+                              tmp_path,
+                              prev_fingerprint,
+                              prev_recipe='recipe',
+                              prev_recipe_fingerprint=None):
+    """Create a mock recipe and the output of a previous run."""
     # Create a mock ResumeTask class that returns a mock instance
     resume_task_cls = mocker.patch.object(_recipe, 'ResumeTask', autospec=True)
     resume_task = mocker.Mock()
     resume_task_cls.return_value = resume_task
 
+    # Create a very simplified list of datasets
+    diagnostic = {'preprocessor_output': {'tas': [{'short_name': 'tas'}]}}
+    recipe_fingerprint = _recipe._get_recipe_fingerprint(
+        diagnostic['preprocessor_output']['tas'], {})
+
     # Create a mock output directory of a previous run
     diagnostic_name = 'diagnostic_name'
     prev_output = tmp_path / 'recipe_test_20200101_000000'
     prev_preproc_dir = prev_output / 'preproc' / diagnostic_name / 'tas'
     prev_preproc_dir.mkdir(parents=True)
+    (prev_preproc_dir / 'metadata.yml').write_text('{}')
+    if prev_fingerprint is not None:
+        if prev_recipe_fingerprint is None:
+            prev_recipe_fingerprint = recipe_fingerprint
+        (prev_preproc_dir / _recipe.FINGERPRINT_FILE).write_text(
+            f'{prev_recipe_fingerprint}\n{prev_fingerprint}\n')
+    (prev_output / 'run').mkdir()
+    (prev_output / 'run' / 'recipe_test.yml').write_text(prev_recipe)
+    recipe_file = tmp_path / 'recipe_test.yml'
+    recipe_file.write_text('recipe')
 
     # Create a mock recipe
     recipe = mocker.create_autospec(_recipe.Recipe, instance=True)
@@ -164,16 +184,124 @@ def test_resume_preprocessor_tasks(mocker, tmp_path):
         'resume_from': [str(prev_output)],
         'preproc_dir': '/path/to/recipe_test_20210101_000000/preproc',
     }
+    recipe._preprocessors = {}
+    recipe._recipe_file = str(recipe_file)
 
-    # Create a very simplified list of datasets
-    diagnostic = {'preprocessor_output': {'tas': [{'short_name': 'tas'}]}}
+    return recipe, diagnostic, resume_task
+
+
+@pytest.mark.parametrize('prev_fingerprint,prev_recipe,resumed', [
+    ('abc', 'recipe', True),
+    ('abc', 'other recipe', True),
+    ('def', 'recipe', False),
+    (None, 'recipe', True),
+    (None, 'other recipe', False),
+])
+def test_resume_preprocessor_tasks(mocker, tmp_path, prev_fingerprint,
+                                   prev_recipe, resumed):
+    """Test that `Recipe._create_preprocessor_tasks` creates a ResumeTask."""
+    recipe, diagnostic, resume_task = _create_resume_test_setup(
+        mocker, tmp_path, prev_fingerprint, prev_recipe)
+
+    task = mocker.Mock()
+    task.get_fingerprint.return_value = 'abc'
+    mocker.patch.object(_recipe, '_get_preprocessor_task', return_value=task)
 
     # Create tasks
     tasks, failed = _recipe.Recipe._create_preprocessor_tasks(
-        recipe, diagnostic_name, diagnostic, [], True)
+        recipe, 'diagnostic_name', diagnostic, [], True)
 
-    assert tasks == [resume_task]
+    assert tasks == [resume_task if resumed else task]
     assert not failed
+    assert task.recipe_fingerprint == _recipe._get_recipe_fingerprint(
+        diagnostic['preprocessor_output']['tas'], {})
+
+
+@pytest.mark.parametrize(
+    'prev_fingerprint,prev_recipe,prev_recipe_fingerprint,resumed', [
+        ('abc', 'other recipe', None, True),
+        ('abc', 'recipe', 'def', False),
+        (None, 'recipe', None, True),
+        (None, 'other recipe', None, False),
+    ])
+def test_resume_preprocessor_tasks_without_data(mocker, tmp_path,
+                                                prev_fingerprint, prev_recipe,
+                                                prev_recipe_fingerprint,
+                                                resumed):
+    """Test that previous output of unchanged recipe entries is used."""
+    recipe, diagnostic, resume_task = _create_resume_test_setup(
+        mocker, tmp_path, prev_fingerprint, prev_recipe,
+        prev_recipe_fingerprint)
+
+    error = InputFilesNotFound('No input files found')
+    mocker.patch.object(_recipe, '_get_preprocessor_task', side_effect=error)
+
+    # Create tasks
+    tasks, failed = _recipe.Recipe._create_preprocessor_tasks(
+        recipe, 'diagnostic_name', diagnostic, [], True)
+
+    if resumed:
+        assert tasks == [resume_task]
+        assert not failed
+    else:
+        assert not tasks
+        assert failed == [error]
+
+
+def test_get_recipe_fingerprint():
+    """Test that the recipe fingerprint depends on datasets and settings."""
+    variables = [{'short_name': 'tas', 'preprocessor': 'pp'}]
+    profiles = {'pp': {'extract_season': {'season': 'DJF'}}}
+    fingerprint = _recipe._get_recipe_fingerprint(variables, profiles)
+    assert _recipe._get_recipe_fingerprint(deepcopy(variables),
+                                           deepcopy(profiles)) == fingerprint
+
+    other_profiles = {'pp': {'extract_season': {'season': 'JJA'}}}
+    assert _recipe._get_recipe_fingerprint(variables,
+                                           other_profiles) != fingerprint
+
+    other_variables = [dict(variables[0], dataset='other')]
+    assert _recipe._get_recipe_fingerprint(other_variables,
+                                           profiles) != fingerprint
+
+
+def test_resume_preprocessor_tasks_invalid_recipe(mocker, tmp_path):
+    """Test that previous output is not used if the recipe is invalid."""
+    recipe, diagnostic, _ = _create_resume_test_setup(mocker, tmp_path, None)
+
+    error = RecipeError('Unknown preprocessor')
+    mocker.patch.object(_recipe, '_get_preprocessor_task', side_effect=error)
+
+    # Create tasks
+    tasks, failed = _recipe.Recipe._create_preprocessor_tasks(
+        recipe, 'diagnostic_name', diagnostic, [], True)
+
+    assert not tasks
+    assert failed == [error]
+
+
+def test_get_task_executor(mocker):
+    """Test that the configured task executor is used."""
+    recipe = mocker.create_autospec(_recipe.Recipe, instance=True)
+    recipe._cfg = {
+        'task_executor': 'multiprocessing',
+        'dask_scheduler_address': 'tcp://127.0.0.1:8786',
+    }
+    executor = _recipe.Recipe._get_task_executor(recipe)
+    assert executor is _recipe.MultiprocessingExecutor
+
+    recipe._cfg['task_executor'] = 'dask'
+    executor = _recipe.Recipe._get_task_executor(recipe)
+    assert executor.func is _recipe.DaskExecutor
+    assert executor.keywords == {'scheduler_address': 'tcp://127.0.0.1:8786'}
+
+
+def test_get_task_executor_unknown(mocker):
+    """Test that an unknown task executor is not silently replaced."""
+    recipe = mocker.create_autospec(_recipe.Recipe, instance=True)
+    recipe._cfg = {'task_executor': 'Dask'}
+    with pytest.raises(RecipeError, match="Unknown task executor 'Dask'"):
+        _recipe.Recipe._get_task_executor(recipe)
 
 
 def create_esgf_search_results():
@@ -617,3 +745,18 @@ def test_create_diagnostic_tasks(mock_diag_task, tasks_to_run, tasks_run):
             name=f'{diag_name}{_recipe.TASKSEP}{task_name}',
         )
         assert expected_call in mock_diag_task.mock_calls
+
+
+def test_read_attributes_from_file_index(mocker, tmp_path):
+    filename = tmp_path / 'tas.nc'
+    cube = iris.cube.Cube(0, var_name='tas', attributes={'source_id': 'A'})
+    iris.save(cube, str(filename))
+    read = mocker.spy(_recipe, '_read_netcdf_attributes')
+    _recipe.set_file_index(str(tmp_path / 'index.sqlite'))
+    try:
+        for _ in range(2):
+            attributes = _recipe._read_attributes(str(filename))
+            assert attributes['source_id'] == 'A'
+    finally:
+        _recipe.set_file_index(None)
+    read.assert_called_once()